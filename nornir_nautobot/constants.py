@@ -4,6 +4,7 @@ from collections import namedtuple
 from textwrap import dedent
 
 from netmiko import NetmikoAuthenticationException, NetmikoTimeoutException
+from scrapli.exceptions import ScrapliAuthenticationFailed, ScrapliTimeout
 
 ErrorCode = namedtuple("ErrorCode", ["troubleshooting", "description", "error_message", "recommendation"])
 
@@ -302,10 +303,24 @@ ERROR_CODES = {
         error_message="No prompt matched for ```\n{last_output}\n```",
         recommendation="Verify that all expected prompts are defined in the prompts dictionary.",
     ),
+    "E1037": ErrorCode(
+        troubleshooting="Verify that the platform echoes the pipeline marker command `{marker_command}` back to the channel.",
+        description="While running pipelined commands, the output for `{command}` could not be located as the delimiter marker was not found in the output.",
+        error_message="The pipelined output for `{command}` could not be located, marker `{marker_command}` not found.",
+        recommendation="Disable `pipeline_commands` for this platform, or override `pipeline_marker_command` in the dispatcher with a no-op command the device echoes back.",
+    ),
+    "E1038": ErrorCode(
+        troubleshooting="Verify the device is reachable, it is retried with a half-open probe once the cooldown expires.",
+        description="The host failed to connect on consecutive runs and is in a cooldown of the reachability store, so it was not attempted.",
+        error_message="`{hostname}` skipped after {failures} consecutive connectivity failures, in cooldown until {cooldown_until}.",
+        recommendation="Fix the connectivity to the device, or clear its state from the reachability store file to retry it immediately.",
+    ),
 }
 
 EXCEPTION_TO_ERROR_MAPPER = {
     NetmikoAuthenticationException: "E1017",
     NetmikoTimeoutException: "E1018",
+    ScrapliAuthenticationFailed: "E1017",
+    ScrapliTimeout: "E1018",
     OSError: "E1031",
 }
@@ -24,6 +24,21 @@ from requests import Session
 # Create Logger
 logger = logging.getLogger(__name__)
 
+# The host data key of the prefetched related objects.
+RELATED_OBJECTS_KEY = "related_objects"
+
+
+def _get_device_ids(value, device_field: str) -> set:
+    """Get the ids of the devices a related object refers to, through a dotted field path which may cross lists."""
+    values = [value]
+    for field in device_field.split("."):
+        next_values = []
+        for item in values:
+            item = item.get(field) if isinstance(item, dict) else None
+            next_values.extend(item if isinstance(item, list) else [item])
+        values = next_values
+    return {str(item["id"] if isinstance(item, dict) else item) for item in values if item}
+
 
 def _set_host(data: Dict[str, Any], name: str, groups, host, defaults: Defaults) -> Host:
     host_platform = getattr(data["pynautobot_object"].platform, "network_driver", None)
@@ -63,14 +78,25 @@ class NautobotInventory:  # pylint: disable=R0902
         filter_parameters: Union[Dict[str, Any], None] = None,
         pynautobot_dict: Union[bool, None] = True,
         enable_threading: Union[bool, None] = False,
+        related_endpoints: Union[Dict[str, Any], None] = None,
+        related_batch_size: int = 100,
     ) -> None:
-        """Nautobot nornir class initialization."""
+        """Nautobot nornir class initialization.
+
+        The `related_endpoints` are fetched for all the devices at once, in paginated queries of `related_batch_size`
+        devices each, and stored as dictionaries in the `related_objects` data of each host by name. The templates then
+        read them without an API call per host. Each endpoint is either given as `app.endpoint`, E.g.
+        `dcim.interfaces`, or as a dictionary with the `endpoint`, the `filter` of the device ids, `device_id` by
+        default, the dotted `device_field` of the device, `device` by default, and any other `filter_parameters`.
+        """
         self.nautobot_url = nautobot_url or os.getenv("NAUTOBOT_URL")
         self.nautobot_token = nautobot_token or os.getenv("NAUTOBOT_TOKEN")
         self.filter_parameters = filter_parameters
         self.ssl_verify = ssl_verify
         self.pynautobot_dict = pynautobot_dict
         self.enable_threading = enable_threading
+        self.related_endpoints = related_endpoints or {}
+        self.related_batch_size = related_batch_size
         self._verify_required()
         self._api_session = None
         self._devices = None
@@ -136,6 +162,45 @@ class NautobotInventory:  # pylint: disable=R0902
 
         return self._devices
 
+    def _fetch_related(self, name: str, options: Union[str, Dict[str, Any]], device_ids: list) -> Dict[str, list]:
+        """Fetch the objects of a related endpoint, in batches of devices, grouped by device id."""
+        if isinstance(options, str):
+            options = {"endpoint": options}
+        options = {"filter": "device_id", "device_field": "device", "filter_parameters": {}, **options}
+        app_name, endpoint_name = options["endpoint"].split(".")
+        endpoint = getattr(getattr(self.pynautobot_obj, app_name), endpoint_name)
+        objects_by_device = {device_id: [] for device_id in device_ids}
+        for start in range(0, len(device_ids), self.related_batch_size):
+            batch = device_ids[start : start + self.related_batch_size]
+            try:
+                records = list(endpoint.filter(**options["filter_parameters"], **{options["filter"]: batch}))
+            except pynautobot.core.query.RequestError as err:
+                print(f"Error in the query of the related {name}: {err.error}. Please verify the parameters.")
+                sys.exit(1)
+            for record in records:
+                record = dict(record)
+                for device_id in _get_device_ids(record, options["device_field"]):
+                    # Only the devices of the batch, should the endpoint ignore the filter.
+                    if device_id in batch:
+                        objects_by_device[device_id].append(record)
+        return objects_by_device
+
+    def prefetch_related(self, devices: list) -> Dict[str, Dict[str, list]]:
+        """Fetch the objects of the related endpoints of all the devices, grouped by device.
+
+        Args:
+            devices (list): The pynautobot devices.
+
+        Returns:
+            dict: The lists of related objects, as dictionaries, by endpoint name and by device id.
+        """
+        device_ids = [str(device.id) for device in devices]
+        related = {}
+        for name, options in self.related_endpoints.items():
+            related[name] = self._fetch_related(name, options, device_ids)
+            logger.debug("Prefetched the %s of %s devices", name, len(device_ids))
+        return related
+
     # Build the inventory
     def load(self) -> Inventory:
         """Load of Nornir inventory.
@@ -146,6 +211,7 @@ class NautobotInventory:  # pylint: disable=R0902
         hosts = Hosts()
         groups = Groups()
         defaults = Defaults()
+        related = self.prefetch_related(self.devices) if self.related_endpoints else {}
 
         for device in self.devices:
             # Set the base information for a device
@@ -159,6 +225,11 @@ class NautobotInventory:  # pylint: disable=R0902
                 host["data"]["pynautobot_dictionary"] = dict(device)
             # TODO: #3 Investigate Nornir compatability with dictionary like object
 
+            if related:
+                host["data"][RELATED_OBJECTS_KEY] = {
+                    name: objects_by_device[str(device.id)] for name, objects_by_device in related.items()
+                }
+
             # Add Primary IP address, if found. Otherwise add hostname as the device name
             host["hostname"] = (
                 str(ipaddress.IPv4Interface(device.primary_ip4.address).ip)
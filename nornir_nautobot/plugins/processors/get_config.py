@@ -3,11 +3,13 @@
 import hashlib
 import logging
 import os
-from pathlib import Path
 
 from nornir.core.inventory import Host
 from nornir.core.task import AggregatedResult, MultiResult, Task
 
+from nornir_nautobot.utils.compression import read_text
+from nornir_nautobot.utils.spool import read_spooled_output
+
 from . import BaseProcessor
 
 # TODO: Adjust to work with a configuration setting
@@ -21,8 +23,14 @@ class GetConfig(BaseProcessor):
     task_name = "get_config"
     config_extension = "txt"
 
-    def __init__(self) -> None:
-        """Initialize the processor and ensure some variables are properly initialized."""
+    def __init__(self, content_store=None) -> None:
+        """Initialize the processor and ensure some variables are properly initialized.
+
+        Args:
+            content_store (ContentStore): The store to save the configurations in, de-duplicated by content, instead
+                of writing a file per host.
+        """
+        self.content_store = content_store
         self.current_md5 = {}
         self.previous_md5 = {}
         self.config_filename = {}
@@ -78,7 +86,7 @@ class GetConfig(BaseProcessor):
         self.config_filename[host.name] = f"{self.config_dir}/{task.host.name}.{self.config_extension}"
 
         if os.path.exists(self.config_filename[host.name]):
-            current_config = Path(self.config_filename[host.name]).read_text(encoding="utf-8")
+            current_config = read_text(self.config_filename[host.name])
             self.previous_md5[host.name] = hashlib.md5(current_config.encode("utf-8")).hexdigest()  # noqa
 
     def subtask_instance_completed(self, task: Task, host: Host, result: MultiResult) -> None:
@@ -108,7 +116,8 @@ class GetConfig(BaseProcessor):
             host.data["status"] = "fail-other"
             return
 
-        conf = result[0].result.get("config", None)
+        # A streamed configuration is a reference to the backup file, possibly compressed.
+        conf = read_spooled_output(result[0].result.get("config", None))
 
         if not conf:
             LOGGER.warning("%s | No configuration return ", task.host.name)
@@ -126,8 +135,11 @@ class GetConfig(BaseProcessor):
             self.existing_config_hostnames.remove(host.name)
 
         # Save configuration to file and verify the new MD5
-        with open(self.config_filename[host.name], "w", encoding="utf-8") as config_:
-            config_.write(conf)
+        if self.content_store is not None:
+            self.content_store.save(self.config_filename[host.name], conf)
+        else:
+            with open(self.config_filename[host.name], "w", encoding="utf-8") as config_:
+                config_.write(conf)
 
         host.data["has_config"] = True
 
@@ -3,6 +3,7 @@
 # pylint: disable=raise-missing-from
 
 import logging
+from contextlib import nullcontext
 
 from nornir.core.task import Result, Task
 
@@ -17,6 +18,58 @@ LOGGER = logging.getLogger(__name__)
 PATH_ROOT = "nornir_nautobot.plugins.tasks.dispatcher.default"
 
 
+def get_driver_class(network_driver: str, framework: str, custom_dispatcher: str = "") -> tuple:
+    """Find the driver class for a network driver and framework.
+
+    Args:
+        network_driver: The network driver of the host, E.g. "cisco_ios".
+        framework: The framework to use for the dispatcher E.g. "netmiko", "napalm", "async_scrapli".
+        custom_dispatcher: The dotted path of a custom dispatcher, which is the only path checked when set.
+
+    Returns:
+        tuple: The driver class, None if not found, and the list of paths that were checked.
+    """
+    network_driver_title = snake_to_title_case(network_driver)
+    framework_title = snake_to_title_case(framework)
+    framework_path = (
+        f"nornir_nautobot.plugins.tasks.dispatcher.{network_driver}.{framework_title}{network_driver_title}"
+    )
+    framework_default_path = f"nornir_nautobot.plugins.tasks.dispatcher.default.{framework_title}Default"
+
+    if custom_dispatcher:
+        return import_string(custom_dispatcher), [custom_dispatcher]
+    if import_string(framework_path):
+        return import_string(framework_path), [framework_path]
+    return import_string(framework_default_path), [framework_path, framework_default_path]
+
+
+def get_tcp_port_resolver(framework: str = "netmiko", custom_dispatcher: str = ""):
+    """Get a function resolving the TCP port `check_connectivity` would use for a host, E.g. for a reachability sweep.
+
+    The port is the one of the `_get_tcp_port` of the driver class of the host for the Nautobot ORM object in its `obj`
+    data, else the `tcp_port` class attribute of the driver class.
+
+    Args:
+        framework: The framework the driver classes are resolved with, E.g. "netmiko", "napalm".
+        custom_dispatcher: The dotted path of a custom dispatcher, as passed to the dispatcher.
+
+    Returns:
+        Callable: Called with a Nornir host, returns its TCP port, None if no driver class is found for it.
+    """
+
+    def _get_tcp_port(host):
+        driver_class, _ = get_driver_class(host.platform, framework, custom_dispatcher)
+        if not driver_class:
+            return None
+        obj = host.data.get("obj")
+        if obj is not None and hasattr(obj, "cf") and hasattr(obj, "get_config_context"):
+            return driver_class._get_tcp_port(obj)  # pylint: disable=protected-access
+        # E.g. a host of the `NautobotInventory`, its pynautobot record has no custom fields nor config context.
+        return driver_class.tcp_port
+
+    return _get_tcp_port
+
+
 def dispatcher(  # pylint: disable=too-many-arguments,too-many-locals
     task: Task, method: str, logger, obj, framework, *args, **kwargs
 ) -> Result:
@@ -27,9 +80,12 @@ def dispatcher(  # pylint: disable=too-many-arguments,too-many-locals
         method: The string value of the method to dynamically find.
         logger: Logger object to use for logging.
         obj: The Nautobot object passed to the method.
-        framework: The framework to use for the dispatcher E.g. "netmiko", "napalm".
+        framework: The framework to use for the dispatcher E.g. "netmiko", "napalm", "async_scrapli".
         *args: Additional positional arguments to pass to the method.
-        **kwargs: Additional keyword arguments to pass to the method.
+        **kwargs: Additional keyword arguments to pass to the method, `custom_dispatcher`, `concurrency_limiter`
+            (a `ConcurrencyLimiter` shared by the run) and `reachability_store` (a `ReachabilityStore` shared by
+            the run, only consulted for the methods in `connects_to_device` of the driver class) are consumed by the
+            dispatcher.
 
     Returns:
         Result: Nornir Task result object.
@@ -45,25 +101,12 @@ def dispatcher(  # pylint: disable=too-many-arguments,too-many-locals
     if kwargs.get("custom_dispatcher"):
         custom_dispatcher = kwargs["custom_dispatcher"]
         del kwargs["custom_dispatcher"]
+    concurrency_limiter = kwargs.pop("concurrency_limiter", None)
+    reachability_store = kwargs.pop("reachability_store", None)
 
     logger.debug(f"Dispatcher process started for {task.host.name} ({task.host.platform})")
 
-    network_driver = task.host.platform
-    network_driver_title = snake_to_title_case(network_driver)
-    framework_path = (
-        f"nornir_nautobot.plugins.tasks.dispatcher.{network_driver}.{framework.title()}{network_driver_title}"
-    )
-    framework_default_path = f"nornir_nautobot.plugins.tasks.dispatcher.default.{framework.title()}Default"
-
-    if custom_dispatcher:
-        driver_class = import_string(custom_dispatcher)
-        checked_path = [custom_dispatcher]
-    elif import_string(framework_path):
-        driver_class = import_string(framework_path)
-        checked_path = [framework_path]
-    else:
-        driver_class = import_string(framework_default_path)
-        checked_path = [framework_path, framework_default_path]
+    driver_class, checked_path = get_driver_class(task.host.platform, framework, custom_dispatcher)
 
     if not driver_class:
         error_msg = get_error_message("E1001", checked_path=checked_path)
@@ -77,7 +120,21 @@ def dispatcher(  # pylint: disable=too-many-arguments,too-many-locals
         logger.error(error_msg, extra={"object": obj})
         raise NornirNautobotException(error_msg)
 
-    result = task.run(task=driver_task, logger=logger, obj=obj, *args, **kwargs)
+    # The offline methods, E.g. `generate_config`, neither count as an outcome nor are held back by a cooldown.
+    if method not in getattr(driver_class, "connects_to_device", ()):
+        reachability_store = None
+
+    if reachability_store and not reachability_store.allow(task.host.name):
+        error_msg = get_error_message("E1038", **reachability_store.get_error_message_kwargs(task.host.name))
+        if reachability_store.skip:
+            logger.warning(error_msg, extra={"object": obj})
+            return Result(host=task.host, result=None)
+        logger.error(error_msg, extra={"object": obj})
+        raise NornirNautobotException(error_msg)
+
+    with reachability_store.track(task.host.name) if reachability_store else nullcontext():
+        with concurrency_limiter.slot(task.host, obj) if concurrency_limiter else nullcontext():
+            result = task.run(task=driver_task, logger=logger, obj=obj, *args, **kwargs)
 
     return Result(
         host=task.host,
@@ -3,20 +3,28 @@
 # pylint: disable=raise-missing-from,too-many-arguments,too-many-lines
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import inspect
 import json
 import logging
 import os
 import re
 import socket
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Optional
 
 import jinja2
 import netmiko
-from netutils.config.clean import clean_config, sanitize_config
-from netutils.config.compliance import compliance
-from netutils.dns import is_fqdn_resolvable
-from netutils.ip import is_ip
+from netmiko.exceptions import ReadTimeout
+
+try:
+    import asyncssh  # pylint: disable=E0401
+except ImportError:
+    asyncssh = None
 from netutils.lib_mapper import RUNNING_CONFIG_MAPPER
 from netutils.ping import tcp_ping
 from nornir.core.exceptions import NornirExecutionError, NornirSubTaskError
@@ -28,7 +36,12 @@ from nornir_netmiko.tasks import (
     netmiko_send_command,
     netmiko_send_config,
 )
+from nornir_scrapli.connection import PLATFORM_MAP as SCRAPLI_PLATFORM_MAP
 from nornir_scrapli.tasks import send_command as scrapli_send_command
+from nornir_scrapli.tasks import send_commands as scrapli_send_commands
+from scrapli import AsyncScrapli
+from scrapli.exceptions import ScrapliTimeout
+from scrapli.response import Response
 
 from nornir_nautobot.constants import (
     ERROR_MATCHES_BAD_COMMAND,
@@ -36,13 +49,39 @@ from nornir_nautobot.constants import (
     EXCEPTION_TO_ERROR_MAPPER,
 )
 from nornir_nautobot.exceptions import NornirNautobotException
-from nornir_nautobot.plugins.tasks.template_file import template_file
+from nornir_nautobot.plugins.tasks.template_file import (
+    get_jinja_env,
+    get_jinja_env_fingerprint,
+    get_template_digest,
+    template_file,
+)
+from nornir_nautobot.utils.compliance import get_file_compliance, incremental_compliance
+from nornir_nautobot.utils.compression import (
+    compress,
+    content_digest,
+    get_compression,
+    open_text,
+    open_text_writer,
+    read_text,
+)
+from nornir_nautobot.utils.config_pipeline import get_config_pipeline
+from nornir_nautobot.utils.dns import DNS_CACHE
+from nornir_nautobot.utils.error_matcher import get_hidden_error_matcher
+from nornir_nautobot.utils.event_loop import run_coroutine
 from nornir_nautobot.utils.helpers import (
+    file_digest,
+    file_signature,
     get_error_message,
     get_stack_trace,
+    is_file_unchanged,
     is_truthy,
     make_folder,
+    set_stored_digest,
+    write_file_if_changed,
 )
+from nornir_nautobot.utils.reachability import REACHABILITY_MAP
+from nornir_nautobot.utils.render_cache import get_context_fingerprint
+from nornir_nautobot.utils.spool import spool_output
 
 _logger = logging.getLogger(__name__)
 
@@ -51,6 +90,33 @@ class DispatcherMixin:
     """Mixin for non-network driver related tasks."""
 
     tcp_port = 22
+    spool_threshold = 1024 * 1024
+    stream_config = False
+    stream_error_window = 4096
+    digest_store = None
+    content_store = None
+    compression = None
+    parsed_config_cache = None
+    # The methods opening a connection to the device, whose outcome is tracked by a `ReachabilityStore`.
+    connects_to_device = frozenset(
+        {
+            "check_connectivity",
+            "get_config",
+            "get_command",
+            "get_commands",
+            "get_command_with_prompts",
+            "merge_config",
+            "replace_config",
+        }
+    )
+    compliance_store = None
+    jinja_bytecode_cache_dir = None
+    render_processes = 0
+    stream_render = False
+    stream_render_keep_text = False
+    render_cache = None
+    error_matches_no_authorization = ERROR_MATCHES_NO_AUTHORIZATION
+    error_matches_bad_command = ERROR_MATCHES_BAD_COMMAND
 
     @classmethod
     def _get_hostname(cls, task: Task, obj=None) -> str:  # pylint: disable=unused-argument
@@ -79,21 +145,21 @@ class DispatcherMixin:
             Result: Nornir Result object.
         """
         hostname = cls._get_hostname(task)
-        if is_ip(hostname):
-            ip_addr = hostname
-        else:
-            if not is_fqdn_resolvable(hostname):
-                error_msg = get_error_message("E1003", hostname=hostname)
-                logger.error(error_msg, extra={"object": obj})
-                raise NornirNautobotException(error_msg)
-            ip_addr = socket.gethostbyname(hostname)
+        ip_addr = DNS_CACHE.resolve(hostname)
+        if not ip_addr:
+            error_msg = get_error_message("E1003", hostname=hostname)
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
 
         port = cls._get_tcp_port(obj)
-        # TODO: Remove after fixing tcp_ping in netutils
-        try:
-            _tcp_ping = tcp_ping(ip_addr, port)
-        except socket.error:
-            _tcp_ping = False
+        # Prefer the outcome of a reachability sweep, if one was run for this host.
+        _tcp_ping = REACHABILITY_MAP.get(ip_addr, port)
+        if _tcp_ping is None:
+            # TODO: Remove after fixing tcp_ping in netutils
+            try:
+                _tcp_ping = tcp_ping(ip_addr, port)
+            except socket.error:
+                _tcp_ping = False
         if not _tcp_ping:
             error_msg = get_error_message("E1004", ip_addr=ip_addr, port=port)
             logger.error(error_msg, extra={"object": obj})
@@ -119,9 +185,16 @@ class DispatcherMixin:
         backup_file: str,
         intended_file: str,
         platform: str,
+        backup_config=None,
+        intended_config=None,
     ) -> Result:
         """Compare two configurations against each other.
 
+        When the `parsed_config_cache` class attribute is set to a `ParsedConfigCache`, the parsed configurations are
+        cached by content, so an unchanged configuration is not parsed again. When the `compliance_store` class
+        attribute is set to a mapping, the previous `feature_data` of the host is returned as is if neither the
+        backup, the intended configuration nor the features changed.
+
         Args:
             task (Task): Nornir Task.
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
@@ -130,26 +203,40 @@ class DispatcherMixin:
             backup_file (str): The file location of where the back configuration should be saved.
             intended_file (str):  The file location of where the intended configuration should be saved.
             platform (str): The platform network_driver of the device.
+            backup_config (str | Result): The backup configuration, used instead of reading the `backup_file`, as a
+                string or the Result of `get_config`.
+            intended_config (str | Result): The intended configuration, used instead of reading the `intended_file`,
+                as a string or the Result of `generate_config`.
 
         Returns:
             Result: Nornir Result object with a feature_data key of the compliance data.
         """
-        if not os.path.exists(backup_file):
-            error_msg = get_error_message("E1007", backup_file=backup_file)
-            logger.error(error_msg, extra={"object": obj})
-            raise NornirNautobotException(error_msg)
-
-        if not os.path.exists(intended_file):
-            error_msg = get_error_message("E1008", intended_file=intended_file)
-            logger.error(error_msg, extra={"object": obj})
-            raise NornirNautobotException(error_msg)
-
-        try:
-            feature_data = compliance(features, backup_file, intended_file, platform)
-        except Exception as error:  # pylint: disable=broad-except
-            error_msg = get_error_message("E1009", error=str(error))
-            logger.error(error_msg, extra={"object": obj})
-            raise NornirNautobotException(error_msg)
+        if cls.compliance_store is not None:
+            compliance_result = incremental_compliance(
+                cls.compliance_store,
+                task.host.name,
+                features,
+                backup_file,
+                intended_file,
+                platform,
+                cls.parsed_config_cache,
+                backup_config,
+                intended_config,
+            )
+        else:
+            compliance_result = get_file_compliance(
+                features,
+                backup_file,
+                intended_file,
+                platform,
+                cls.parsed_config_cache,
+                backup_config,
+                intended_config,
+            )
+        if "error" in compliance_result:
+            logger.error(compliance_result["error"], extra={"object": obj})
+            raise NornirNautobotException(compliance_result["error"])
+        feature_data = compliance_result["feature_data"]
         return Result(host=task.host, result={"feature_data": feature_data})
 
     @classmethod
@@ -166,6 +253,21 @@ class DispatcherMixin:
     ) -> Result:
         """A small wrapper around template_file Nornir task.
 
+        The templates are compiled once per process, and stored in the bytecode cache folder of the
+        `jinja_bytecode_cache_dir` class attribute if set. With the `render_processes` class attribute set, the
+        templates are rendered by a pool of that many worker processes instead of the Nornir thread.
+
+        When `stream_render` is enabled for the device, see `_stream_render`, the template is rendered in chunks
+        straight to a temporary file renamed to the output file once complete, and the configuration is a reference to
+        the output file, with its `path`, `size` in bytes and sha256 `digest`, so the text is never held in memory as a
+        whole. The text is also returned in the `text` key with the `stream_render_keep_text` class attribute set.
+
+        With the `render_cache` class attribute set to a `RenderCache`, the render and the write are skipped when the
+        output file still exists and neither the templates it depends on nor the host data changed since it was
+        written, the configuration is then read back from the output file. A host whose data holds a Django model
+        instance, E.g. the Nautobot device itself, is always rendered, as the model can not be fingerprinted with the
+        related objects a template may walk.
+
         Args:
             task (Task): Nornir Task.
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
@@ -174,11 +276,37 @@ class DispatcherMixin:
             jinja_root_path (str): The file folder where the file will be saved to.
             jinja_filters (dict): The filters which will be added to the jinja2 environment.
             jinja_env (jinja2.Environment): The jinja2 environment to use. If not provided, nornir will create one.
-            output_file_location (str): The filename where the file will be saved to.
+            output_file_location (str): The filename where the file will be saved to, None to not save it.
 
         Returns:
-            Result: Nornir Result object.
+            Result: Nornir Result object, `changed` is False when the file already had the same content.
         """
+        streaming = bool(output_file_location) and cls._stream_render(obj)
+        cache_key = None
+        if cls.render_cache is not None and output_file_location:
+            cache_key = cls._get_render_cache_key(task, jinja_template, jinja_root_path, jinja_filters, jinja_env)
+            reference = cls.render_cache.get(output_file_location, cache_key) if cache_key else None
+            if reference is not None:
+                logger.debug(f"Templates and context unchanged, skipped rendering: {output_file_location}")
+                if not streaming:
+                    return Result(host=task.host, result={"config": read_text(output_file_location)}, changed=False)
+                result = {"config": reference}
+                if cls.stream_render_keep_text:
+                    result["text"] = read_text(output_file_location)
+                return Result(host=task.host, result=result, changed=False)
+
+        stream_to = None
+        pieces = []
+        if streaming:
+            logger.debug(f"Streaming generated configuration to file: {output_file_location}")
+
+            def _stream_to_file(chunks):
+                if cls.stream_render_keep_text:
+                    chunks = (pieces.append(chunk) or chunk for chunk in chunks)
+                return cls._write_stream(logger, output_file_location, chunks)
+
+            stream_to = _stream_to_file
+
         try:
             filled_template = task.run(
                 **task.host,
@@ -188,6 +316,9 @@ class DispatcherMixin:
                 jinja_filters=jinja_filters,
                 jinja_env=jinja_env,
                 logger=logger,
+                jinja_bytecode_cache_dir=cls.jinja_bytecode_cache_dir,
+                render_processes=cls.render_processes,
+                stream_to=stream_to,
             )[0].result
         except NornirSubTaskError as exc:
             stack_trace = get_stack_trace(exc.result.exception)
@@ -196,10 +327,71 @@ class DispatcherMixin:
             logger.error(error_msg, extra={"object": obj})
             raise NornirNautobotException(error_msg)
 
-        make_folder(os.path.dirname(output_file_location))
-        with open(output_file_location, "w", encoding="utf8") as filehandler:
-            filehandler.write(filled_template)
-        return Result(host=task.host, result={"config": filled_template})
+        if streaming:
+            reference, changed = filled_template
+            result = {"config": reference}
+            if cls.stream_render_keep_text:
+                result["text"] = "".join(pieces)
+        else:
+            result = {"config": filled_template}
+            changed = False
+            if output_file_location:
+                data = compress(filled_template, get_compression(output_file_location, cls.compression))
+                changed = write_file_if_changed(output_file_location, data, cls.digest_store)
+                if not changed:
+                    logger.debug(f"Generated configuration unchanged, skipped writing: {output_file_location}")
+                text_data = filled_template.encode("utf8")
+                reference = {
+                    "path": output_file_location,
+                    "size": len(text_data),
+                    "digest": hashlib.sha256(text_data).hexdigest(),
+                }
+        if cache_key:
+            cls.render_cache.put(output_file_location, cache_key, reference)
+        return Result(host=task.host, result=result, changed=changed)
+
+    @classmethod
+    def _get_render_cache_key(  # pylint: disable=too-many-positional-arguments
+        cls,
+        task: Task,
+        jinja_template: str,
+        jinja_root_path: str,
+        jinja_filters: Optional[dict],
+        jinja_env: Optional[jinja2.Environment],
+    ) -> Optional[list]:
+        """Get the key of a render in the `render_cache`, None if the render can not be cached.
+
+        The key is the digest of the template and of the templates it depends on, and the fingerprint of the host,
+        of the settings, filters and globals of the Jinja environment, and of the `compression` of the output file.
+
+        Returns:
+            list: The template digest and the context fingerprint.
+        """
+        path = os.path.abspath(jinja_root_path)
+        try:
+            env = get_jinja_env(path, jinja_filters, jinja_env, cls.jinja_bytecode_cache_dir)
+            template_digest = get_template_digest(env, jinja_template)
+        except (jinja2.TemplateError, OSError, UnicodeDecodeError):
+            # Rendering reports the error.
+            return None
+        # The functions by their import path, the other globals by their value.
+        env_globals = {
+            name: f"{getattr(value, '__module__', None)}.{getattr(value, '__qualname__', repr(value))}"
+            if callable(value)
+            else value
+            for name, value in env.globals.items()
+        }
+        context_fingerprint = get_context_fingerprint(
+            {
+                "host": task.host,
+                "env": get_jinja_env_fingerprint(env),
+                "globals": env_globals,
+                "compression": cls.compression,
+            }
+        )
+        if context_fingerprint is None:
+            return None
+        return [template_digest, context_fingerprint]
 
     @classmethod
     def _remove_lines(cls, logger, _running_config: str, remove_lines: list) -> str:
@@ -216,7 +408,7 @@ class DispatcherMixin:
         if not remove_lines:
             return _running_config
         logger.debug("Removing lines from configuration based on `remove_lines` definition")
-        return clean_config(_running_config, remove_lines)
+        return get_config_pipeline(remove_lines=remove_lines).apply(_running_config)
 
     @classmethod
     def _substitute_lines(cls, logger, _running_config: str, substitute_lines: list) -> str:
@@ -233,30 +425,53 @@ class DispatcherMixin:
         if not substitute_lines:
             return _running_config
         logger.debug("Substitute lines from configuration based on `substitute_lines` definition")
-        return sanitize_config(_running_config, substitute_lines)
+        return get_config_pipeline(substitute_lines=substitute_lines).apply(_running_config)
 
     @classmethod
-    def _save_file(cls, logger, backup_file: str, _running_config: str) -> None:
+    def _has_line_hooks(cls) -> bool:
+        """Whether `_remove_lines` or `_substitute_lines` are overridden, so they are called instead of the pipeline."""
+        return (
+            cls._remove_lines.__func__ is not DispatcherMixin._remove_lines.__func__
+            or cls._substitute_lines.__func__ is not DispatcherMixin._substitute_lines.__func__
+        )
+
+    @classmethod
+    def _save_file(cls, logger, backup_file: str, _running_config: str) -> bool:
         """Saves Running Configuration to a specified file.
 
+        The file is compared by digest, against the `digest_store` class attribute if set or the existing file, and
+        only written when it changed, through a temporary file renamed over it. When the `content_store` class
+        attribute is set, the file is instead hardlinked to the blob of its content in that `ContentStore`. The file is
+        compressed with gzip or zstd for a `.gz` or `.zst` extension, or else the `compression` class attribute.
+
         Args:
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
             _running_config (str): a device running configuration.
             backup_file (str): String representing backup file path.
 
         Returns:
-            Result: Running Config is saved into backup file path.
+            bool: Whether the backup file was written, False if it already had the same content.
         """
-        if backup_file:
-            make_folder(os.path.dirname(backup_file))
-            logger.debug(f"Saving Configuration to file: {backup_file}")
-            with open(backup_file, "w", encoding="utf8") as filehandler:
-                filehandler.write(_running_config)
+        if not backup_file:
+            return False
+        logger.debug(f"Saving Configuration to file: {backup_file}")
+        data = compress(_running_config, get_compression(backup_file, cls.compression))
+        if cls.content_store is not None:
+            changed = cls.content_store.save(backup_file, data)
+        else:
+            changed = write_file_if_changed(backup_file, data, cls.digest_store)
+        if not changed:
+            logger.debug(f"Configuration unchanged, skipped writing: {backup_file}")
+        return changed
 
     @classmethod
     def _has_hidden_errors(cls, result_output: str) -> tuple[bool, str]:
         """Checks if the result_output has hidden errors from syntax problems.
 
+        The `error_matches_no_authorization` and `error_matches_bad_command` of the class are searched for in a single
+        pass over the output, a platform driver class may extend them, E.g.
+        `error_matches_bad_command = ERROR_MATCHES_BAD_COMMAND + ["% Unknown command"]`.
+
         Args:
             result_output (str): The result output to check.
 
@@ -276,16 +491,260 @@ class DispatcherMixin:
             iosvl2-0>show ip
             % Incomplete command.
         """
-        for error_str in ERROR_MATCHES_NO_AUTHORIZATION:
-            if error_str in result_output:
-                command_list = "\n".join(ERROR_MATCHES_NO_AUTHORIZATION)
-                return True, get_error_message("E1017", command_list=command_list)
-        for error_str in ERROR_MATCHES_BAD_COMMAND:
-            if error_str in result_output:
-                command_list = "\n".join(ERROR_MATCHES_BAD_COMMAND)
-                return True, get_error_message("E1030", command_list=command_list)
+        matcher = get_hidden_error_matcher(cls.error_matches_no_authorization, cls.error_matches_bad_command)
+        kind = matcher.search(result_output)
+        if kind == matcher.NO_AUTHORIZATION:
+            command_list = "\n".join(cls.error_matches_no_authorization)
+            return True, get_error_message("E1017", command_list=command_list)
+        if kind == matcher.BAD_COMMAND:
+            command_list = "\n".join(cls.error_matches_bad_command)
+            return True, get_error_message("E1030", command_list=command_list)
         return False, ""
 
+    @classmethod
+    def _stream_config(cls, obj):
+        """
+        Determine whether `get_config` should stream the running configuration to the backup file.
+
+        This method checks multiple sources in the following order:
+        1. The object's custom fields (`obj.cf`) for the key `"stream_config"`.
+        2. The object's configuration context (`obj.get_config_context()`) for the same key.
+        3. The class attribute `stream_config`, which defaults to False.
+
+        Returns:
+            bool:
+                - True or False if the key exists in any of the sources and is explicitly set.
+        """
+        custom_field = obj.cf.get("stream_config")
+        if isinstance(custom_field, bool):
+            return custom_field
+        config_context = obj.get_config_context().get("stream_config")
+        if isinstance(config_context, bool):
+            return config_context
+        return cls.stream_config
+
+    @classmethod
+    def _stream_render(cls, obj):
+        """
+        Determine whether `generate_config` should stream the rendered configuration to the output file.
+
+        This method checks multiple sources in the following order:
+        1. The object's custom fields (`obj.cf`) for the key `"stream_render"`.
+        2. The object's configuration context (`obj.get_config_context()`) for the same key.
+        3. The class attribute `stream_render`, which defaults to False.
+
+        Returns:
+            bool:
+                - True or False if the key exists in any of the sources and is explicitly set.
+        """
+        custom_field = obj.cf.get("stream_render")
+        if isinstance(custom_field, bool):
+            return custom_field
+        config_context = obj.get_config_context().get("stream_render")
+        if isinstance(config_context, bool):
+            return config_context
+        return cls.stream_render
+
+    @classmethod
+    def _read_file_chunks(cls, command: str, command_file_path: str, chunk_size: int = 1024 * 1024):
+        """Read a command output file located in the Git repository in chunks.
+
+        Args:
+            command (str): The command the output belongs to.
+            command_file_path (str): The path to the command output file located in the Git repository.
+            chunk_size (int): The number of characters of each chunk.
+
+        Yields:
+            str: The command output, in chunks.
+        """
+        if not os.path.exists(command_file_path):
+            raise FileNotFoundError(get_error_message("E1032", command=command))
+        with open_text(command_file_path) as filehandler:
+            while chunk := filehandler.read(chunk_size):
+                yield chunk
+
+    @classmethod
+    def _check_streamed_output(cls, logger, obj, command: str, chunks):
+        """Check a command output as it is streamed for hidden errors and an empty output.
+
+        Hidden errors are searched for in every chunk, together with the last `stream_error_window` characters of the
+        previous chunks so an error split across chunks is still found.
+
+        Args:
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            command (str): The command the output belongs to.
+            chunks (Iterable[str]): The command output, in chunks.
+
+        Yields:
+            str: The command output, in chunks.
+        """
+        tail = ""
+        has_content = False
+        for chunk in chunks:
+            window = tail + chunk
+            failed, error_msg = cls._has_hidden_errors(window)
+            if failed:
+                logger.error(error_msg, extra={"object": obj})
+                raise NornirNautobotException(error_msg)
+            tail = window[-cls.stream_error_window :]
+            has_content = has_content or bool(chunk.strip())
+            yield chunk
+        if not has_content:
+            error_msg = get_error_message("E1033", command=command)
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
+
+    @classmethod
+    def _process_config_stream(  # pylint: disable=too-many-positional-arguments
+        cls,
+        logger,
+        chunks,
+        remove_lines: list,
+        substitute_lines: list,
+        backup_file: str,
+    ) -> tuple[dict, bool]:
+        """Process the running configuration as it arrives, writing the backup file as it goes.
+
+        The configuration is written to a temporary file renamed to the backup file once complete, so a failure
+        part way through leaves the previous backup in place, and discarded if the backup file was unchanged. When a
+        subclass overrides `_process_config`, `_remove_lines` or `_substitute_lines`, the whole configuration is
+        collected and passed to `_process_config` instead.
+
+        Args:
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            chunks (Iterable[str]): The running configuration, in chunks.
+            remove_lines (list): A list of regex lines to remove configurations.
+            substitute_lines (list): A list of dictionaries with to remove and replace lines.
+            backup_file (str): The file location of where the back configuration should be saved.
+
+        Returns:
+            tuple[dict, bool]: A reference to the backup file, with the `path`, `size` in bytes and sha256 `digest`,
+                and whether the backup file was written.
+        """
+        if cls._has_line_hooks() or cls._process_config.__func__ is not DispatcherMixin._process_config.__func__:
+            logger.debug(
+                "The `_process_config`, `_remove_lines` or `_substitute_lines` are overridden, the whole configuration "
+                "is processed"
+            )
+            running_config, changed = cls._run_process_config(
+                logger, "".join(chunks), remove_lines, substitute_lines, backup_file
+            )
+            data = running_config.encode("utf8")
+            return {"path": backup_file, "size": len(data), "digest": hashlib.sha256(data).hexdigest()}, changed
+        pipeline = get_config_pipeline(remove_lines, substitute_lines)
+        if not pipeline.streamable:
+            logger.warning(
+                "The `remove_lines` or `substitute_lines` can match across lines, the whole configuration is processed "
+                "in memory"
+            )
+        logger.debug(f"Streaming Configuration to file: {backup_file}")
+        return cls._write_stream(logger, backup_file, pipeline.apply_stream(chunks))
+
+    @classmethod
+    def _write_stream(cls, logger, file_path: str, pieces) -> tuple[dict, bool]:
+        """Write a text to a file as it is produced, unless the file already has the same content.
+
+        The text is written to a temporary file renamed to the file once complete, so a failure part way through leaves
+        the previous file in place, and discarded if the file was unchanged. The `compression`, `content_store` and
+        `digest_store` class attributes apply as to `_save_file`.
+
+        Args:
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            file_path (str): The file location.
+            pieces (Iterable[str]): The text, in pieces of any size.
+
+        Returns:
+            tuple[dict, bool]: A reference to the file, with the `path`, `size` in bytes and sha256 `digest` of the
+                text, and whether the file was written.
+        """
+        if os.path.dirname(file_path):
+            make_folder(os.path.dirname(file_path))
+        compression = get_compression(file_path, cls.compression)
+        digest = hashlib.sha256()
+        size = 0
+        temporary_file = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open_text_writer(temporary_file, compression) as filehandler:
+                for piece in pieces:
+                    data = piece.encode("utf8")
+                    digest.update(data)
+                    size += len(data)
+                    filehandler.write(piece)
+        except BaseException:
+            os.unlink(temporary_file)
+            raise
+        reference = {"path": file_path, "size": size, "digest": digest.hexdigest()}
+        stored_digest = reference["digest"]
+        if compression:
+            # The compressed bytes depend on how the content was streamed, so the content is compared instead.
+            if content_digest(file_path) == reference["digest"]:
+                logger.debug(f"Configuration unchanged, skipped writing: {file_path}")
+                os.unlink(temporary_file)
+                return reference, False
+            stored_digest = file_digest(temporary_file)
+        if cls.content_store is not None:
+            cls.content_store.put_file(temporary_file, stored_digest)
+            return reference, cls.content_store.link(file_path, stored_digest)
+        if is_file_unchanged(file_path, stored_digest, cls.digest_store):
+            logger.debug(f"Configuration unchanged, skipped writing: {file_path}")
+            os.unlink(temporary_file)
+            return reference, False
+        os.replace(temporary_file, file_path)
+        set_stored_digest(cls.digest_store, file_path, stored_digest)
+        return reference, True
+
+    @classmethod
+    def _spool_output(cls, task: Task, command: str, output, spool_directory: Optional[str] = None):
+        """Spool a command output larger than `spool_threshold` bytes, once UTF-8 encoded, to a per-host file.
+
+        Args:
+            task (Task): Nornir Task.
+            command (str): The command the output belongs to.
+            output (str): The command output.
+            spool_directory (str): The folder to spool the outputs to, outputs are never spooled if not set.
+
+        Returns:
+            str | dict: The output itself, or a reference to the spooled file with the `path`, `size` and `digest`.
+        """
+        if not spool_directory or not isinstance(output, str):
+            return output
+        # A character is at least one byte, the output is only encoded when it is shorter in characters.
+        if len(output) < cls.spool_threshold and len(output.encode("utf-8")) < cls.spool_threshold:
+            return output
+        return spool_output(spool_directory, task.host.name, command, output)
+
+    @classmethod
+    def _collect_command_results(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, outputs, spool_directory: Optional[str] = None
+    ) -> dict:
+        """Check the output of each command for hidden errors, spooling those larger than `spool_threshold`.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            outputs (Iterable[tuple]): The command and its output, or its scrapli response, whose text is dropped once
+                spooled so it is not held until the end of the run.
+            spool_directory (str): The folder to spool the outputs to, outputs are never spooled if not set.
+
+        Returns:
+            dict: A dictionary of command to its output, or to a reference to its spooled file.
+        """
+        command_results = {}
+        for command, output in outputs:
+            response = output if isinstance(output, Response) else None
+            text = output.result if response is not None else output
+            failed, error_msg = cls._has_hidden_errors(text)
+            if failed:
+                logger.error(f"Command `{command}` failed on {task.host.name}", extra={"object": obj})
+                logger.error(error_msg, extra={"object": obj})
+                raise NornirNautobotException(error_msg)
+            command_results[command] = cls._spool_output(task, command, text, spool_directory)
+            if response is not None and command_results[command] is not text:
+                response.result, response.raw_result = "", b""
+        return command_results
+
     @classmethod
     def _process_config(  # pylint: disable=too-many-positional-arguments
         cls,
@@ -297,6 +756,11 @@ class DispatcherMixin:
     ) -> str:
         """Process the running configuration.
 
+        The removals and substitutions are applied by a pipeline compiled once for the `remove_lines` and
+        `substitute_lines` of the job, with the same output as applying them one regex after the other. When a
+        subclass overrides `_remove_lines` or `_substitute_lines`, those are called instead. The backup file is only
+        written when its content changed.
+
         Args:
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
             running_config (str): The running configuration.
@@ -307,14 +771,49 @@ class DispatcherMixin:
         Returns:
             str: The processed running configuration.
         """
-        if remove_lines:
-            running_config = cls._remove_lines(logger, running_config, remove_lines)
-        if substitute_lines:
-            running_config = cls._substitute_lines(logger, running_config, substitute_lines)
+        if cls._has_line_hooks():
+            if remove_lines:
+                running_config = cls._remove_lines(logger, running_config, remove_lines)
+            if substitute_lines:
+                running_config = cls._substitute_lines(logger, running_config, substitute_lines)
+        elif remove_lines or substitute_lines:
+            if remove_lines:
+                logger.debug("Removing lines from configuration based on `remove_lines` definition")
+            if substitute_lines:
+                logger.debug("Substitute lines from configuration based on `substitute_lines` definition")
+            running_config = get_config_pipeline(remove_lines, substitute_lines).apply(running_config)
         if backup_file:
             cls._save_file(logger, backup_file, running_config)
         return running_config
 
+    @classmethod
+    def _run_process_config(  # pylint: disable=too-many-positional-arguments
+        cls,
+        logger,
+        running_config: str,
+        remove_lines: list,
+        substitute_lines: list,
+        backup_file: str,
+    ) -> tuple[str, bool]:
+        """Run the `_process_config` hook, which a subclass may override, and tell whether it wrote the backup file.
+
+        Every write replaces the backup file, so it was written if its inode, size or mtime changed.
+
+        Args:
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            running_config (str): The running configuration.
+            remove_lines (list): A list of regex lines to remove configurations.
+            substitute_lines (list): A list of dictionaries with to remove and replace lines.
+            backup_file (str): The file location of where the back configuration should be saved.
+
+        Returns:
+            tuple[str, bool]: The processed running configuration, and whether the backup file was written.
+        """
+        before = file_signature(backup_file) if backup_file else None
+        running_config = cls._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
+        changed = bool(backup_file) and file_signature(backup_file) != before
+        return running_config, changed
+
 
 class NapalmDefault(DispatcherMixin):
     """Default collection of Nornir Tasks based on Napalm."""
@@ -346,8 +845,10 @@ class NapalmDefault(DispatcherMixin):
         logger.debug(f"Executing get_config for {task.host.name} on {task.host.platform}")
         getter_result = cls.get_command(task, logger, obj, command="config", retrieve="running")
         running_config = getter_result.result.get("output", {}).get("config", {}).get("running", None)
-        processed_config = cls._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
-        return Result(host=task.host, result={"config": processed_config})
+        processed_config, changed = cls._run_process_config(
+            logger, running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
 
     @classmethod
     def get_command(cls, task: Task, logger, obj, command, **kwargs):
@@ -524,6 +1025,11 @@ class NetmikoDefault(DispatcherMixin):
     config_command = None  # This can be removed in future versions, as it is not used in the base class.
     offline_commands = False
     netmiko_kwargs = {}
+    pipeline_commands = False
+    pipeline_group_size = 10
+    pipeline_marker_command = "! {marker}"
+    pipeline_read_timeout = 120.0
+    stream_read_timeout = 600.0
 
     @classmethod
     def _get_netmiko_kwargs(cls, obj) -> dict:
@@ -590,10 +1096,15 @@ class NetmikoDefault(DispatcherMixin):
 
         Returns:
             Result: Nornir Result object with a dict as a result containing the running configuration
-                { "config: <running configuration> }
+                { "config: <running configuration> }, or a reference to the backup file
+                { "config": {"path": <backup file>, "size": <size>, "digest": <sha256>} } when streamed.
         """
         logger.debug(f"Executing get_config for {task.host.name} on {task.host.platform}")
         command = cls._get_config_command(obj)
+        if backup_file and cls._stream_config(obj):
+            return cls._get_streamed_config(
+                task, logger, obj, command, backup_file, remove_lines, substitute_lines, command_file_path
+            )
         if cls._offline_commands(obj):
             getter_result = cls.get_command(
                 task,
@@ -609,8 +1120,144 @@ class NetmikoDefault(DispatcherMixin):
             error_msg = get_error_message("E1033", command=command)
             logger.error(error_msg, extra={"object": obj})
             raise NornirNautobotException(error_msg)
-        processed_config = cls._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
-        return Result(host=task.host, result={"config": processed_config})
+        processed_config, changed = cls._run_process_config(
+            logger, running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
+
+    @classmethod
+    def _get_streamed_config(  # pylint: disable=too-many-positional-arguments
+        cls,
+        task: Task,
+        logger,
+        obj,
+        command: str,
+        backup_file: str,
+        remove_lines: list,
+        substitute_lines: list,
+        command_file_path: str = None,
+    ) -> Result:
+        """Stream the running configuration to the backup file, mapping the errors of the subtask.
+
+        A `ReadTimeout` of the channel, only raised by `_read_channel_lines` here, fails with `E1018`.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            command (str): The command to get the running configuration.
+            backup_file (str): The file location of where the back configuration should be saved.
+            remove_lines (list): A list of regex lines to remove configurations.
+            substitute_lines (list): A list of dictionaries with to remove and replace lines.
+            command_file_path (str): The path to the command output file located in the Git repository.
+
+        Returns:
+            Result: Nornir Result object with a reference to the backup file as the config.
+        """
+        try:
+            stream_result = task.run(
+                task=cls._stream_config_to_file,
+                logger=logger,
+                obj=obj,
+                command=command,
+                backup_file=backup_file,
+                remove_lines=remove_lines,
+                substitute_lines=substitute_lines,
+                command_file_path=command_file_path,
+            )
+        except NornirSubTaskError as exc:
+            if isinstance(exc.result.exception, NornirNautobotException):
+                # Already logged by the check of the streamed output.
+                raise exc.result.exception
+            if isinstance(exc.result.exception, ReadTimeout):
+                error_code = "E1018"
+            else:
+                error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc.result.exception), "E1014")
+            error_msg = get_error_message(error_code, exc=exc)
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
+        return Result(host=task.host, result={"config": stream_result[0].result}, changed=stream_result[0].changed)
+
+    @classmethod
+    def _read_channel_lines(cls, task: Task, command: str, enable: bool = True, read_timeout=None):
+        """Send a command and read its output from the channel as it arrives, one line at a time.
+
+        Args:
+            task (Task): Nornir Task.
+            command (str): The command to send.
+            enable (bool): Whether to enter enable mode before sending the command.
+            read_timeout (float): Maximum time to wait for the whole output.
+
+        Yields:
+            str: The command output, one line at a time, without the echo of the command nor the trailing prompt.
+        """
+        net_connect = task.host.get_connection("netmiko", task.nornir.config)
+        if enable:
+            net_connect.enable()
+        prompt = net_connect.find_prompt()
+        read_timeout = read_timeout or cls.stream_read_timeout
+        deadline = time.monotonic() + read_timeout
+        net_connect.write_channel(command + net_connect.RETURN)
+        buffer = ""
+        echo = True
+        while True:
+            data = net_connect.read_channel()
+            if not data:
+                # The trailing prompt is the only line without a newline, once the channel is idle.
+                if net_connect.strip_ansi_escape_codes(buffer).strip() == prompt:
+                    return
+                if time.monotonic() > deadline:
+                    raise ReadTimeout(f"Pattern not detected: {prompt!r} in output after {read_timeout} seconds.")
+                time.sleep(0.05)
+                continue
+            buffer += data
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                line = net_connect.normalize_linefeeds(net_connect.strip_ansi_escape_codes(f"{line}\n"))
+                if echo:
+                    echo = False
+                    # Drop the echo of the command itself, as netmiko_send_command would.
+                    if command in line:
+                        continue
+                yield line
+
+    @classmethod
+    def _stream_config_to_file(  # pylint: disable=too-many-positional-arguments
+        cls,
+        task: Task,
+        logger,
+        obj,
+        command: str,
+        backup_file: str,
+        remove_lines: list,
+        substitute_lines: list,
+        command_file_path: str = None,
+    ) -> Result:
+        """A task to stream the running configuration from the device, or the Git repository, to the backup file.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            command (str): The command to get the running configuration.
+            backup_file (str): The file location of where the back configuration should be saved.
+            remove_lines (list): A list of regex lines to remove configurations.
+            substitute_lines (list): A list of dictionaries with to remove and replace lines.
+            command_file_path (str): The path to the command output file located in the Git repository.
+        """
+        if cls._offline_commands(obj):
+            chunks = cls._read_file_chunks(command, command_file_path)
+        else:
+            chunks = cls._read_channel_lines(
+                task, command, enable=is_truthy(os.getenv("NORNIR_NAUTOBOT_NETMIKO_ENABLE_DEFAULT", default="True"))
+            )
+        chunks = cls._check_streamed_output(logger, obj, command, chunks)
+        reference, changed = cls._process_config_stream(logger, chunks, remove_lines, substitute_lines, backup_file)
+        return Result(
+            host=task.host,
+            result=reference,
+            changed=changed,
+        )
 
     @classmethod
     def merge_config(  # pylint: disable=too-many-positional-arguments
@@ -719,6 +1366,139 @@ class NetmikoDefault(DispatcherMixin):
             return config_context
         return cls.offline_commands
 
+    @classmethod
+    def _pipeline_commands(cls, obj):
+        """
+        Determine whether `get_commands` should pipeline the commands for the given device object.
+
+        This method checks multiple sources in the following order:
+        1. The object's custom fields (`obj.cf`) for the key `"pipeline_commands"`.
+        2. The object's configuration context (`obj.get_config_context()`) for the same key.
+        3. The class attribute `pipeline_commands`, which defaults to False.
+
+        Returns:
+            bool:
+                - True or False if the key exists in any of the sources and is explicitly set.
+        """
+        custom_field = obj.cf.get("pipeline_commands")
+        if isinstance(custom_field, bool):
+            return custom_field
+        config_context = obj.get_config_context().get("pipeline_commands")
+        if isinstance(config_context, bool):
+            return config_context
+        return cls.pipeline_commands
+
+    @classmethod
+    def _split_pipelined_output(cls, output: str, command_list: list[str], marker: str) -> dict:
+        """Split the output of pipelined commands into the output of each command.
+
+        Each command is followed by the `pipeline_marker_command`, so the output of a command is everything between
+        the echo of the command and the echo of its marker, the latter being on the same line as the trailing prompt.
+
+        Args:
+            output (str): The raw channel output of the pipelined commands.
+            command_list (list[str]): The commands that were sent, in order.
+            marker (str): The unique marker token shared by all the marker commands.
+
+        Returns:
+            dict: A dictionary of command to command output.
+        """
+        lines = output.splitlines()
+        command_results = {}
+        start = 0
+        for index, command in enumerate(command_list):
+            command_marker = f"{marker}-{index}-"
+            for position in range(start, len(lines)):
+                if command_marker in lines[position]:
+                    break
+            else:
+                marker_command = cls.pipeline_marker_command.format(marker=command_marker)
+                raise NornirNautobotException(
+                    get_error_message("E1037", command=command, marker_command=marker_command)
+                )
+            command_lines = lines[start:position]
+            # Drop the echo of the command itself, as netmiko_send_command would.
+            if command_lines and command in command_lines[0]:
+                command_lines = command_lines[1:]
+            command_results[command] = "\n".join(command_lines)
+            start = position + 1
+        return command_results
+
+    @classmethod
+    def _send_pipelined_commands(cls, task: Task, command_list: list[str], enable: bool = True, read_timeout=None):
+        """A task to send a group of commands in a single write to the channel.
+
+        Args:
+            task (Task): Nornir Task.
+            command_list (list[str]): The commands to send.
+            enable (bool): Whether to enter enable mode before sending the commands.
+            read_timeout (float): Maximum time to wait for the output of the whole group.
+        """
+        net_connect = task.host.get_connection("netmiko", task.nornir.config)
+        if enable:
+            net_connect.enable()
+        read_timeout = read_timeout or cls.pipeline_read_timeout
+        marker = f"nornir-nautobot-{uuid.uuid4().hex}"
+        payload = []
+        for index, command in enumerate(command_list):
+            payload.append(command)
+            payload.append(cls.pipeline_marker_command.format(marker=f"{marker}-{index}-"))
+        net_connect.write_channel(net_connect.RETURN.join(payload) + net_connect.RETURN)
+        output = net_connect.read_until_pattern(
+            pattern=re.escape(f"{marker}-{len(command_list) - 1}-"), read_timeout=read_timeout
+        )
+        output += net_connect.read_until_prompt(read_timeout=read_timeout)
+        output = net_connect.normalize_linefeeds(net_connect.strip_ansi_escape_codes(output))
+        return Result(host=task.host, result=cls._split_pipelined_output(output, command_list, marker))
+
+    @classmethod
+    def _get_pipelined_commands(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, command_list: list[str], spool_directory=None, read_timeout=None
+    ):
+        """Get the commands from a device in groups of `pipeline_group_size` pipelined commands.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            command_list (list[str]): A list of command strings to execute on the device.
+            spool_directory (str): The folder to spool outputs larger than `spool_threshold` to.
+            read_timeout (float): Maximum time to wait for the output of each group.
+        """
+        command_results = {}
+        for start in range(0, len(command_list), cls.pipeline_group_size):
+            group_results = cls._run_pipelined_group(
+                task, logger, obj, command_list[start : start + cls.pipeline_group_size], read_timeout
+            )
+            group_results.update(
+                cls._collect_command_results(task, logger, obj, group_results.items(), spool_directory)
+            )
+            command_results.update(group_results)
+
+        return Result(host=task.host, result={"output": command_results})
+
+    @classmethod
+    def _run_pipelined_group(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, command_group: list[str], read_timeout=None
+    ) -> dict:
+        """Run `_send_pipelined_commands` for a group of commands, returning the output of each command.
+
+        The returned dictionary is the result of the subtask, so the outputs replaced in it are replaced there too.
+        """
+        try:
+            result = task.run(
+                task=cls._send_pipelined_commands,
+                command_list=command_group,
+                enable=is_truthy(os.getenv("NORNIR_NAUTOBOT_NETMIKO_ENABLE_DEFAULT", default="True")),
+                read_timeout=read_timeout,
+            )
+        except NornirSubTaskError as exc:
+            error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc.result.exception), "E1014")
+            error_msg = get_error_message(error_code, exc=exc)
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
+        return result[0].result
+
     @classmethod
     def get_git_command(
         cls,
@@ -746,8 +1526,7 @@ class NetmikoDefault(DispatcherMixin):
 
         try:
             logger.info(f"Reading command output from: {command_file_path}")
-            with open(command_file_path, "r", encoding="utf-8") as file:
-                command_output_raw = file.read()
+            command_output_raw = read_text(command_file_path)
         except OSError as exc:
             error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc), "E1031")
             error_msg = get_error_message(error_code, exc=exc)
@@ -763,6 +1542,7 @@ class NetmikoDefault(DispatcherMixin):
         obj,
         command: str,
         command_file_path: str = None,
+        spool_directory: str = None,
         **kwargs,
     ):  # pylint: disable=too-many-positional-arguments
         """A tasks to get the commands from a device.
@@ -773,6 +1553,7 @@ class NetmikoDefault(DispatcherMixin):
             obj (Device): A Nautobot Device Django ORM object instance.
             command: A command to execute.
             command_file_path (str): The path to the command output file located in the Git repository.
+            spool_directory (str): The folder to spool an output larger than `spool_threshold` to.
             kwargs: Additional arguments to pass to the netmiko_send_command task.
         """
         logger.debug(f"Executing get_command for {task.host.name} on {task.host.platform}")
@@ -809,6 +1590,7 @@ class NetmikoDefault(DispatcherMixin):
             logger.error(error_msg, extra={"object": obj})
             raise NornirNautobotException(error_msg)
 
+        result[0].result = cls._spool_output(task, command, result[0].result, spool_directory)
         return Result(host=task.host, result={"output": {command: result[0].result}})
 
     @classmethod
@@ -818,10 +1600,15 @@ class NetmikoDefault(DispatcherMixin):
         logger,
         obj,
         command_list: list[str] | list[tuple[str, str]],
+        spool_directory: str = None,
         **kwargs,
     ):  # pylint: disable=too-many-positional-arguments, too-many-locals
         """A tasks to get the commands from a device.
 
+        When `pipeline_commands` is enabled for the device and only `read_timeout` is passed as an additional
+        argument, the commands are sent in groups of `pipeline_group_size` in a single write each, instead of
+        one `netmiko_send_command` per command.
+
         Args:
             task (Task): Nornir Task.
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
@@ -830,9 +1617,13 @@ class NetmikoDefault(DispatcherMixin):
                 - In online mode (Netmiko), a list of command strings to execute on the device.
                 - In offline mode (Git), a list of (command_label, file location) tuples
                   pointing to stored command output files in the Git repo.
+            spool_directory (str): The folder to spool outputs larger than `spool_threshold` to.
             kwargs: Additional arguments to pass to the netmiko_send_command task.
         """
         logger.debug(f"Executing get_commands for {task.host.name} on {task.host.platform}")
+        if not cls._offline_commands(obj) and cls._pipeline_commands(obj) and set(kwargs).issubset({"read_timeout"}):
+            return cls._get_pipelined_commands(task, logger, obj, list(command_list), spool_directory, **kwargs)
+
         command_results = {}
         for command in command_list:
             try:
@@ -856,6 +1647,7 @@ class NetmikoDefault(DispatcherMixin):
                     if failed:
                         logger.error(error_msg, extra={"object": obj})
                         raise NornirNautobotException(error_msg)
+                result[0].result = cls._spool_output(task, command, result[0].result, spool_directory)
                 command_results.update({command: result[0].result})
             except NornirSubTaskError as exc:
                 error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc.result.exception), "E1014")
@@ -956,11 +1748,15 @@ class ScrapliDefault(DispatcherMixin):
         command = cls.config_command
         getter_result = cls.get_command(task, logger, obj, command)
         running_config = getter_result.result.get("output").get(command)
-        processed_config = cls._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
-        return Result(host=task.host, result={"config": processed_config})
+        processed_config, changed = cls._run_process_config(
+            logger, running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
 
     @classmethod
-    def get_command(cls, task: Task, logger, obj, command, **kwargs):
+    def get_command(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, command, spool_directory: str = None, **kwargs
+    ):
         """A tasks to get the commands from a device.
 
         Args:
@@ -968,6 +1764,7 @@ class ScrapliDefault(DispatcherMixin):
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
             obj (Device): A Nautobot Device Django ORM object instance.
             command: A command to execute.
+            spool_directory (str): The folder to spool an output larger than `spool_threshold` to.
             kwargs: Additional arguments to pass to the scrapli_send_command task.
         """
         logger.debug(f"Executing get_commands for {task.host.name} on {task.host.platform}")
@@ -988,38 +1785,321 @@ class ScrapliDefault(DispatcherMixin):
             logger.error(error_msg, extra={"object": obj})
             raise NornirNautobotException(error_msg)
 
+        result[0].result = cls._spool_output(task, command, result[0].result, spool_directory)
         return Result(host=task.host, result={"output": {command: result[0].result}})
 
     @classmethod
-    def get_commands(cls, task: Task, logger, obj, command_list, **kwargs):
+    def get_commands(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, command_list, spool_directory: str = None, **kwargs
+    ):
         """A tasks to get the commands from a device.
 
+        All commands are sent in a single `scrapli_send_commands` subtask, the individual responses are then checked
+        for hidden errors so a failure can still be attributed to the command that caused it.
+
         Args:
             task (Task): Nornir Task.
             logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
             obj (Device): A Nautobot Device Django ORM object instance.
-            command_list: A command to execute.
+            command_list: A list of commands to execute.
+            spool_directory (str): The folder to spool outputs larger than `spool_threshold` to.
             kwargs: Additional arguments to pass to the scrapli_send_commands task.
         """
         logger.debug(f"Executing get_commands for {task.host.name} on {task.host.platform}")
-        command_results = {}
-        for command in command_list:
+        command_list = list(command_list)
+        try:
+            result = task.run(
+                task=scrapli_send_commands,
+                commands=command_list,
+                strip_prompt=True,
+                **kwargs,
+            )
+        except NornirSubTaskError as exc:
+            scrapli_response = getattr(exc.result, "scrapli_response", None) or []
+            for command, response in zip(command_list, scrapli_response):
+                if response.failed:
+                    logger.error(f"Command `{command}` failed on {task.host.name}", extra={"object": obj})
+                    break
+            error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc.result.exception), "E1014")
+            error_msg = get_error_message(error_code, exc=exc)
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
+
+        command_results = cls._collect_command_results(
+            task, logger, obj, zip(command_list, result[0].scrapli_response), spool_directory
+        )
+        result[0].result = command_results
+        return Result(host=task.host, result={"output": command_results})
+
+
+class AsyncScrapliDefault(DispatcherMixin):
+    """Default collection of Nornir Tasks based on asyncio Scrapli.
+
+    The scrapli sessions are coroutines run on the shared event loop. Through the dispatcher, each host blocks a
+    Nornir worker thread until its result is ready, so the number of sessions in flight is that of the Nornir workers,
+    as with the other frameworks. `send_commands_to_hosts` gathers the sessions of many hosts at once instead, so up to
+    `max_concurrent_sessions` are in flight in a single process without a thread per host.
+
+    A host waits at most `session_timeout` seconds for one of the `max_concurrent_sessions` slots. With
+    `reuse_connections` set, the session of a host is kept open and reused by its next commands, until
+    `close_connections` is called, E.g. at the end of the run. At most `max_concurrent_sessions` sessions are kept
+    open, the least recently used idle session is closed to open a new one.
+    """
+
+    config_command = "show run"
+    transport = "asyncssh"
+    max_concurrent_sessions = 1000
+    session_timeout = 600.0
+    reuse_connections = False
+    _session_semaphores = {}
+    _connections = {}
+
+    @classmethod
+    def _get_connection_parameters(cls, host) -> dict:
+        """Build the AsyncScrapli parameters from the scrapli connection options of the host.
+
+        Args:
+            host (Host): Nornir Host.
+
+        Returns:
+            dict: The keyword arguments used to create the AsyncScrapli connection.
+        """
+        connection_options = host.get_connection_parameters("scrapli")
+        parameters = {
+            "host": connection_options.hostname,
+            "auth_username": connection_options.username or "",
+            "auth_password": connection_options.password or "",
+            "port": connection_options.port or cls.tcp_port,
+            "platform": SCRAPLI_PLATFORM_MAP.get(connection_options.platform, connection_options.platform),
+            "transport": cls.transport,
+        }
+        parameters.update(connection_options.extras or {})
+        return parameters
+
+    @classmethod
+    async def _async_resolve_connection_parameters(cls, host) -> dict:
+        """Get the AsyncScrapli parameters, with the hostname resolved through `DNS_CACHE` when the session is opened.
+
+        The address is looked up when each session is opened rather than stored in the inventory, so it follows the
+        DNS once the cached entry expires. A hostname which is not resolvable is left to the transport to report.
+        """
+        parameters = cls._get_connection_parameters(host)
+        if parameters["host"]:
+            parameters["host"] = await DNS_CACHE.async_resolve(parameters["host"]) or parameters["host"]
+        return parameters
+
+    @classmethod
+    def _get_session_semaphore(cls) -> asyncio.Semaphore:
+        """Get the semaphore limiting the concurrent sessions of this class on the running event loop."""
+        key = (id(asyncio.get_running_loop()), cls.__name__)
+        if key not in cls._session_semaphores:
+            cls._session_semaphores[key] = asyncio.Semaphore(cls.max_concurrent_sessions)
+        return cls._session_semaphores[key]
+
+    @classmethod
+    @asynccontextmanager
+    async def _session_slot(cls):
+        """Hold one of the `max_concurrent_sessions` slots, waiting at most `session_timeout` seconds for it."""
+        semaphore = cls._get_session_semaphore()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), cls.session_timeout)
+        except asyncio.TimeoutError as exc:
+            raise ScrapliTimeout(
+                f"No session slot freed up within {cls.session_timeout} seconds, "
+                f"`max_concurrent_sessions` is {cls.max_concurrent_sessions}"
+            ) from exc
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    @classmethod
+    def _get_open_connections(cls) -> OrderedDict:
+        """Get the sessions kept open by `reuse_connections` on the running event loop, least recently used first."""
+        return cls._connections.setdefault((id(asyncio.get_running_loop()), cls.__name__), OrderedDict())
+
+    @classmethod
+    async def _evict_idle_connections(cls, connections: OrderedDict) -> None:
+        """Close the least recently used idle sessions, until a new session fits in `max_concurrent_sessions`."""
+        while sum(entry["connection"] is not None for entry in connections.values()) >= cls.max_concurrent_sessions:
+            idle = [
+                entry
+                for entry in connections.values()
+                if entry["connection"] is not None and not entry["lock"].locked()
+            ]
+            if not idle:
+                return
+            await cls._close_connection(idle[0])
+
+    @classmethod
+    async def async_send_commands(cls, host, command_list: list[str], **kwargs):
+        """Coroutine to send commands to a device over a new AsyncScrapli session, or its open one when reused.
+
+        Args:
+            host (Host): Nornir Host.
+            command_list (list[str]): The commands to execute.
+            kwargs: Additional arguments to pass to the AsyncScrapli send_commands method.
+
+        Returns:
+            MultiResponse: The scrapli responses, one per command.
+        """
+        async with cls._session_slot():
+            if not cls.reuse_connections:
+                async with AsyncScrapli(**await cls._async_resolve_connection_parameters(host)) as connection:
+                    return await connection.send_commands(command_list, strip_prompt=True, **kwargs)
+            connections = cls._get_open_connections()
+            entry = connections.setdefault(host.name, {"connection": None, "lock": asyncio.Lock()})
+            connections.move_to_end(host.name)
+            async with entry["lock"]:
+                if entry["connection"] is None:
+                    await cls._evict_idle_connections(connections)
+                    connection = AsyncScrapli(**await cls._async_resolve_connection_parameters(host))
+                    await connection.open()
+                    entry["connection"] = connection
+                try:
+                    return await entry["connection"].send_commands(command_list, strip_prompt=True, **kwargs)
+                except Exception:
+                    # The session may be broken, the next commands open a new one.
+                    await cls._close_connection(entry)
+                    raise
+
+    @classmethod
+    async def _close_connection(cls, entry: dict) -> None:
+        """Close an open session, kept open by `reuse_connections`."""
+        connection, entry["connection"] = entry["connection"], None
+        if connection is None:
+            return
+        try:
+            await connection.close()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _logger.debug("Failed to close the session of %s: %s", connection.host, exc)
+
+    @classmethod
+    async def async_close_connections(cls) -> None:
+        """Coroutine to close the sessions kept open by `reuse_connections` on the running event loop."""
+        connections = cls._connections.pop((id(asyncio.get_running_loop()), cls.__name__), {})
+        for entry in connections.values():
+            async with entry["lock"]:
+                await cls._close_connection(entry)
+
+    @classmethod
+    def close_connections(cls) -> None:
+        """Close the sessions kept open by `reuse_connections` on the shared event loop."""
+        run_coroutine(cls.async_close_connections())
+
+    @classmethod
+    async def async_send_commands_to_hosts(cls, hosts, command_list: list[str], **kwargs) -> dict:
+        """Coroutine to send the same commands to many devices concurrently, see `send_commands_to_hosts`."""
+
+        async def _send_commands(host):
             try:
-                result = task.run(
-                    task=scrapli_send_command,
-                    command=command,
-                    strip_prompt=True,
-                    **kwargs,
-                )
-                failed, error_msg = cls._has_hidden_errors(result[0].result)
-                if failed:
-                    logger.error(error_msg, extra={"object": obj})
-                    raise NornirNautobotException(error_msg)
-                command_results.update({command: result[0].result})
-            except NornirSubTaskError as exc:
-                error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc.result.exception), "E1014")
-                error_msg = get_error_message(error_code, exc=exc)
-                logger.error(error_msg, extra={"object": obj})
-                raise NornirNautobotException(error_msg)
+                return host.name, await cls.async_send_commands(host, command_list, **kwargs)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                return host.name, exc
+
+        return dict(await asyncio.gather(*[_send_commands(host) for host in hosts]))
+
+    @classmethod
+    def send_commands_to_hosts(cls, hosts, command_list: list[str], **kwargs) -> dict:
+        """Send the same commands to many devices concurrently on the shared event loop, without a thread per host.
+
+        The sessions of all the hosts are gathered at once, up to `max_concurrent_sessions` of them in flight, so a
+        mass collection is not bounded by the number of Nornir workers.
+
+        Args:
+            hosts (Iterable[Host]): The Nornir hosts, E.g. `nornir.inventory.hosts.values()`.
+            command_list (list[str]): The commands to execute.
+            kwargs: Additional arguments to pass to the AsyncScrapli send_commands method.
+
+        Returns:
+            dict: A dictionary of host name to its `MultiResponse`, or to the exception its session failed with.
+        """
+        return run_coroutine(cls.async_send_commands_to_hosts(list(hosts), command_list, **kwargs))
 
+    @classmethod
+    def _send_commands(cls, task: Task, command_list: list[str], **kwargs) -> Result:
+        """A task to run `async_send_commands` on the shared event loop."""
+        return Result(host=task.host, result=run_coroutine(cls.async_send_commands(task.host, command_list, **kwargs)))
+
+    @classmethod
+    def get_config(  # pylint: disable=too-many-positional-arguments
+        cls,
+        task: Task,
+        logger,
+        obj,
+        backup_file: str,
+        remove_lines: list,
+        substitute_lines: list,
+    ) -> Result:
+        """Get the latest configuration from the device using asyncio Scrapli.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            remove_lines (list): A list of regex lines to remove configurations.
+            substitute_lines (list): A list of dictionaries with to remove and replace lines.
+            backup_file (str): The file location of where the back configuration should be saved.
+
+        Returns:
+            Result: Nornir Result object with a dict as a result containing the running configuration
+                { "config: <running configuration> }
+        """
+        logger.debug(f"Executing get_config for {task.host.name} on {task.host.platform}")
+        command = cls.config_command
+        getter_result = cls.get_command(task, logger, obj, command)
+        running_config = getter_result.result.get("output").get(command)
+        processed_config, changed = cls._run_process_config(
+            logger, running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
+
+    @classmethod
+    def get_command(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, command, spool_directory: str = None, **kwargs
+    ):
+        """A tasks to get the commands from a device.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            command: A command to execute.
+            spool_directory (str): The folder to spool an output larger than `spool_threshold` to.
+            kwargs: Additional arguments to pass to the AsyncScrapli send_commands method.
+        """
+        return cls.get_commands(task, logger, obj, [command], spool_directory, **kwargs)
+
+    @classmethod
+    def get_commands(  # pylint: disable=too-many-positional-arguments
+        cls, task: Task, logger, obj, command_list, spool_directory: str = None, **kwargs
+    ):
+        """A tasks to get the commands from a device.
+
+        Args:
+            task (Task): Nornir Task.
+            logger (logging.Logger): Logger that may be a Nautobot Jobs or Python logger.
+            obj (Device): A Nautobot Device Django ORM object instance.
+            command_list: A list of commands to execute.
+            spool_directory (str): The folder to spool outputs larger than `spool_threshold` to.
+            kwargs: Additional arguments to pass to the AsyncScrapli send_commands method.
+        """
+        logger.debug(f"Executing get_commands for {task.host.name} on {task.host.platform}")
+        if cls.transport == "asyncssh" and not asyncssh:
+            error_msg = get_error_message("E1020", dependency="asyncssh")
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
+        command_list = list(command_list)
+        try:
+            result = task.run(task=cls._send_commands, command_list=command_list, **kwargs)
+        except NornirSubTaskError as exc:
+            error_code = EXCEPTION_TO_ERROR_MAPPER.get(type(exc.result.exception), "E1014")
+            error_msg = get_error_message(error_code, exc=exc)
+            logger.error(error_msg, extra={"object": obj})
+            raise NornirNautobotException(error_msg)
+
+        command_results = cls._collect_command_results(
+            task, logger, obj, zip(command_list, result[0].result), spool_directory
+        )
+        result[0].result = command_results
         return Result(host=task.host, result={"output": command_results})
@@ -99,8 +99,10 @@ class ApiMikrotikRouteros(DispatcherMixin):
 
         connection.disconnect()
         running_config = json.dumps(config_data, indent=4)
-        processed_config = cls._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
-        return Result(host=task.host, result={"config": processed_config})
+        processed_config, changed = cls._run_process_config(
+            logger, running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
 
 
 class NetmikoMikrotikRouteros(NetmikoDefault):
@@ -170,8 +172,10 @@ class NetmikoMikrotikRouteros(NetmikoDefault):
             return result
 
         _running_config = result[0].result
-        processed_config = cls._process_config(logger, _running_config, remove_lines, substitute_lines, backup_file)
-        return Result(host=task.host, result={"config": processed_config})
+        processed_config, changed = cls._run_process_config(
+            logger, _running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
 
     @staticmethod
     def merge_config(
@@ -183,5 +183,7 @@ class ApiRuckusSmartzone(DispatcherMixin):
         url_dict = cls._build_urls(obj, logger, _wlc_ip4, _token, _endpoints, _extras)
         config_data = asyncio.run(cls._async_get_data(url_dict))
         running_config = json.dumps(config_data, indent=4)
-        processed_config = cls._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
-        return Result(host=task.host, result={"config": processed_config})
+        processed_config, changed = cls._run_process_config(
+            logger, running_config, remove_lines, substitute_lines, backup_file
+        )
+        return Result(host=task.host, result={"config": processed_config}, changed=changed)
@@ -1,19 +1,538 @@
 """This is a vendored and updated implementation of the template_file task from nornor-jinja2."""
 
+import argparse
+import copy
+import hashlib
+import json
 import logging
 import os
-import sys
+import pickle
+import threading
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Any, Callable, Dict, Optional
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    TemplateError,
+    TemplateNotFound,
+    meta,
+)
 from nornir.core.task import Result, Task
 
-from nornir_nautobot.utils.helpers import get_error_message
+from nornir_nautobot.utils.helpers import get_error_message, get_process_pool_context, import_string
 
 FiltersDict = Optional[Dict[str, Callable[..., str]]]
 LOGGER = logging.getLogger(__name__)
 
+JINJA_ENV_CACHE_SIZE = 32
+# The default bytecode cache folder of `precompile_templates`, within the template folder.
+JINJA_BYTECODE_CACHE_DIRNAME = ".jinja_bytecode_cache"
+_JINJA_ENV_CACHE = OrderedDict()
+_JINJA_ENV_CACHE_LOCK = threading.Lock()
+
+
+# The settings of an environment the compiled code of a template depends on.
+JINJA_ENV_SETTINGS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+    "trim_blocks",
+    "lstrip_blocks",
+    "newline_sequence",
+    "keep_trailing_newline",
+    "optimized",
+    "is_async",
+)
+
+
+def _get_qualified_name(value) -> str:
+    """Get the import path of a function or class, or the repr of any other value."""
+    if callable(value):
+        return f"{getattr(value, '__module__', None)}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+    return repr(value)
+
+
+def get_jinja_env_fingerprint(env: Environment) -> str:
+    """Get a sha256 fingerprint of the settings of an environment, the same across processes for the same settings.
+
+    It covers the lexer and whitespace settings, the extensions, the undefined class, the autoescape and finalize
+    settings, and the filters and tests by the import path of their functions, which all change how a template is
+    compiled or rendered. The globals are not covered, as they are not known to be stable.
+
+    Args:
+        env (Environment): The environment.
+
+    Returns:
+        str: The fingerprint.
+    """
+    settings = {name: getattr(env, name) for name in JINJA_ENV_SETTINGS}
+    settings["extensions"] = sorted(env.extensions)
+    settings["undefined"] = _get_qualified_name(env.undefined)
+    settings["autoescape"] = _get_qualified_name(env.autoescape)
+    settings["finalize"] = _get_qualified_name(env.finalize)
+    settings["filters"] = {name: _get_qualified_name(function) for name, function in env.filters.items()}
+    settings["tests"] = {name: _get_qualified_name(function) for name, function in env.tests.items()}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf8")).hexdigest()
+
+
+def _create_jinja_env(
+    path: str, jinja_filters: dict, jinja_env: Optional[Environment], bytecode_cache_dir: Optional[str]
+) -> Environment:
+    if jinja_env:
+        # An overlay shares the settings of the caller's environment, without modifying it.
+        env = jinja_env.overlay(loader=FileSystemLoader(path))
+        env.filters = {**jinja_env.filters, **jinja_filters}
+    else:
+        env = Environment(undefined=StrictUndefined, trim_blocks=True, loader=FileSystemLoader(path))  # noqa: S701
+        env.filters.update(jinja_filters)
+    if bytecode_cache_dir:
+        # The bytecode cache is keyed by template name and source only, so each set of settings has its own folder.
+        env_bytecode_cache_dir = os.path.join(bytecode_cache_dir, get_jinja_env_fingerprint(env)[:16])
+        os.makedirs(env_bytecode_cache_dir, exist_ok=True)
+        env.bytecode_cache = FileSystemBytecodeCache(env_bytecode_cache_dir)
+    return env
+
+
+def get_jinja_env(
+    path: str,
+    jinja_filters: Optional[FiltersDict] = None,
+    jinja_env: Optional[Environment] = None,
+    bytecode_cache_dir: Optional[str] = None,
+) -> Environment:
+    """Get the Jinja environment of a template folder, shared across the hosts and threads of the process.
+
+    The environments are cached by template folder, filters, base environment and bytecode cache folder, so each
+    template is only compiled once per process rather than once per host. With a `bytecode_cache_dir`, the compiled
+    templates are also stored on disk for the other processes. The environment passed as `jinja_env` is not modified,
+    the returned environment is an overlay of it, which must be passed again once modified to be taken into account.
+
+    Args:
+        path (str): The folder of the templates.
+        jinja_filters (dict): The filters to add to the environment.
+        jinja_env (Environment): The environment the settings are taken from, instead of the default ones.
+        bytecode_cache_dir (str): The folder of a `FileSystemBytecodeCache`, None for no bytecode cache.
+
+    Returns:
+        Environment: The environment.
+    """
+    jinja_filters = jinja_filters or {}
+    path = os.path.abspath(path)
+    try:
+        key = (path, frozenset(jinja_filters.items()), jinja_env, bytecode_cache_dir)
+        hash(key)
+    except TypeError:
+        # An unhashable filter, the environment can not be shared.
+        return _create_jinja_env(path, jinja_filters, jinja_env, bytecode_cache_dir)
+    with _JINJA_ENV_CACHE_LOCK:
+        env = _JINJA_ENV_CACHE.get(key)
+        if env is None:
+            env = _JINJA_ENV_CACHE[key] = _create_jinja_env(path, jinja_filters, jinja_env, bytecode_cache_dir)
+            while len(_JINJA_ENV_CACHE) > JINJA_ENV_CACHE_SIZE:
+                _JINJA_ENV_CACHE.popitem(last=False)
+        else:
+            _JINJA_ENV_CACHE.move_to_end(key)
+    return env
+
+
+def precompile_templates(
+    path: str,
+    bytecode_cache_dir: Optional[str] = None,
+    jinja_filters: Optional[FiltersDict] = None,
+    jinja_env: Optional[Environment] = None,
+    extensions: Optional[list] = None,
+) -> int:
+    """Compile every template of a folder ahead of time into a bytecode cache, for the workers to load them from.
+
+    A template is only loaded from the bytecode cache while its source is unchanged, else it is compiled again. The
+    templates are stored in a subfolder per environment fingerprint, see `get_jinja_env_fingerprint`, so they are only
+    loaded by a render with the same filters and `jinja_env` settings as they were precompiled with.
+
+    Args:
+        path (str): The folder of the templates.
+        bytecode_cache_dir (str): The bytecode cache folder, by default `.jinja_bytecode_cache` within the template
+            folder, to pass as the `jinja_bytecode_cache_dir` of `template_file`.
+        jinja_filters (dict): The filters the templates are rendered with.
+        jinja_env (Environment): The environment the templates are rendered with.
+        extensions (list): The extensions of the templates to compile, E.g. ["j2"], all the files by default.
+
+    Returns:
+        int: The number of templates compiled.
+    """
+    if not os.path.isdir(path):
+        raise NotADirectoryError(f"Template folder not found: {path}")
+    bytecode_cache_dir = bytecode_cache_dir or os.path.join(os.path.abspath(path), JINJA_BYTECODE_CACHE_DIRNAME)
+    env = _create_jinja_env(os.path.abspath(path), jinja_filters or {}, jinja_env, bytecode_cache_dir)
+    compiled = 0
+    for name in env.list_templates(extensions=extensions):
+        if name.startswith(f"{JINJA_BYTECODE_CACHE_DIRNAME}/"):
+            continue
+        try:
+            env.get_template(name)
+            compiled += 1
+        except (TemplateError, UnicodeDecodeError) as error:
+            LOGGER.warning("Template %s could not be precompiled: %s", name, error)
+    LOGGER.info("Precompiled %s templates of %s to %s", compiled, path, bytecode_cache_dir)
+    return compiled
+
+
+def clear_jinja_env_cache() -> None:
+    """Forget all the shared Jinja environments, and the templates they compiled."""
+    with _JINJA_ENV_CACHE_LOCK:
+        _JINJA_ENV_CACHE.clear()
+
+
+@lru_cache(maxsize=4096)
+def _get_referenced_templates(env: Environment, source: str) -> Optional[tuple]:
+    """Get the names a template source includes, imports or extends, None if any is only known when rendering."""
+    references = tuple(meta.find_referenced_templates(env.parse(source)))
+    return None if None in references else references
+
+
+def _get_source_digest(env: Environment, name: str) -> tuple:
+    """Get the sha256 digest of the source of a template, and the source."""
+    source = env.loader.get_source(env, name)[0]
+    return hashlib.sha256(source.encode("utf8")).hexdigest(), source
+
+
+def get_template_digest(env: Environment, template: str) -> str:
+    """Get the sha256 digest of the sources of a template and of every template it includes, imports or extends.
+
+    A change to any template the render depends on changes the digest. When a template references another by a name
+    only known when rendering, E.g. `{% include host.platform ~ ".j2" %}`, the digest covers every template of the
+    folder instead. The references of a source are only parsed once per environment.
+
+    Args:
+        env (Environment): The environment the template is rendered with, see `get_jinja_env`.
+        template (str): The template name.
+
+    Returns:
+        str: The digest.
+    """
+    digests = {}
+    pending = [template]
+    while pending:
+        name = pending.pop()
+        if name in digests:
+            continue
+        try:
+            digests[name], source = _get_source_digest(env, name)
+        except TemplateNotFound:
+            if name == template:
+                raise
+            # E.g. an `ignore missing` include, its later creation changes the digest.
+            digests[name] = None
+            continue
+        references = _get_referenced_templates(env, source)
+        if references is None:
+            digests = {}
+            for other_name in env.list_templates():
+                if other_name.startswith(f"{JINJA_BYTECODE_CACHE_DIRNAME}/"):
+                    continue
+                try:
+                    digests[other_name] = _get_source_digest(env, other_name)[0]
+                except UnicodeDecodeError:
+                    continue
+            break
+        pending.extend(env.join_path(reference, name) for reference in references)
+    digest = hashlib.sha256(template.encode("utf8"))
+    for name in sorted(digests):
+        digest.update(f"\0{name}\0{digests[name]}".encode("utf8"))
+    return digest.hexdigest()
+
+
+class TemplateDependencyGraph:
+    """The include, import and extends graph of the templates of a folder, to find the templates affected by a change.
+
+    The references of each template are extracted with `jinja2.meta`, once per source, and only the files modified since
+    the previous query are read again. A template referencing another by a name only known when rendering, E.g.
+    `{% include host.platform ~ ".j2" %}`, depends on every template of the folder.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        jinja_filters: Optional[FiltersDict] = None,
+        jinja_env: Optional[Environment] = None,
+        extensions: Optional[list] = None,
+    ) -> None:
+        """Initialize the graph, built on the first query.
+
+        Args:
+            path (str): The folder of the templates.
+            jinja_filters (dict): The filters the templates are rendered with.
+            jinja_env (Environment): The environment the templates are rendered with, for its syntax settings.
+            extensions (list): The extensions of the templates, E.g. ["j2"], all the files by default.
+        """
+        self.path = os.path.abspath(path)
+        self.extensions = extensions
+        self._env = get_jinja_env(self.path, jinja_filters, jinja_env)
+        # The (mtime, size) of each template and its references, None when only known when rendering.
+        self._stats = {}
+        self._references = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Read the templates added or modified since the previous query, and forget the deleted ones."""
+        with self._lock:
+            names = set()
+            for name in self._env.list_templates(extensions=self.extensions):
+                if name.startswith(f"{JINJA_BYTECODE_CACHE_DIRNAME}/"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.path, *name.split("/")))
+                except OSError:
+                    continue
+                names.add(name)
+                if self._stats.get(name) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                try:
+                    source = self._env.loader.get_source(self._env, name)[0]
+                    references = _get_referenced_templates(self._env, source)
+                except (TemplateError, UnicodeDecodeError) as error:
+                    LOGGER.warning("Template %s could not be parsed: %s", name, error)
+                    references = ()
+                self._stats[name] = (stat.st_mtime_ns, stat.st_size)
+                self._references[name] = (
+                    None if references is None else {self._env.join_path(reference, name) for reference in references}
+                )
+            for name in set(self._stats) - names:
+                del self._stats[name]
+                del self._references[name]
+
+    def _normalize(self, name: str) -> str:
+        """Get the template name of a file path, absolute or relative to the folder, or of a template name."""
+        if os.path.isabs(name):
+            name = os.path.relpath(name, self.path)
+        return name.replace(os.sep, "/")
+
+    def get_references(self) -> dict:
+        """Get the templates each template includes, imports or extends directly.
+
+        Returns:
+            dict: The set of template names by template name, None when only known when rendering.
+        """
+        self.refresh()
+        with self._lock:
+            return {name: None if refs is None else set(refs) for name, refs in self._references.items()}
+
+    def get_dependents(self, changed_files) -> set:
+        """Get the templates depending on any of the changed files, directly or not, including the changed files.
+
+        Args:
+            changed_files (Iterable[str]): The changed, added or deleted files, by template name or by path, absolute
+                or relative to the folder.
+
+        Returns:
+            set: The template names.
+        """
+        references = self.get_references()
+        dependents = {}
+        dynamic = set()
+        for name, refs in references.items():
+            if refs is None:
+                dynamic.add(name)
+                continue
+            for reference in refs:
+                dependents.setdefault(reference, set()).add(name)
+        found = {self._normalize(name) for name in changed_files}
+        if found:
+            found |= dynamic
+        pending = list(found)
+        while pending:
+            for dependent in dependents.get(pending.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
+
+    def get_affected_templates(self, changed_files, templates=None) -> set:
+        """Get the top-level templates to render again after a change, to limit `generate_config` to their hosts.
+
+        Args:
+            changed_files (Iterable[str]): The changed, added or deleted files, by template name or by path, absolute
+                or relative to the folder.
+            templates (Iterable[str]): The top-level templates, by default the templates no other template references.
+
+        Returns:
+            set: The top-level template names depending on any of the changed files.
+        """
+        dependents = self.get_dependents(changed_files)
+        if templates is None:
+            references = self.get_references()
+            referenced = set().union(*(refs for refs in references.values() if refs is not None))
+            templates = set(references) - referenced
+        return dependents & {self._normalize(template) for template in templates}
+
+
+def _get_render_error_message(error: Exception, template: str, path: str) -> str:  # pylint: disable=too-many-locals,too-many-branches
+    """Get the error message of a failed render, with the error code, E.g. E1010, and the line of the template."""
+    error_type = type(error).__name__
+    message = str(error)
+
+    # Prefer e.filename and e.lineno if available
+    filename = getattr(error, "filename", None)
+    line_number = getattr(error, "lineno", None)
+
+    # Fall back to traceback parsing if attributes are missing or invalid
+    if not filename or not line_number:
+        tb_list = traceback.extract_tb(error.__traceback__)
+        for frame in reversed(tb_list):  # Start from the end (most specific frame)
+            if path in frame.filename or frame.filename.startswith("<"):
+                filename = frame.filename
+                line_number = frame.lineno
+                break
+        # If still not found, use defaults
+        filename = filename or "unknown"
+        line_number = line_number or "unknown"
+
+    # Always extract the original line from the template
+    template_line = "Not available"
+    template_line_context = "Not available"
+    if filename != "unknown" and line_number != "unknown":
+        try:
+            with open(os.path.join(path, filename), "r", encoding="utf8") as f:
+                template_content = f.readlines()
+            if 0 < int(line_number) <= len(template_content):
+                template_line = template_content[int(line_number) - 1].strip()
+                start = max(0, int(line_number) - 3)
+                end = min(len(template_content), int(line_number) + 2)
+                template_line_context = "".join(template_content[start:end]).strip()
+        except (IOError, ValueError) as e:
+            template_line = f"Failed to read template: {str(e)}"
+
+    error_id = ""
+    if error_type == "UndefinedError":
+        error_id = "E1010"
+    elif error_type == "TemplateSyntaxError":
+        error_id = "E1011"
+        template_line = template_line_context
+    elif error_type == "TemplateNotFound":
+        error_id = "E1012"
+    elif error_type == "TemplateError":
+        error_id = "E1013"
+    elif error_type == "TemplateAssertionError":
+        error_id = "E1034"
+    if error_id:
+        return get_error_message(
+            error_id,
+            template=template,
+            filename=filename,
+            line_number=line_number,
+            template_line=template_line,
+            error_type=error_type,
+            message=message,
+        )
+
+    return f"Error rendering template '{template}' at {filename}:{line_number}\nLine: {template_line}\nError Type: {error_type}\nMessage: {message}"
+
+
+_RENDER_POOLS = {}
+_RENDER_POOLS_LOCK = threading.Lock()
+
+
+def _init_render_worker() -> None:
+    """Set up Django in a worker process when the parent process runs it, to unpickle the ORM objects of a context."""
+    if "DJANGO_SETTINGS_MODULE" not in os.environ:
+        return
+    try:
+        import django  # pylint: disable=import-outside-toplevel,import-error
+
+        django.setup()
+    except Exception as error:  # pylint: disable=broad-except
+        # The contexts with ORM objects are then rendered in the Nornir threads.
+        LOGGER.debug("Django could not be set up in the render worker: %s", error)
+
+
+def get_render_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Get the pool of worker processes rendering the templates, kept warm for the life of the process.
+
+    The worker processes are started through `get_process_pool_context`, never by forking the current process, so
+    the pool may be created from a Nornir thread. It is best created before the Nornir run with `start_render_pool`,
+    so the first renders do not wait for the worker processes to start.
+
+    Args:
+        max_workers (int): The number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The pool, shared by every render with the same number of worker processes.
+    """
+    with _RENDER_POOLS_LOCK:
+        if max_workers not in _RENDER_POOLS:
+            _RENDER_POOLS[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=get_process_pool_context(), initializer=_init_render_worker
+            )
+        return _RENDER_POOLS[max_workers]
+
+
+def start_render_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Create the pool of worker processes rendering the templates and wait for its worker processes to start.
+
+    Args:
+        max_workers (int): The number of worker processes, the `render_processes` of the renders.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+    pool = get_render_pool(max_workers)
+    for future in [pool.submit(os.getpid) for _ in range(max_workers)]:
+        future.result()
+    return pool
+
+
+def shutdown_render_pools() -> None:
+    """Stop the worker processes of all the render pools."""
+    with _RENDER_POOLS_LOCK:
+        pools = list(_RENDER_POOLS.values())
+        _RENDER_POOLS.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def _get_render_payload(jinja_filters, host, obj, kwargs: dict):
+    """Pickle the filters and the context of a render for a worker process, None if they can not be pickled."""
+    if host is not None:
+        # The open connections of the host are not needed to render, and can not be pickled.
+        host = copy.copy(host)
+        host.connections = {}
+    try:
+        return pickle.dumps((jinja_filters, {"host": host, "obj": obj, **kwargs}))
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def _render_in_worker(template: str, path: str, bytecode_cache_dir: Optional[str], payload: bytes) -> tuple:
+    """Render a template in a worker process, with the Jinja environment of the worker shared across the renders.
+
+    Returns:
+        tuple: The rendered text, or None with the error and its error message, or only None if the context could not
+            be unpickled in the worker process.
+    """
+    try:
+        jinja_filters, context = pickle.loads(payload)  # noqa: S301
+    except Exception:  # pylint: disable=broad-except
+        return None, None, None
+    env = get_jinja_env(path, jinja_filters, None, bytecode_cache_dir)
+    try:
+        return env.get_template(template).render(**context), None, None
+    except Exception as error:  # pylint: disable=broad-except
+        error_msg = _get_render_error_message(error, template, path)
+        try:
+            pickle.dumps(error)
+        except Exception:  # pylint: disable=broad-except
+            error = TemplateError(f"{type(error).__name__}: {error}")
+        return None, error, error_msg
+
 
 def template_file(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals,too-many-branches,too-many-statements
     task: Task,
@@ -23,11 +542,17 @@ def template_file(  # pylint: disable=too-many-arguments,too-many-positional-arg
     jinja_env: Optional[Environment] = None,
     obj=None,
     logger=None,
+    jinja_bytecode_cache_dir: Optional[str] = None,
+    render_processes: int = 0,
+    stream_to: Optional[Callable] = None,
     **kwargs: Any,
 ) -> Result:
     """
     Renders contents of a file with jinja2. All the host data is available in the template.
 
+    The Jinja environment is shared across the hosts with the same template folder, filters and environment, see
+    `get_jinja_env`.
+
     Arguments:
         task: Nornir task object
         template: filename
@@ -36,93 +561,90 @@ def template_file(  # pylint: disable=too-many-arguments,too-many-positional-arg
         jinja_env: A fully configured jinja2 environment
         obj: An object to pass to the template context
         logger: Logger to use for logging errors
+        jinja_bytecode_cache_dir: folder of a bytecode cache of the compiled templates, shared across processes,
+            None for no bytecode cache
+        render_processes: the number of worker processes of the pool rendering the template, 0 to render in the
+            current thread, which is also the case with a `jinja_env` or a context which can not be pickled
+        stream_to: a callable consuming the rendered template as an iterable of strings, E.g. writing it to a file,
+            so the text is never held in memory as a whole, its return value is the result. The template is then
+            always rendered in the current thread
         **kwargs: additional data to pass to the template
 
     Returns:
         Result object with the following attributes set:
-          * result (``string``): rendered string
+          * result (``string``): rendered string, or the return value of ``stream_to``
     """
-    jinja_filters = jinja_filters or {}
     path = os.path.abspath(path)
     if not logger:
         logger = LOGGER
 
-    if jinja_env:
-        env = jinja_env
-        env.loader = FileSystemLoader(path)
-    else:
-        env = Environment(  # noqa: S701
-            loader=FileSystemLoader(path),
-            undefined=StrictUndefined,
-            trim_blocks=True,
+    payload = None
+    if render_processes and jinja_env is None and stream_to is None:
+        payload = _get_render_payload(jinja_filters, task.host, obj, kwargs)
+        if payload is None:
+            logger.debug("The context of `%s` can not be pickled, rendered in this thread instead", template)
+    if payload is not None:
+        future = get_render_pool(render_processes).submit(
+            _render_in_worker, template, path, jinja_bytecode_cache_dir, payload
         )
-    env.filters.update(jinja_filters)
+        text, error, error_msg = future.result()
+        if error is not None:
+            logger.error(error_msg, extra={"object": obj})
+            raise error
+        if text is not None:
+            return Result(host=task.host, result=text)
+        logger.debug("The context of `%s` can not be unpickled by a worker, rendered in this thread instead", template)
+
+    # Shared across hosts, so every template is compiled once per process.
+    env = get_jinja_env(path, jinja_filters, jinja_env, jinja_bytecode_cache_dir)
 
     try:
         jinja_template = env.get_template(template)
+        if stream_to is not None:
+            return Result(host=task.host, result=stream_to(jinja_template.generate(host=task.host, obj=obj, **kwargs)))
         text = jinja_template.render(host=task.host, obj=obj, **kwargs)
         return Result(host=task.host, result=text)
     except Exception as error:
-        error_type = type(error).__name__
-        message = str(error)
-
-        # Prefer e.filename and e.lineno if available
-        filename = getattr(error, "filename", None)
-        line_number = getattr(error, "lineno", None)
-
-        # Fall back to traceback parsing if attributes are missing or invalid
-        if not filename or not line_number:
-            _, _, exc_traceback = sys.exc_info()
-            tb_list = traceback.extract_tb(exc_traceback)
-            for frame in reversed(tb_list):  # Start from the end (most specific frame)
-                if path in frame.filename or frame.filename.startswith("<"):
-                    filename = frame.filename
-                    line_number = frame.lineno
-                    break
-            # If still not found, use defaults
-            filename = filename or "unknown"
-            line_number = line_number or "unknown"
-
-        # Always extract the original line from the template
-        template_line = "Not available"
-        template_line_context = "Not available"
-        if filename != "unknown" and line_number != "unknown":
-            try:
-                with open(os.path.join(path, filename), "r", encoding="utf8") as f:
-                    template_content = f.readlines()
-                if 0 < int(line_number) <= len(template_content):
-                    template_line = template_content[int(line_number) - 1].strip()
-                    start = max(0, int(line_number) - 3)
-                    end = min(len(template_content), int(line_number) + 2)
-                    template_line_context = "".join(template_content[start:end]).strip()
-            except (IOError, ValueError) as e:
-                template_line = f"Failed to read template: {str(e)}"
-
-        error_id = ""
-        if error_type == "UndefinedError":
-            error_id = "E1010"
-        elif error_type == "TemplateSyntaxError":
-            error_id = "E1011"
-            template_line = template_line_context
-        elif error_type == "TemplateNotFound":
-            error_id = "E1012"
-        elif error_type == "TemplateError":
-            error_id = "E1013"
-        elif error_type == "TemplateAssertionError":
-            error_id = "E1034"
-        if error_id:
-            error_msg = get_error_message(
-                error_id,
-                template=template,
-                filename=filename,
-                line_number=line_number,
-                template_line=template_line,
-                error_type=error_type,
-                message=message,
-            )
-            logger.error(error_msg, extra={"object": obj})
-            raise
-
-        error_msg = f"Error rendering template '{template}' at {filename}:{line_number}\nLine: {template_line}\nError Type: {error_type}\nMessage: {message}"
+        error_msg = _get_render_error_message(error, template, path)
         logger.error(error_msg, extra={"object": obj})
         raise
+
+
+def _import_option(parser: argparse.ArgumentParser, dotted_path: Optional[str]):
+    """Import the object of a dotted path option, None if there is no dotted path."""
+    if not dotted_path:
+        return None
+    value = import_string(dotted_path)
+    if value is None:
+        parser.error(f"{dotted_path} could not be imported")
+    return value
+
+
+def main(args=None) -> None:
+    """Precompile the templates of a folder, E.g. `python -m nornir_nautobot.plugins.tasks.template_file <path>`."""
+    parser = argparse.ArgumentParser(description=precompile_templates.__doc__.splitlines()[0])
+    parser.add_argument("path", help="The folder of the templates.")
+    parser.add_argument(
+        "--bytecode-cache-dir", help=f"The bytecode cache folder, by default {JINJA_BYTECODE_CACHE_DIRNAME}."
+    )
+    parser.add_argument("--extension", action="append", dest="extensions", help="An extension of the templates.")
+    parser.add_argument(
+        "--jinja-filters", help="The dotted path of the dictionary of filters the templates are rendered with."
+    )
+    parser.add_argument(
+        "--jinja-env",
+        help="The dotted path of the environment the templates are rendered with, or of a function returning it.",
+    )
+    options = parser.parse_args(args)
+    jinja_filters = _import_option(parser, options.jinja_filters)
+    jinja_env = _import_option(parser, options.jinja_env)
+    if jinja_env is not None and not isinstance(jinja_env, Environment):
+        jinja_env = jinja_env()
+    logging.basicConfig(level=logging.INFO)
+    precompile_templates(
+        options.path, options.bytecode_cache_dir, jinja_filters, jinja_env, extensions=options.extensions
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,540 @@
+"""Configuration compliance reusing the sections of the unchanged configurations, and a batch compliance across processes."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from netutils.config.compliance import (
+    NON_STRIP_NETWORK_OS,
+    compliance,
+    feature_compliance,
+    parser_map,
+    section_config,
+)
+from nornir.core.task import MultiResult, Result
+
+from nornir_nautobot.utils.compression import content_digest, read_text
+from nornir_nautobot.utils.helpers import get_error_message, get_process_pool_context, make_folder
+from nornir_nautobot.utils.spool import read_spooled_output
+
+LOGGER = logging.getLogger(__name__)
+
+# The compliance stores are mappings such as a `shelve`, which is not thread safe, read and written from the Nornir
+# threads.
+_COMPLIANCE_STORE_LOCK = threading.Lock()
+
+# The features and cache of a batch, set once in each worker process rather than sent along with every host.
+_WORKER_STATE = {}
+
+
+def parse_config_lines(device_cfg: str, network_os: str) -> list:
+    """Parse a configuration with the netutils parser of its network_driver, as netutils `section_config` does.
+
+    Args:
+        device_cfg (str): The device configuration.
+        network_os (str): The network_driver of the device.
+
+    Returns:
+        list: The (config_line, has_parents) of every line of the configuration.
+    """
+    return [(line.config_line, bool(line.parents)) for line in parser_map[network_os](device_cfg).config_lines]
+
+
+def section_from_config_lines(feature: dict, config_lines: list, network_os: str) -> str:
+    """Get the section of a feature from the parsed lines of a configuration, identical to netutils `section_config`.
+
+    Args:
+        feature (dict): The feature, with its `section`, which must not be empty.
+        config_lines (list): The (config_line, has_parents) of every line, from `parse_config_lines`.
+        network_os (str): The network_driver of the device.
+
+    Returns:
+        str: The section of the feature.
+    """
+    match = False
+    section_config_list = []
+    for config_line, has_parents in config_lines:
+        # A line after the first of several banners is empty.
+        if not config_line:
+            continue
+        if match:
+            if has_parents:
+                section_config_list.append(config_line)
+                continue
+            match = False
+        if not has_parents and any(config_line.startswith(line_start) for line_start in feature["section"]):
+            section_config_list.append(config_line)
+            match = True
+    if network_os in NON_STRIP_NETWORK_OS:
+        return "\n".join(section_config_list)
+    return "\n".join(section_config_list).strip()
+
+
+class ParsedConfigCache:
+    """A thread safe LRU cache of the parsed configurations, keyed by the digest of their content.
+
+    A configuration is parsed once by the netutils parser of its network_driver, and the section of every feature is
+    derived from its parsed lines, so an unchanged configuration is not parsed again across the features and the
+    compliance runs of a process, and across processes too when the cache is persisted to a folder, as a JSON file of
+    the parsed lines of each configuration.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: str = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): The number of parsed configurations kept in memory.
+            path (str): The folder the parsed configurations are persisted to, None to only keep them in memory.
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Pickle the settings only, so the cache can be sent to a worker process which starts empty."""
+        return {"maxsize": self.maxsize, "path": self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        """Unpickle the settings with an empty cache."""
+        self.__init__(**state)
+
+    def _file_path(self, digest: str, network_os: str) -> str:
+        return os.path.join(self.path, network_os, digest[:2], f"{digest}.lines.json")
+
+    def _load(self, digest: str, network_os: str) -> list:
+        """Load the parsed lines persisted to the folder, None if they are not."""
+        if self.path is None:
+            return None
+        try:
+            with open(self._file_path(digest, network_os), "r", encoding="utf-8") as filehandler:
+                config_lines = json.load(filehandler)
+        except (OSError, ValueError):
+            return None
+        return config_lines if isinstance(config_lines, list) else None
+
+    def _persist(self, digest: str, network_os: str, config_lines: list) -> None:
+        """Atomically persist the parsed lines to the folder."""
+        file_path = self._file_path(digest, network_os)
+        make_folder(os.path.dirname(file_path))
+        temporary_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as filehandler:
+            json.dump(config_lines, filehandler)
+        os.replace(temporary_path, file_path)
+
+    def get_config_lines(self, device_cfg: str, network_os: str) -> list:
+        """Get the parsed lines of a configuration, only parsing it if it is not cached.
+
+        Args:
+            device_cfg (str): The device configuration.
+            network_os (str): The network_driver of the device.
+
+        Returns:
+            list: The (config_line, has_parents) of every line of the configuration.
+        """
+        digest = hashlib.sha256(device_cfg.encode("utf8")).hexdigest()
+        key = (digest, network_os)
+        with self._lock:
+            config_lines = self._entries.get(key)
+            if config_lines is not None:
+                self._entries.move_to_end(key)
+                return config_lines
+        config_lines = self._load(digest, network_os)
+        if config_lines is None:
+            config_lines = parse_config_lines(device_cfg, network_os)
+            if self.path is not None:
+                self._persist(digest, network_os, config_lines)
+        with self._lock:
+            self._entries[key] = config_lines
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return config_lines
+
+    def get_sections(self, features: list, device_cfg: str, network_os: str) -> dict:
+        """Get the section of every feature from a configuration, parsing it at most once.
+
+        Args:
+            features (list): The features, with their `name` and `section`.
+            device_cfg (str): The device configuration.
+            network_os (str): The network_driver of the device.
+
+        Returns:
+            dict: A dictionary of feature name to its section of the configuration.
+        """
+        sections = {}
+        config_lines = None
+        for feature in features:
+            if not feature.get("section"):
+                # The whole configuration, as netutils `section_config` returns it.
+                sections[feature["name"]] = device_cfg
+                continue
+            if config_lines is None:
+                config_lines = self.get_config_lines(device_cfg, network_os)
+            sections[feature["name"]] = section_from_config_lines(feature, config_lines, network_os)
+        return sections
+
+    def clear(self) -> None:
+        """Forget all the parsed configurations kept in memory."""
+        with self._lock:
+            self._entries.clear()
+
+
+def get_section_configs(features: list, device_cfg: str, network_os: str, parsed_config_cache=None) -> dict:
+    """Get the section of every feature from a configuration, with netutils `section_config`.
+
+    Args:
+        features (list): The features, with their `name` and `section`.
+        device_cfg (str): The device configuration.
+        network_os (str): The network_driver of the device.
+        parsed_config_cache (ParsedConfigCache): The cache of the parsed configurations, None to always parse them.
+
+    Returns:
+        dict: A dictionary of feature name to its section of the configuration.
+    """
+    if parsed_config_cache is not None:
+        return parsed_config_cache.get_sections(features, device_cfg, network_os)
+    return {feature["name"]: section_config(feature, device_cfg, network_os) for feature in features}
+
+
+def get_compliance(
+    features: list, backup_cfg: str, intended_cfg: str, network_os: str, parsed_config_cache=None
+) -> dict:
+    """Report the compliance of every feature, identical to netutils `compliance` with `cfg_type="string"`.
+
+    Without a cache this is netutils `compliance` itself, with a cache the unchanged configurations are not parsed
+    again, and the sections derived from them are compared by netutils `feature_compliance`.
+
+    Args:
+        features (list): The features, with their `name`, `ordered` and `section`.
+        backup_cfg (str): The backup configuration.
+        intended_cfg (str): The intended configuration.
+        network_os (str): The network_driver of the device.
+        parsed_config_cache (ParsedConfigCache): The cache of the parsed configurations, None to always parse them.
+
+    Returns:
+        dict: A dictionary of feature name to its compliance data.
+    """
+    if parsed_config_cache is None:
+        return compliance(features, backup_cfg, intended_cfg, network_os, "string")
+    backup_sections = get_section_configs(features, backup_cfg, network_os, parsed_config_cache)
+    intended_sections = get_section_configs(features, intended_cfg, network_os, parsed_config_cache)
+    return {
+        feature["name"]: feature_compliance(
+            feature, backup_sections[feature["name"]], intended_sections[feature["name"]], network_os
+        )
+        for feature in features
+    }
+
+
+def get_config_text(config) -> str:
+    """Get the text of a configuration given in memory.
+
+    Args:
+        config (str | dict | Result | MultiResult): The configuration, a spooled or streamed reference to it, or the
+            Result of `get_config` or `generate_config`, directly or through the dispatcher.
+
+    Returns:
+        str: The configuration.
+    """
+    # The Result of the dispatcher holds the MultiResult of the task of the driver class.
+    while isinstance(config, (MultiResult, Result)):
+        config = config[0] if isinstance(config, MultiResult) else config.result
+    if isinstance(config, dict) and "config" in config:
+        config = config["config"]
+    return read_spooled_output(config)
+
+
+def _read_config(config, path: str) -> str:
+    """Get a configuration from memory if it is given, else from its file, stripped as netutils does."""
+    if config is not None:
+        return get_config_text(config).strip()
+    # Read as netutils would, decompressing the files transparently.
+    return read_text(path).strip()
+
+
+def get_file_compliance(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    features: list,
+    backup_file: str,
+    intended_file: str,
+    network_os: str,
+    parsed_config_cache=None,
+    backup_config=None,
+    intended_config=None,
+) -> dict:
+    """Report the compliance of every feature from the backup and intended files, which may be compressed.
+
+    Args:
+        features (list): The features, with their `name`, `ordered` and `section`.
+        backup_file (str): The backup file.
+        intended_file (str): The intended file.
+        network_os (str): The network_driver of the device.
+        parsed_config_cache (ParsedConfigCache): The cache of the parsed configurations, None to always parse.
+        backup_config (str | Result): The backup configuration, used instead of reading the `backup_file`.
+        intended_config (str | Result): The intended configuration, used instead of reading the `intended_file`.
+
+    Returns:
+        dict: A dictionary with the `feature_data`, or the `error` message of E1007, E1008 or E1009.
+    """
+    if backup_config is None and not (backup_file and os.path.exists(backup_file)):
+        return {"error": get_error_message("E1007", backup_file=backup_file)}
+    if intended_config is None and not (intended_file and os.path.exists(intended_file)):
+        return {"error": get_error_message("E1008", intended_file=intended_file)}
+    try:
+        backup_cfg = _read_config(backup_config, backup_file)
+        intended_cfg = _read_config(intended_config, intended_file)
+        feature_data = get_compliance(features, backup_cfg, intended_cfg, network_os, parsed_config_cache)
+        return {"feature_data": feature_data}
+    except Exception as error:  # pylint: disable=broad-except
+        return {"error": get_error_message("E1009", error=str(error))}
+
+
+def _get_input_digest(config, path: str) -> str:
+    """Get the digest of a configuration from memory if it is given, else of the content of its file."""
+    if config is not None:
+        return hashlib.sha256(get_config_text(config).encode("utf8")).hexdigest()
+    return content_digest(path) if path else None
+
+
+def get_features_digest(features: list) -> str:
+    """Get the sha256 digest of the feature definitions, independent of the order of their keys."""
+    return hashlib.sha256(json.dumps(features, sort_keys=True, default=str).encode("utf8")).hexdigest()
+
+
+def get_incremental_file_compliance(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    features: list,
+    backup_file: str,
+    intended_file: str,
+    network_os: str,
+    previous_digests: list = None,
+    parsed_config_cache=None,
+    features_digest: str = None,
+    backup_config=None,
+    intended_config=None,
+) -> dict:
+    """Report the compliance of every feature, unless none of its inputs changed since the previous report.
+
+    The inputs are the backup and intended configurations, the feature definitions and the network_driver, compared
+    by digest. A configuration file is compared by its decompressed content, the same as the configuration in memory.
+
+    Args:
+        features (list): The features, with their `name`, `ordered` and `section`.
+        backup_file (str): The backup file.
+        intended_file (str): The intended file.
+        network_os (str): The network_driver of the device.
+        previous_digests (list): The `digests` of the previous report, None if there is none.
+        parsed_config_cache (ParsedConfigCache): The cache of the parsed configurations, None to always parse.
+        features_digest (str): The digest of the features, when already known.
+        backup_config (str | Result): The backup configuration, used instead of reading the `backup_file`.
+        intended_config (str | Result): The intended configuration, used instead of reading the `intended_file`.
+
+    Returns:
+        dict: A dictionary with the `digests` of the inputs, and the `feature_data`, the `error` message or
+            `unchanged` set to True if the previous report still applies.
+    """
+    try:
+        digests = [
+            _get_input_digest(backup_config, backup_file),
+            _get_input_digest(intended_config, intended_file),
+            features_digest or get_features_digest(features),
+            network_os,
+        ]
+    except Exception:  # pylint: disable=broad-except
+        # Such as a corrupted compressed file, reported by the compliance itself.
+        digests = None
+    if digests and None not in digests and previous_digests and list(previous_digests) == digests:
+        return {"digests": digests, "unchanged": True}
+    return {
+        "digests": digests,
+        **get_file_compliance(
+            features, backup_file, intended_file, network_os, parsed_config_cache, backup_config, intended_config
+        ),
+    }
+
+
+def _update_compliance_store(compliance_store, host_name: str, result: dict, recompute) -> dict:
+    """Record the report of a host in the store, or get the previous report back if it is unchanged.
+
+    The previous report may have been removed from the store since its digests were read, E.g. by another thread, the
+    report is then computed again by calling `recompute`, without the previous digests.
+    """
+    with _COMPLIANCE_STORE_LOCK:
+        if not result.get("unchanged"):
+            if "error" in result:
+                compliance_store.pop(host_name, None)
+                return {"error": result["error"]}
+            compliance_store[host_name] = {"digests": result["digests"], "feature_data": result["feature_data"]}
+            return {"feature_data": result["feature_data"]}
+        previous = compliance_store.get(host_name)
+    if previous is None:
+        return _update_compliance_store(compliance_store, host_name, recompute(), recompute)
+    return {"feature_data": previous["feature_data"]}
+
+
+def incremental_compliance(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    compliance_store,
+    host_name: str,
+    features: list,
+    backup_file: str,
+    intended_file: str,
+    network_os: str,
+    parsed_config_cache=None,
+    backup_config=None,
+    intended_config=None,
+) -> dict:
+    """Report the compliance of a host, reusing the report stored on the previous run if none of its inputs changed.
+
+    Args:
+        compliance_store (MutableMapping): The digests of the inputs and the `feature_data` of the previous reports,
+            by host name, updated with the new reports, only accessed under a lock so it may be a `shelve`.
+        host_name (str): The name of the host.
+        features (list): The features, with their `name`, `ordered` and `section`.
+        backup_file (str): The backup file.
+        intended_file (str): The intended file.
+        network_os (str): The network_driver of the device.
+        parsed_config_cache (ParsedConfigCache): The cache of the parsed configurations, None to always parse.
+        backup_config (str | Result): The backup configuration, used instead of reading the `backup_file`.
+        intended_config (str | Result): The intended configuration, used instead of reading the `intended_file`.
+
+    Returns:
+        dict: A dictionary with the `feature_data`, or the `error` message of E1007, E1008 or E1009.
+    """
+    with _COMPLIANCE_STORE_LOCK:
+        previous = compliance_store.get(host_name)
+    run = partial(
+        get_incremental_file_compliance,
+        features,
+        backup_file,
+        intended_file,
+        network_os,
+        parsed_config_cache=parsed_config_cache,
+        backup_config=backup_config,
+        intended_config=intended_config,
+    )
+    result = run(previous_digests=previous and previous["digests"])
+    return _update_compliance_store(compliance_store, host_name, result, partial(run, previous_digests=None))
+
+
+def _init_worker(features, parsed_config_cache=None, incremental: bool = False) -> None:
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(
+        {
+            "features": features,
+            "parsed_config_cache": parsed_config_cache,
+            "incremental": incremental,
+            "features_digests": {},
+        }
+    )
+
+
+def _get_features(features, network_os: str) -> list:
+    """Get the features of a platform, from a list shared by all the platforms or a dictionary per platform."""
+    if isinstance(features, dict):
+        return features.get(network_os, [])
+    return features
+
+
+def _run_job(job: tuple) -> tuple:
+    host_name, backup_file, intended_file, network_os, previous_digests = job
+    features = _get_features(_WORKER_STATE["features"], network_os)
+    parsed_config_cache = _WORKER_STATE["parsed_config_cache"]
+    if not _WORKER_STATE["incremental"]:
+        return host_name, get_file_compliance(features, backup_file, intended_file, network_os, parsed_config_cache)
+    features_digests = _WORKER_STATE["features_digests"]
+    if network_os not in features_digests:
+        features_digests[network_os] = get_features_digest(features)
+    return host_name, get_incremental_file_compliance(
+        features,
+        backup_file,
+        intended_file,
+        network_os,
+        previous_digests,
+        parsed_config_cache,
+        features_digests[network_os],
+    )
+
+
+def _update_batch_compliance_store(
+    compliance_store, jobs: dict, features, results: dict, parsed_config_cache=None
+) -> dict:
+    """Record the reports of a batch in the store, or get the previous reports back for the unchanged hosts."""
+    reports = {}
+    for host_name, result in results.items():
+        backup_file, intended_file, network_os = jobs[host_name]
+        recompute = partial(
+            get_incremental_file_compliance,
+            _get_features(features, network_os),
+            backup_file,
+            intended_file,
+            network_os,
+            parsed_config_cache=parsed_config_cache,
+        )
+        reports[host_name] = _update_compliance_store(compliance_store, host_name, result, recompute)
+    return reports
+
+
+def batch_compliance(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    jobs: dict,
+    features,
+    max_workers: int = None,
+    chunksize: int = 16,
+    parsed_config_cache=None,
+    compliance_store=None,
+) -> dict:
+    """Run the compliance of many hosts across a pool of processes.
+
+    The compliance is CPU bound, so running it in the Nornir threads serializes it on the GIL. The features are sent
+    once to each worker process, and the `feature_data` of each host is identical to the one of `compliance_config`.
+
+    Args:
+        jobs (dict): A dictionary of host name to a (backup_file, intended_file, network_os) tuple.
+        features (list | dict): The features of all the hosts, or a dictionary of network_driver to its features.
+        max_workers (int): The number of worker processes, the number of CPUs by default, 0 runs in this process.
+        chunksize (int): The number of hosts sent to a worker process at once.
+        parsed_config_cache (ParsedConfigCache): The cache of the parsed configurations, each worker process starts
+            with an empty copy of it, so it is best persisted to a folder.
+        compliance_store (MutableMapping): The digests of the inputs and the `feature_data` of the previous reports,
+            by host name, to only recompute the hosts whose inputs changed, None to recompute every host.
+
+    Returns:
+        dict: A dictionary of host name to a dictionary with its `feature_data`, or the `error` message.
+    """
+    incremental = compliance_store is not None
+    job_list = []
+    with _COMPLIANCE_STORE_LOCK:
+        for host_name, job in jobs.items():
+            previous = compliance_store.get(host_name) if incremental else None
+            job_list.append((host_name, *job, previous and previous["digests"]))
+    if max_workers == 0:
+        _init_worker(features, parsed_config_cache, incremental)
+        try:
+            results = dict(map(_run_job, job_list))
+        finally:
+            _init_worker(None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=get_process_pool_context(),
+            initializer=_init_worker,
+            initargs=(features, parsed_config_cache, incremental),
+        ) as executor:
+            results = dict(executor.map(_run_job, job_list, chunksize=chunksize))
+    if incremental:
+        LOGGER.info(
+            "Batch compliance reused the previous report of %s of %s hosts",
+            sum(bool(result.get("unchanged")) for result in results.values()),
+            len(results),
+        )
+        results = _update_batch_compliance_store(compliance_store, jobs, features, results, parsed_config_cache)
+    LOGGER.info(
+        "Batch compliance completed, %s of %s hosts failed",
+        sum("error" in result for result in results.values()),
+        len(results),
+    )
+    return results
@@ -0,0 +1,131 @@
+"""Optional gzip or zstd compression of the backup and intended configuration files."""
+
+import gzip
+import hashlib
+import io
+import os
+from contextlib import contextmanager
+
+try:
+    import zstandard  # pylint: disable=E0401
+except ImportError:
+    zstandard = None
+
+from nornir_nautobot.exceptions import NornirNautobotException
+from nornir_nautobot.utils.helpers import get_error_message
+
+GZIP = "gzip"
+ZSTD = "zstd"
+COMPRESSION_EXTENSIONS = {".gz": GZIP, ".zst": ZSTD}
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _check_zstandard() -> None:
+    if zstandard is None:
+        raise NornirNautobotException(get_error_message("E1020", dependency="zstandard"))
+
+
+def get_compression(path: str, compression: str = None):
+    """Get the compression of a file, from its extension or else the `compression` setting.
+
+    Args:
+        path (str): The file path, a `.gz` or `.zst` extension selects gzip or zstd.
+        compression (str): The compression to use for any other extension, `gzip`, `zstd` or None.
+
+    Returns:
+        str: `gzip`, `zstd` or None for plain text.
+    """
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(path)[1], compression)
+
+
+def compress(content: str, compression: str = None) -> bytes:
+    """Encode a text to the bytes of a file with the given compression.
+
+    The gzip header carries no timestamp nor filename, so the same content always gives the same bytes and digest.
+    """
+    data = content.encode("utf8")
+    if compression == GZIP:
+        # Through the same GzipFile header as `open_text_writer`, which `gzip.compress` does not use.
+        buffer = io.BytesIO()
+        with gzip.GzipFile(filename="", mode="wb", fileobj=buffer, mtime=0) as gzip_filehandler:
+            gzip_filehandler.write(data)
+        return buffer.getvalue()
+    if compression == ZSTD:
+        _check_zstandard()
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+@contextmanager
+def open_text_writer(path: str, compression: str = None):
+    """Context manager opening a file to write text to, compressed as it is written.
+
+    Args:
+        path (str): The file path.
+        compression (str): `gzip`, `zstd` or None for plain text.
+
+    Yields:
+        TextIO: The file object.
+    """
+    if compression == GZIP:
+        # Through a file object and an empty filename, so the header carries no filename nor timestamp.
+        with open(path, "wb") as raw_filehandler:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw_filehandler, mtime=0) as gzip_filehandler:
+                with io.TextIOWrapper(gzip_filehandler, encoding="utf8") as filehandler:
+                    yield filehandler
+    elif compression == ZSTD:
+        _check_zstandard()
+        with zstandard.open(path, "wt", encoding="utf8") as filehandler:
+            yield filehandler
+    else:
+        with open(path, "w", encoding="utf8") as filehandler:
+            yield filehandler
+
+
+def open_text(path: str):
+    """Open a text file to read, decompressing it transparently if it starts with the gzip or zstd magic number.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        TextIO: The file object, to use as a context manager.
+    """
+    with open(path, "rb") as filehandler:
+        magic = filehandler.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if magic.startswith(ZSTD_MAGIC):
+        _check_zstandard()
+        return zstandard.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+def read_text(path: str) -> str:
+    """Read a text file, decompressing it transparently if it is gzip or zstd compressed."""
+    with open_text(path) as filehandler:
+        return filehandler.read()
+
+
+def content_digest(path: str) -> str:
+    """Get the sha256 digest of the decompressed content of a file, None if it does not exist.
+
+    Unlike the digest of the file itself, it does not depend on how the content was compressed.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as filehandler:
+        magic = filehandler.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        opener = gzip.open
+    elif magic.startswith(ZSTD_MAGIC):
+        _check_zstandard()
+        opener = zstandard.open
+    else:
+        opener = open
+    digest = hashlib.sha256()
+    with opener(path, "rb") as filehandler:
+        while chunk := filehandler.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,209 @@
+"""Precompiled pipeline of the `remove_lines` and `substitute_lines` applied to the running configurations."""
+
+import re
+from functools import lru_cache
+
+# A character class excluding the newline, E.g. `[^\n]` or `[^\n!]`.
+NEGATED_CLASS_WITHOUT_NEWLINE = re.compile(r"\[\^(?:[^\]\\]|\\.)*?\\n(?:[^\]\\]|\\.)*\]")
+# Any other negated character class, which matches a newline.
+NEGATED_CLASS = re.compile(r"\[\^")
+ESCAPE = re.compile(r"\\(.)", flags=re.DOTALL)
+# The escapes of a character, a class or an anchor which never match a newline nor look past the current line.
+SINGLE_LINE_ESCAPES = set("dwSbBt")
+# A backreference, numbered or named, which may refer to another regex once merged in an alternation.
+BACKREFERENCE = re.compile(r"\\(?:[1-9]|g<)|\(\?P=")
+# A group extension other than a non-capturing or a named group, E.g. inline flags or lookarounds.
+GROUP_EXTENSION = re.compile(r"\(\?(?!:|P<)")
+# Inline flags, which apply to the whole regex and are only allowed at its start.
+INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def _compiles(regex: str) -> bool:
+    try:
+        re.compile(regex, flags=re.MULTILINE)
+    except re.error:
+        return False
+    return True
+
+
+def _is_single_line(regex: str) -> bool:
+    r"""Whether a regex can only match within a line, and only looks at the line it matches.
+
+    The regex is judged conservatively on its text: it may not hold a newline, a negated character class other than
+    one excluding the newline such as `[^\n]`, a group extension other than `(?:` and `(?P<`, so neither inline flags
+    nor lookarounds, nor an escape other than `\d`, `\w`, `\S`, `\b`, `\B`, `\t` and the escaped punctuation, which
+    rules out `\s`, `\n`, `\A`, `\Z` and the backreferences. The `.` never matches a newline without the DOTALL flag.
+    """
+    regex = NEGATED_CLASS_WITHOUT_NEWLINE.sub("x", regex)
+    if "\n" in regex or NEGATED_CLASS.search(regex) or GROUP_EXTENSION.search(regex):
+        return False
+    return all(not escaped.isalnum() or escaped in SINGLE_LINE_ESCAPES for escaped in ESCAPE.findall(regex))
+
+
+def is_line_removal(regex: str) -> bool:
+    """Whether a `remove_lines` regex only ever removes whole lines, as it starts with `^` and ends with a newline.
+
+    A regex with a backreference or inline flags is never merged with others, as their meaning could change in an
+    alternation.
+
+    Args:
+        regex (str): The regex of a `remove_lines` entry.
+
+    Returns:
+        bool: True if the regex can lead a merged pass of full line removals.
+    """
+    return (
+        regex.startswith("^")
+        and regex.endswith(("\\n", "\n"))
+        and not regex.endswith("\\\\n")
+        and not BACKREFERENCE.search(regex)
+        and not INLINE_FLAGS.search(regex)
+        and _compiles(regex)
+    )
+
+
+def is_full_line_removal(regex: str) -> bool:
+    r"""Whether a `remove_lines` regex removes a single line, judged on the content of that line alone.
+
+    Such a regex starts with `^`, ends with a newline and can not match a newline anywhere else, for example
+    `^ntp clock-period[^\n]*\n`. As `\s` also matches a newline, use a space or `[^\S\n]` instead.
+
+    Args:
+        regex (str): The regex of a `remove_lines` entry.
+
+    Returns:
+        bool: True if the regex can follow another line removal in a merged pass.
+    """
+    if not is_line_removal(regex):
+        return False
+    body = regex[1:-2] if regex.endswith("\\n") else regex[1:-1]
+    return _is_single_line(body)
+
+
+def is_single_line_substitution(regex: str, replace: str) -> bool:
+    """Whether a `substitute_lines` entry only ever changes a line on its own, without adding or removing lines.
+
+    Args:
+        regex (str): The regex of a `substitute_lines` entry.
+        replace (str): The replace value of the `substitute_lines` entry.
+
+    Returns:
+        bool: True if the substitution can be applied to each line of the configuration as it is streamed.
+    """
+    if not _compiles(regex) or not _is_single_line(regex):
+        return False
+    # Group references are the only escapes allowed, any other escape such as `\n` may add a line.
+    return "\n" not in replace and "\\" not in re.sub(r"\\(?:[1-9]\d?|g<\w+>)", "", replace)
+
+
+class ConfigPipeline:  # pylint: disable=too-few-public-methods
+    """The `remove_lines` and `substitute_lines` of a job, compiled once and applied to every running configuration.
+
+    A line removal followed by consecutive full line removals are merged into a single alternation applied in one pass
+    over the configuration, every other regex is applied in order as a precompiled substitution, so the output is
+    identical to `clean_config` followed by `sanitize_config`.
+
+    Merging is only safe in that shape. Within a pass every regex sees the original configuration rather than the
+    output of the previous regexes, the leading regex is the only one which may depend on the lines around its match,
+    and the others remove whole lines judged on their own content, so the lines removed earlier make no difference.
+    """
+
+    def __init__(self, remove_lines: tuple = (), substitute_lines: tuple = ()) -> None:
+        """Compile the pipeline.
+
+        Args:
+            remove_lines (tuple): The regexes of the lines to remove.
+            substitute_lines (tuple): The (regex, replace) tuples of the substitutions.
+        """
+        self.steps = []
+        self.streamable = all(is_full_line_removal(regex) for regex in remove_lines) and all(
+            is_single_line_substitution(regex, replace) for regex, replace in substitute_lines
+        )
+        merged = []
+        for regex in remove_lines:
+            if merged and is_full_line_removal(regex):
+                merged.append(regex)
+                continue
+            self._add_removals(merged)
+            merged = [regex] if is_line_removal(regex) else []
+            if not merged:
+                self.steps.append((re.compile(regex, flags=re.MULTILINE), ""))
+        self._add_removals(merged)
+        self._removal_steps = len(self.steps)
+        for regex, replace in substitute_lines:
+            self.steps.append((re.compile(regex, flags=re.MULTILINE), replace))
+
+    def _add_removals(self, regexes: list) -> None:
+        """Add a step removing the lines matching any of the full line removal regexes."""
+        if len(regexes) > 1:
+            try:
+                self.steps.append((re.compile("|".join(f"(?:{regex})" for regex in regexes), flags=re.MULTILINE), ""))
+                return
+            except re.error:
+                # E.g. the same group name used by several regexes.
+                pass
+        self.steps.extend((re.compile(regex, flags=re.MULTILINE), "") for regex in regexes)
+
+    def apply(self, config: str) -> str:
+        """Apply the removals and substitutions to a configuration."""
+        for pattern, replace in self.steps:
+            config = pattern.sub(replace, config)
+        return config
+
+    def _apply_line(self, line: str, terminated: bool):
+        """Apply the removals and substitutions to a line without its newline, None if the line is removed."""
+        for index, (pattern, replace) in enumerate(self.steps):
+            if index < self._removal_steps:
+                # A full line removal ends with a newline, so it can never match an unterminated last line.
+                if terminated and pattern.match(f"{line}\n"):
+                    return None
+            else:
+                line = pattern.sub(replace, line)
+        return line
+
+    def apply_stream(self, chunks):
+        """Apply the removals and substitutions to a configuration as it arrives, one line at a time.
+
+        Only the current line is held in memory when the pipeline is `streamable`, which is to say when every removal
+        is a full line removal and every substitution a single line substitution, otherwise the whole configuration is
+        collected and processed at once. The output is identical to `apply` either way.
+
+        Args:
+            chunks (Iterable[str]): The configuration, in chunks of any size.
+
+        Yields:
+            str: The processed configuration, in chunks.
+        """
+        if not self.streamable:
+            yield self.apply("".join(chunks))
+            return
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                line = self._apply_line(line, terminated=True)
+                if line is not None:
+                    yield f"{line}\n"
+        yield self._apply_line(buffer, terminated=False)
+
+
+@lru_cache(maxsize=128)
+def _get_config_pipeline(remove_lines: tuple, substitute_lines: tuple) -> ConfigPipeline:
+    return ConfigPipeline(remove_lines, substitute_lines)
+
+
+def get_config_pipeline(remove_lines: list = None, substitute_lines: list = None) -> ConfigPipeline:
+    """Get the compiled pipeline of the `remove_lines` and `substitute_lines`, cached across the hosts of a job.
+
+    Args:
+        remove_lines (list): A list of dictionaries with the `regex` of the lines to remove.
+        substitute_lines (list): A list of dictionaries with the `regex` and its `replace` value.
+
+    Returns:
+        ConfigPipeline: The compiled pipeline.
+    """
+    return _get_config_pipeline(
+        tuple(item["regex"] for item in remove_lines or []),
+        tuple((item["regex"], item["replace"]) for item in substitute_lines or []),
+    )
@@ -0,0 +1,133 @@
+"""Content-addressed storage of the backup files, identical content is stored once and hardlinked to each path."""
+
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+
+from nornir_nautobot.utils.helpers import file_digest, make_folder
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ContentStore:
+    """A store of blobs keyed by their sha256 digest, with the host paths hardlinked to the blob of their content.
+
+    The paths are regular files to every reader, such as the compliance or Git, but each distinct content is only
+    stored once on disk, and saving the same content to a path again is a no-op. A path must not be modified in place,
+    as that would modify the blob shared with every other path of the same content, writes go through `save`.
+    Where hardlinks are not supported, E.g. across filesystems, the blob is copied to the path instead.
+    """
+
+    def __init__(self, root: str) -> None:
+        """Initialize the store.
+
+        Args:
+            root (str): The folder of the blobs, preferably on the same filesystem as the paths to allow hardlinks.
+        """
+        self.root = root
+
+    def blob_path(self, digest: str) -> str:
+        """Get the path of the blob of a digest."""
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def put(self, content) -> str:
+        """Store a content, unless a blob with the same digest is already stored.
+
+        Args:
+            content (str | bytes): The content to store, a text is encoded to utf8.
+
+        Returns:
+            str: The sha256 digest of the content.
+        """
+        data = content.encode("utf8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self.blob_path(digest)
+        if not os.path.exists(blob_path):
+            make_folder(os.path.dirname(blob_path))
+            temporary_path = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+            with open(temporary_path, "wb") as filehandler:
+                filehandler.write(data)
+            os.replace(temporary_path, blob_path)
+        return digest
+
+    def put_file(self, source_path: str, digest: str) -> str:
+        """Move a file of a known digest into the store, or delete it if a blob with the same digest is stored.
+
+        Args:
+            source_path (str): The file to move, copied when it is on another filesystem than the store.
+            digest (str): The sha256 digest of the file.
+
+        Returns:
+            str: The sha256 digest of the file.
+        """
+        blob_path = self.blob_path(digest)
+        if os.path.exists(blob_path):
+            os.unlink(source_path)
+            return digest
+        make_folder(os.path.dirname(blob_path))
+        try:
+            os.replace(source_path, blob_path)
+        except OSError:
+            temporary_path = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(source_path, temporary_path)
+            os.replace(temporary_path, blob_path)
+            os.unlink(source_path)
+        return digest
+
+    def link(self, path: str, digest: str) -> bool:
+        """Point a path to the blob of a digest.
+
+        Args:
+            path (str): The path, E.g. a backup file.
+            digest (str): The sha256 digest of a stored blob.
+
+        Returns:
+            bool: True if the content of the path changed.
+        """
+        blob_path = self.blob_path(digest)
+        unchanged = False
+        if os.path.exists(path):
+            if os.path.samefile(path, blob_path):
+                return False
+            unchanged = file_digest(path) == digest
+        if os.path.dirname(path):
+            make_folder(os.path.dirname(path))
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(blob_path, temporary_path)
+        except OSError:
+            if unchanged:
+                return False
+            shutil.copyfile(blob_path, temporary_path)
+        os.replace(temporary_path, path)
+        return not unchanged
+
+    def save(self, path: str, content) -> bool:
+        """Store a content and point a path to it.
+
+        Args:
+            path (str): The path, E.g. a backup file.
+            content (str | bytes): The content of the path, a text is encoded to utf8.
+
+        Returns:
+            bool: True if the content of the path changed.
+        """
+        return self.link(path, self.put(content))
+
+    def gc(self) -> int:
+        """Delete the blobs no path is hardlinked to anymore.
+
+        Returns:
+            int: The number of blobs deleted.
+        """
+        deleted = 0
+        for folder, _, filenames in os.walk(os.path.join(self.root, "objects")):
+            for filename in filenames:
+                blob_path = os.path.join(folder, filename)
+                if os.stat(blob_path).st_nlink == 1:
+                    os.unlink(blob_path)
+                    deleted += 1
+        LOGGER.debug("Deleted %s unreferenced blobs from %s", deleted, self.root)
+        return deleted
@@ -0,0 +1,112 @@
+"""A process-wide DNS resolution cache shared by the connectivity checks, the reachability sweep and async sessions."""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+
+from netutils.ip import is_ip
+
+from nornir_nautobot.utils.event_loop import run_coroutine
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DnsCache:
+    """A thread safe cache of hostname to IPv4 address, with a TTL and negative caching of failed lookups."""
+
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 60.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl (float): How long, in seconds, a resolved address is cached for.
+            negative_ttl (float): How long, in seconds, a failed lookup is cached for.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _get(self, hostname: str):
+        """Get the cached entry of a hostname as a (found, ip_addr) tuple."""
+        with self._lock:
+            entry = self._entries.get(hostname)
+        if not entry:
+            return False, None
+        ip_addr, resolved_at = entry
+        if time.monotonic() - resolved_at > (self.ttl if ip_addr else self.negative_ttl):
+            return False, None
+        return True, ip_addr
+
+    def _set(self, hostname: str, ip_addr) -> None:
+        with self._lock:
+            self._entries[hostname] = (ip_addr, time.monotonic())
+
+    def resolve(self, hostname: str):
+        """Resolve a hostname, from the cache if possible.
+
+        Args:
+            hostname (str): An IP address, returned as is, or a FQDN.
+
+        Returns:
+            str: The IPv4 address, or None if the hostname is not resolvable.
+        """
+        if is_ip(hostname):
+            return hostname
+        found, ip_addr = self._get(hostname)
+        if found:
+            return ip_addr
+        try:
+            ip_addr = socket.gethostbyname(hostname)
+        except (socket.gaierror, UnicodeError):
+            ip_addr = None
+        self._set(hostname, ip_addr)
+        return ip_addr
+
+    async def async_resolve(self, hostname: str):
+        """Coroutine to resolve a hostname without blocking the event loop, sharing the same cache."""
+        if is_ip(hostname):
+            return hostname
+        found, ip_addr = self._get(hostname)
+        if found:
+            return ip_addr
+        try:
+            addresses = await asyncio.get_running_loop().getaddrinfo(
+                hostname, None, family=socket.AF_INET, type=socket.SOCK_STREAM
+            )
+            ip_addr = addresses[0][4][0]
+        except (socket.gaierror, UnicodeError):
+            ip_addr = None
+        self._set(hostname, ip_addr)
+        return ip_addr
+
+    def bulk_resolve(self, hostnames, concurrency: int = 100) -> dict:
+        """Resolve many hostnames concurrently on the shared event loop.
+
+        Args:
+            hostnames (Iterable[str]): The hostnames to resolve.
+            concurrency (int): The maximum number of lookups in flight.
+
+        Returns:
+            dict: A dictionary of hostname to IPv4 address, None for the hostnames that are not resolvable.
+        """
+
+        async def _bulk_resolve(hostnames):
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def _resolve(hostname):
+                async with semaphore:
+                    return hostname, await self.async_resolve(hostname)
+
+            return dict(await asyncio.gather(*[_resolve(hostname) for hostname in hostnames]))
+
+        return run_coroutine(_bulk_resolve(set(hostnames)))
+
+    def clear(self) -> None:
+        """Forget all the cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+DNS_CACHE = DnsCache()
@@ -0,0 +1,85 @@
+"""Precompiled matcher of the hidden errors in a command output, built once per set of error strings."""
+
+import re
+from functools import lru_cache
+
+
+class HiddenErrorMatcher:  # pylint: disable=too-few-public-methods
+    """The error strings of a driver class, compiled once and searched for with a few fast scans of the output.
+
+    The error strings are grouped by their leading word, E.g. `%`, `Error:` or `Cannot`, and each group is searched for
+    with a single substring scan for that word, every occurrence being checked against a precompiled alternation of the
+    strings of the group. A handful of scans replaces one scan per error string, and a substring scan is much faster
+    than a regex search in CPython, which has no literal prefilter for an alternation.
+
+    The authorization errors take precedence over the bad command errors wherever they are in the output, as with
+    checking each list in turn.
+    """
+
+    NO_AUTHORIZATION = "no_authorization"
+    BAD_COMMAND = "bad_command"
+
+    def __init__(self, no_authorization: tuple = (), bad_command: tuple = ()) -> None:
+        """Compile the matcher.
+
+        Args:
+            no_authorization (tuple): The strings of an authorization error.
+            bad_command (tuple): The strings of a bad command error.
+        """
+        self.no_authorization = no_authorization
+        self.bad_command = bad_command
+        self._kinds = {}
+        for kind, strings in ((self.NO_AUTHORIZATION, no_authorization), (self.BAD_COMMAND, bad_command)):
+            for string in strings:
+                self._kinds.setdefault(string, kind)
+        groups = {}
+        for anchor in sorted({string.split(" ", 1)[0] for string in self._kinds}, key=len):
+            # A word extending a shorter word is found by the scan for the shorter one.
+            if not any(anchor.startswith(shorter) for shorter in groups):
+                groups[anchor] = []
+        for string in self._kinds:
+            groups[next(anchor for anchor in groups if string.startswith(anchor))].append(string)
+        # The authorization errors are listed first, so they win when both match at the same position.
+        self._groups = [
+            (anchor, re.compile("|".join(re.escape(string) for string in strings)))
+            for anchor, strings in groups.items()
+        ]
+
+    def search(self, output: str):
+        """Search an output for a hidden error.
+
+        Args:
+            output (str): The command output.
+
+        Returns:
+            str: `no_authorization`, `bad_command` or None if the output has no hidden error.
+        """
+        found = None
+        for anchor, pattern in self._groups:
+            position = output.find(anchor)
+            while position != -1:
+                match = pattern.match(output, position)
+                if match:
+                    found = self._kinds[match.group()]
+                    if found == self.NO_AUTHORIZATION or not self.no_authorization:
+                        return found
+                position = output.find(anchor, position + 1)
+        return found
+
+
+@lru_cache(maxsize=32)
+def _get_hidden_error_matcher(no_authorization: tuple, bad_command: tuple) -> HiddenErrorMatcher:
+    return HiddenErrorMatcher(no_authorization, bad_command)
+
+
+def get_hidden_error_matcher(no_authorization: list = None, bad_command: list = None) -> HiddenErrorMatcher:
+    """Get the compiled matcher of the error strings, cached across the driver classes sharing the same strings.
+
+    Args:
+        no_authorization (list): The strings of an authorization error.
+        bad_command (list): The strings of a bad command error.
+
+    Returns:
+        HiddenErrorMatcher: The compiled matcher.
+    """
+    return _get_hidden_error_matcher(tuple(no_authorization or ()), tuple(bad_command or ()))
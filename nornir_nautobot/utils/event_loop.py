@@ -0,0 +1,45 @@
+"""A shared asyncio event loop to run coroutines from Nornir worker threads."""
+
+import asyncio
+import logging
+import os
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+_LOCK = threading.Lock()
+_LOOP = None
+_LOOP_PID = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the process-wide event loop, starting it in a daemon thread on first use.
+
+    The loop is recreated after a fork, as the thread running the parent's loop does not exist in the child.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running shared event loop.
+    """
+    global _LOOP, _LOOP_PID  # pylint: disable=global-statement
+    with _LOCK:
+        if _LOOP is None or _LOOP.is_closed() or _LOOP_PID != os.getpid():
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_PID = os.getpid()
+            thread = threading.Thread(target=_LOOP.run_forever, name="nornir-nautobot-event-loop", daemon=True)
+            thread.start()
+            LOGGER.debug("Started the shared event loop in thread %s", thread.name)
+    return _LOOP
+
+
+def run_coroutine(coroutine, timeout=None):
+    """Run a coroutine on the shared event loop and block the calling thread until it is done.
+
+    Args:
+        coroutine (Coroutine): The coroutine to run.
+        timeout (float): Maximum time to wait for the result, None to wait indefinitely.
+
+    Returns:
+        Any: The result of the coroutine, any exception it raised is re-raised in the calling thread.
+    """
+    future = asyncio.run_coroutine_threadsafe(coroutine, get_event_loop())
+    return future.result(timeout)
@@ -1,18 +1,36 @@
 """A set of helper utilities."""
 
 import errno
+import hashlib
 import importlib
 import logging
+import multiprocessing
 import os
 import re
+import threading
 import traceback
 import unicodedata
+import uuid
 from typing import Any
 
 from nornir_nautobot.constants import ERROR_CODES
 
 LOGGER = logging.getLogger(__name__)
 
+# The digest stores are mappings such as a `shelve`, which is not thread safe, read and written from the Nornir threads.
+_DIGEST_STORE_LOCK = threading.Lock()
+
+
+def get_process_pool_context():
+    """Get the multiprocessing context of the worker process pools, which never forks the current process.
+
+    Forking a process running other threads, such as the Nornir workers or the shared event loop, can deadlock the
+    child on a lock held by another thread. The `forkserver` method forks from a single threaded server process
+    instead, and `spawn` is used where it is not available.
+    """
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
 
 def make_folder(folder):
     """Helper method to sanely create folders."""
@@ -25,6 +43,116 @@ def make_folder(folder):
                 raise
 
 
+def file_digest(path):
+    """Get the sha256 digest of a file, None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as filehandler:
+        while chunk := filehandler.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """Get the inode, size and mtime of a file, None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def is_file_unchanged(path, digest, digest_store=None):
+    """Whether a file already has the content of the given sha256 digest.
+
+    Args:
+        path (str): The file path.
+        digest (str): The sha256 digest of the new content.
+        digest_store (MutableMapping): The digests stored by path on previous writes, the file itself is hashed when
+            its path is not in the store, or its size or mtime changed since.
+
+    Returns:
+        bool: True if the file exists with the same content.
+    """
+    if not os.path.exists(path):
+        return False
+    stored_digest = get_stored_digest(digest_store, path)
+    if stored_digest is not None:
+        return stored_digest == digest
+    if file_digest(path) != digest:
+        return False
+    set_stored_digest(digest_store, path, digest)
+    return True
+
+
+def get_stored_digest(digest_store, path):
+    """Get the digest stored for a path, under the lock of the digest stores.
+
+    The digest is only trusted while the size and mtime of the file are those recorded along with it, so a file
+    edited or reset since it was written is hashed again.
+
+    Args:
+        digest_store (MutableMapping): The digests stored by path on previous writes.
+        path (str): The file path.
+
+    Returns:
+        str: The stored digest, None if it is not stored or the file changed since.
+    """
+    if digest_store is None:
+        return None
+    with _DIGEST_STORE_LOCK:
+        entry = digest_store.get(path)
+    if not isinstance(entry, dict):
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if (entry.get("size"), entry.get("mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return entry.get("digest")
+
+
+def set_stored_digest(digest_store, path, digest) -> None:
+    """Store the digest of a path with its size and mtime, under the lock of the digest stores, if there is a store."""
+    if digest_store is None:
+        return
+    stat = os.stat(path)
+    with _DIGEST_STORE_LOCK:
+        digest_store[path] = {"digest": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_file_if_changed(path, content, digest_store=None):
+    """Atomically write a text file through a temporary file and a rename, unless it already has the same content.
+
+    Args:
+        path (str): The file path.
+        content (str | bytes): The content to write, a text is encoded to utf8.
+        digest_store (MutableMapping): The digests stored by path on previous writes, updated on write.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged.
+    """
+    data = content.encode("utf8") if isinstance(content, str) else content
+    digest = hashlib.sha256(data).hexdigest()
+    if is_file_unchanged(path, digest, digest_store):
+        return False
+    if os.path.dirname(path):
+        make_folder(os.path.dirname(path))
+    temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(temporary_path, "wb") as filehandler:
+            filehandler.write(data)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+        raise
+    set_stored_digest(digest_store, path, digest)
+    return True
+
+
 def snake_to_title_case(snake_string):
     """Convert snake_case into TitleCase."""
     return "".join(word.capitalize() for word in snake_string.lower().split("_"))
@@ -0,0 +1,262 @@
+"""Fleet-wide TCP reachability sweep, consulted by the dispatcher connectivity checks."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from nornir_nautobot.utils.dns import DNS_CACHE
+from nornir_nautobot.utils.event_loop import run_coroutine
+from nornir_nautobot.utils.scheduler import get_error_code
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ReachabilityMap:
+    """A thread safe map of (ip, port) to whether a TCP connection could be established, with a TTL."""
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        """Initialize the map, entries older than `ttl` seconds are considered unknown."""
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, ip_addr: str, port: int):
+        """Get whether the ip and port were reachable, None if it is unknown or expired."""
+        with self._lock:
+            entry = self._entries.get((ip_addr, port))
+        if not entry or time.monotonic() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def set(self, ip_addr: str, port: int, reachable: bool) -> None:
+        """Record whether the ip and port were reachable."""
+        with self._lock:
+            self._entries[(ip_addr, port)] = (reachable, time.monotonic())
+
+    def clear(self) -> None:
+        """Forget all the recorded entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+REACHABILITY_MAP = ReachabilityMap()
+
+
+class ReachabilityStore:  # pylint: disable=too-many-instance-attributes
+    """A circuit breaker of the hosts failing to connect, persisted to a local JSON file across runs.
+
+    A host is tracked once it fails with one of the `failure_error_codes`. After `failure_threshold` consecutive
+    failures it enters a cooldown of `base_cooldown` seconds, doubled on every further failure up to `max_cooldown`.
+    Dispatcher tasks of a host in cooldown are not attempted, for the methods which connect to the device, the
+    `connects_to_device` of the driver class. Once the cooldown expires a single half-open probe is let through, a
+    success forgets the host and a failure starts a longer cooldown.
+
+    The state is written to the file at most every `save_interval` seconds as it changes, and by `save`, which must be
+    called at the end of the run, or on exiting the store used as a context manager.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        path: str,
+        failure_threshold: int = 3,
+        base_cooldown: float = 300.0,
+        max_cooldown: float = 86400.0,
+        failure_error_codes: tuple = ("E1003", "E1004", "E1018"),
+        skip: bool = False,
+        save_interval: float = 30.0,
+    ) -> None:
+        """Initialize the store, loading the state of the previous runs from `path` if it exists.
+
+        Args:
+            path (str): The JSON file the state is persisted to.
+            failure_threshold (int): The consecutive failures before a host enters a cooldown.
+            base_cooldown (float): The first cooldown, in seconds.
+            max_cooldown (float): The longest cooldown, in seconds.
+            failure_error_codes (tuple): The error codes counted as a connectivity failure, any other outcome means
+                the host was reached.
+            skip (bool): Whether the tasks of a host in cooldown are skipped with a warning rather than failed.
+            save_interval (float): The minimum time, in seconds, between two writes of the file during the run.
+        """
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.failure_error_codes = failure_error_codes
+        self.skip = skip
+        self.save_interval = save_interval
+        self._state = {}
+        self._probing = set()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as filehandler:
+                    state = json.load(filehandler)
+            except (OSError, ValueError) as error:
+                LOGGER.warning("The reachability store %s could not be read, starting empty: %s", path, error)
+                state = {}
+            self._state = state if isinstance(state, dict) else {}
+
+    def __enter__(self):
+        """Use the store for a run, saved on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Save the state of the run."""
+        self.save()
+
+    def _save(self) -> None:
+        """Atomically write the state to the file, must be called with the lock held."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, encoding="utf-8") as filehandler:
+            json.dump(self._state, filehandler, indent=2, sort_keys=True)
+        os.replace(filehandler.name, self.path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def _changed(self) -> None:
+        """Mark the state as changed, writing it if the last write is older than `save_interval`, with the lock held."""
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.save_interval:
+            self._save()
+
+    def save(self) -> None:
+        """Write the state to the file if it changed since the last write."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def get(self, hostname: str) -> dict:
+        """Get the state of a host, an empty dictionary if it is not tracked."""
+        with self._lock:
+            return dict(self._state.get(hostname, {}))
+
+    def allow(self, hostname: str) -> bool:
+        """Whether a task should be attempted for the host, taking the half-open probe if its cooldown expired."""
+        with self._lock:
+            state = self._state.get(hostname)
+            if not state or state["failures"] < self.failure_threshold:
+                return True
+            if time.time() < state["cooldown_until"] or hostname in self._probing:
+                return False
+            self._probing.add(hostname)
+            return True
+
+    def record_success(self, hostname: str) -> None:
+        """Forget the failures of a host."""
+        with self._lock:
+            self._probing.discard(hostname)
+            if self._state.pop(hostname, None):
+                self._changed()
+
+    def record_failure(self, hostname: str) -> None:
+        """Count a consecutive failure of a host, starting or extending its cooldown."""
+        with self._lock:
+            self._probing.discard(hostname)
+            state = self._state.setdefault(hostname, {"failures": 0, "cooldown_until": 0})
+            state["failures"] += 1
+            if state["failures"] >= self.failure_threshold:
+                cooldown = min(
+                    self.max_cooldown, self.base_cooldown * 2 ** (state["failures"] - self.failure_threshold)
+                )
+                state["cooldown_until"] = time.time() + cooldown
+            self._changed()
+
+    def get_error_message_kwargs(self, hostname: str) -> dict:
+        """Get the keyword arguments of the `E1038` error message of a host in cooldown."""
+        state = self.get(hostname)
+        cooldown_until = datetime.fromtimestamp(state.get("cooldown_until", 0), tz=timezone.utc)
+        return {
+            "hostname": hostname,
+            "failures": state.get("failures", 0),
+            "cooldown_until": cooldown_until.isoformat(timespec="seconds"),
+        }
+
+    @contextmanager
+    def track(self, hostname: str):
+        """Context manager recording the outcome of a task of the host."""
+        try:
+            yield
+        except Exception as error:
+            if get_error_code(error) in self.failure_error_codes:
+                self.record_failure(hostname)
+            else:
+                self.record_success(hostname)
+            raise
+        self.record_success(hostname)
+
+
+async def _tcp_connect(ip_addr: str, port: int, timeout: float) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip_addr, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def _sweep(targets: dict, concurrency: int, timeout: float) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _probe(name, hostname, port):
+        async with semaphore:
+            ip_addr = await DNS_CACHE.async_resolve(hostname)
+            reachable = bool(ip_addr) and await _tcp_connect(ip_addr, port, timeout)
+        return name, {"ip": ip_addr, "port": port, "reachable": reachable}
+
+    results = await asyncio.gather(*[_probe(name, *target) for name, target in targets.items()])
+    return dict(results)
+
+
+def tcp_reachability_sweep(
+    nornir,
+    port_resolver,
+    concurrency: int = 1000,
+    timeout: float = 2.0,
+    reachability_map: ReachabilityMap = REACHABILITY_MAP,
+) -> dict:
+    """Run non-blocking TCP connects to every host of the inventory on the shared event loop.
+
+    The port of each host is given by the `port_resolver`, E.g. the `get_tcp_port_resolver` of the dispatcher, which
+    resolves the port `check_connectivity` would use. The outcome is recorded in the `reachability_map`, which
+    `check_connectivity` consults instead of probing the host again.
+
+    Args:
+        nornir (Nornir): The Nornir object, with the inventory already filtered to the hosts of the run.
+        port_resolver (Callable): Called with each Nornir host, returns the TCP port to probe, None to skip the host.
+        concurrency (int): The maximum number of TCP connects in flight.
+        timeout (float): The connect timeout of each TCP connect, in seconds.
+        reachability_map (ReachabilityMap): The map to record the outcome in.
+
+    Returns:
+        dict: A dictionary of host name to a dictionary of the `ip`, `port` and whether it was `reachable`.
+    """
+    targets = {}
+    for name, host in nornir.inventory.hosts.items():
+        port = port_resolver(host)
+        if port is None:
+            LOGGER.debug("No TCP port found for %s, skipped from the reachability sweep", name)
+            continue
+        targets[name] = (host.hostname, port)
+
+    results = run_coroutine(_sweep(targets, concurrency, timeout))
+    for result in results.values():
+        if result["ip"]:
+            reachability_map.set(result["ip"], result["port"], result["reachable"])
+    LOGGER.info(
+        "Reachability sweep completed, %s of %s hosts reachable",
+        sum(result["reachable"] for result in results.values()),
+        len(results),
+    )
+    return results
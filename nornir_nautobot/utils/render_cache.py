@@ -0,0 +1,140 @@
+"""Cache of the rendered configurations, skipping the render of a host whose templates and context are unchanged."""
+
+import datetime
+import decimal
+import hashlib
+import json
+import os
+import threading
+import uuid
+from typing import Optional
+
+from nornir.core.inventory import Host
+
+from nornir_nautobot.utils.compression import content_digest
+
+
+def _fingerprint_default(value):
+    """Reduce an object of the render context to a stable JSON value, else raise a TypeError."""
+    if isinstance(value, Host):
+        # The inherited data too, the connections and credentials are not rendered.
+        return {
+            "name": value.name,
+            "hostname": value.hostname,
+            "platform": value.platform,
+            "port": value.port,
+            "data": dict(value.items()),
+        }
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=lambda item: json.dumps(item, sort_keys=True, default=_fingerprint_default))
+    if isinstance(value, (datetime.date, datetime.time, decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if getattr(value, "_meta", None) is not None and hasattr(value, "pk"):
+        # A Django model instance, whose related objects and config context a template may walk, unlike its own row.
+        raise TypeError(f"The {value._meta.label} model instance can not be fingerprinted")
+    if callable(getattr(value, "serialize", None)):
+        # E.g. a pynautobot Record, by the fields it was fetched with.
+        return value.serialize()
+    raise TypeError(f"{type(value).__name__} can not be fingerprinted")
+
+
+def get_context_fingerprint(context: dict) -> Optional[str]:
+    """Get a stable sha256 fingerprint of a render context, the same across processes for the same data.
+
+    The context is serialized to canonical JSON, with the keys sorted. A Nornir host is fingerprinted by its name,
+    hostname, platform, port and data, including the data of its groups. A pynautobot record is fingerprinted by its
+    serialized fields. A Django model instance is refused, as its `last_updated` does not change with the related
+    objects or the config context a template may walk, so a context holding one is never cached.
+
+    Args:
+        context (dict): The render context.
+
+    Returns:
+        str: The fingerprint, None if an object of the context has no stable representation.
+    """
+    try:
+        serialized = json.dumps(context, sort_keys=True, default=_fingerprint_default)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(serialized.encode("utf8")).hexdigest()
+
+
+class RenderCache:
+    """A thread safe cache of the rendered configurations, by output file, with the number of hits and misses.
+
+    An output file is a hit when the digest of its templates and the fingerprint of its render context are the same as
+    when it was last written, and the file itself is unchanged since, E.g. by a git pull or reset. The file is checked
+    by its size and modification time, and when only the modification time changed, by the digest of its content. The
+    entries are kept in a `store` mapping, E.g. a `shelve`, to be reused across runs.
+    """
+
+    def __init__(self, store=None) -> None:
+        """Initialize the cache.
+
+        Args:
+            store (MutableMapping): The entries by output file, an empty dictionary by default.
+        """
+        self.store = {} if store is None else store
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, key: list) -> Optional[dict]:
+        """Get the reference to an output file if it is a hit, counting the hit or miss.
+
+        Args:
+            path (str): The output file.
+            key (list): The template digest and context fingerprint of the render.
+
+        Returns:
+            dict: The reference to the output file, with its `path`, `size` in bytes and sha256 `digest`, None on a miss.
+        """
+        with self._lock:
+            entry = self.store.get(path)
+            if entry and entry["key"] == list(key) and self._is_file_unchanged(path, entry):
+                self.hits += 1
+                return entry["reference"]
+            self.misses += 1
+            return None
+
+    def _is_file_unchanged(self, path: str, entry: dict) -> bool:
+        """Whether the output file is as it was written, refreshing its modification time when only that changed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        size, mtime_ns = entry.get("stat") or (None, None)
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns == mtime_ns:
+            return True
+        if content_digest(path) != entry["reference"].get("digest"):
+            return False
+        self.store[path] = {**entry, "stat": [stat.st_size, stat.st_mtime_ns]}
+        return True
+
+    def put(self, path: str, key: list, reference: dict) -> None:
+        """Record the render of an output file, with the size and modification time it was written with.
+
+        Args:
+            path (str): The output file.
+            key (list): The template digest and context fingerprint of the render.
+            reference (dict): The reference to the output file, with its `path`, `size` in bytes and sha256 `digest`.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self.store[path] = {"key": list(key), "reference": reference, "stat": [stat.st_size, stat.st_mtime_ns]}
+
+    def report(self) -> dict:
+        """Get the number of `hits` and `misses` since the cache was created or reset."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def reset_report(self) -> None:
+        """Reset the number of hits and misses, E.g. at the start of a run."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
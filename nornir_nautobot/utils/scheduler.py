@@ -0,0 +1,176 @@
+"""Concurrency limits keyed by inventory data, adapted with AIMD on the observed failures."""
+
+import logging
+import threading
+from contextlib import contextmanager
+
+from nornir.core.exceptions import NornirSubTaskError
+
+from nornir_nautobot.constants import EXCEPTION_TO_ERROR_MAPPER
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _get_platform(host, obj):  # pylint: disable=unused-argument
+    return host.platform
+
+
+def _get_location(host, obj):  # pylint: disable=unused-argument
+    return getattr(getattr(obj, "location", None), "name", None)
+
+
+def _get_aaa_server(host, obj):
+    if host.data.get("aaa_server"):
+        return host.data["aaa_server"]
+    if hasattr(obj, "get_config_context"):
+        return obj.get_config_context().get("aaa_server")
+    return None
+
+
+KEY_FUNCTIONS = {
+    "platform": _get_platform,
+    "location": _get_location,
+    "aaa_server": _get_aaa_server,
+}
+
+
+def get_error_code(error: Exception) -> str:
+    """Get the error code of an exception raised while running a dispatcher task.
+
+    Args:
+        error (Exception): The exception, a NornirSubTaskError is unwrapped to the exception of its result.
+
+    Returns:
+        str: The `E1XXX` error code, or an empty string if it can not be determined.
+    """
+    while isinstance(error, NornirSubTaskError) and error.result.exception:
+        error = error.result.exception
+    if type(error) in EXCEPTION_TO_ERROR_MAPPER:
+        return EXCEPTION_TO_ERROR_MAPPER[type(error)]
+    error_code = str(error).split(":", 1)[0]
+    return error_code if error_code.startswith("E1") else ""
+
+
+class AdaptiveLimit:  # pylint: disable=too-few-public-methods
+    """The AIMD adapted concurrency limit of a single key."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1) -> None:
+        """Initialize the limit at its configured maximum."""
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.successes = 0
+        self.failures = 0
+
+    def has_capacity(self) -> bool:
+        """Whether another session can start for this key."""
+        return self.in_flight < max(int(self.limit), self.min_limit)
+
+
+class ConcurrencyLimiter:
+    """Concurrency caps keyed by platform, location or AAA server, shared by all the dispatcher tasks of a run.
+
+    The `limits` are a dictionary of dimension to a dictionary of value to the maximum number of concurrent tasks,
+    where the `default` value applies to any value not listed. For example:
+
+        {
+            "platform": {"cisco_ios": 100, "default": 50},
+            "location": {"default": 10},
+            "aaa_server": {"10.1.1.1": 25},
+        }
+
+    A task only starts once every key it belongs to has capacity. Each limit starts at its configured maximum, it is
+    multiplied by `decrease_factor` whenever a task fails with one of the `backoff_error_codes`, such as an
+    authentication failure or a timeout, and increases additively back towards the maximum as tasks succeed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        limits: dict,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        backoff_error_codes: tuple = ("E1017", "E1018"),
+        key_functions: dict = None,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            limits (dict): A dictionary of dimension to a dictionary of value to the maximum concurrent tasks.
+            min_limit (int): The floor the adaptive limits never decrease below.
+            decrease_factor (float): The multiplicative decrease applied on a backoff failure.
+            backoff_error_codes (tuple): The error codes which should decrease the limits.
+            key_functions (dict): Functions taking the host and obj to get the value of a dimension, added to
+                the built in `platform`, `location` and `aaa_server` dimensions.
+        """
+        self.limits = limits
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.backoff_error_codes = backoff_error_codes
+        self.key_functions = {**KEY_FUNCTIONS, **(key_functions or {})}
+        self._adaptive_limits = {}
+        self._condition = threading.Condition()
+
+    def get_keys(self, host, obj) -> list:
+        """Get the limited keys, as (dimension, value) tuples, of a host."""
+        keys = []
+        for dimension, dimension_limits in self.limits.items():
+            value = self.key_functions[dimension](host, obj)
+            max_limit = dimension_limits.get(value, dimension_limits.get("default"))
+            if max_limit is None:
+                continue
+            key = (dimension, value)
+            if key not in self._adaptive_limits:
+                self._adaptive_limits[key] = AdaptiveLimit(max_limit, self.min_limit)
+            keys.append(key)
+        return keys
+
+    def acquire(self, keys: list) -> None:
+        """Block until every key has capacity, then take a slot in each of them."""
+        with self._condition:
+            self._condition.wait_for(lambda: all(self._adaptive_limits[key].has_capacity() for key in keys))
+            for key in keys:
+                self._adaptive_limits[key].in_flight += 1
+
+    def release(self, keys: list, backoff: bool = False) -> None:
+        """Release the slots of the keys, adapting their limits on the outcome of the task."""
+        with self._condition:
+            for key in keys:
+                adaptive_limit = self._adaptive_limits[key]
+                adaptive_limit.in_flight -= 1
+                if backoff:
+                    adaptive_limit.failures += 1
+                    adaptive_limit.limit = max(self.min_limit, adaptive_limit.limit * self.decrease_factor)
+                    LOGGER.debug("Decreased the concurrency of %s to %s", key, int(adaptive_limit.limit))
+                else:
+                    adaptive_limit.successes += 1
+                    adaptive_limit.limit = min(
+                        adaptive_limit.max_limit, adaptive_limit.limit + 1 / adaptive_limit.limit
+                    )
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, host, obj):
+        """Context manager holding a slot for the host for the duration of a task."""
+        with self._condition:
+            keys = self.get_keys(host, obj)
+        self.acquire(keys)
+        try:
+            yield
+        except Exception as error:
+            self.release(keys, backoff=get_error_code(error) in self.backoff_error_codes)
+            raise
+        self.release(keys)
+
+    def stats(self) -> dict:
+        """Get the current limit, in flight tasks, successes and failures of each key."""
+        with self._condition:
+            return {
+                key: {
+                    "limit": int(adaptive_limit.limit),
+                    "in_flight": adaptive_limit.in_flight,
+                    "successes": adaptive_limit.successes,
+                    "failures": adaptive_limit.failures,
+                }
+                for key, adaptive_limit in self._adaptive_limits.items()
+            }
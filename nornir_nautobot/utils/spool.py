@@ -0,0 +1,48 @@
+"""Spool large command outputs to disk instead of holding them in Nornir results."""
+
+import hashlib
+import os
+import uuid
+
+from nornir_nautobot.utils.compression import read_text
+from nornir_nautobot.utils.helpers import command_to_filename, make_folder
+
+
+def spool_output(spool_directory: str, host_name: str, command: str, output: str) -> dict:
+    """Write a command output to a per-host spool file.
+
+    The file is named after the command and a short digest of it, so two commands which sanitize to the same filename
+    do not overwrite each other. It is written to a temporary file renamed once complete, so a reader never sees a
+    partial output.
+
+    Args:
+        spool_directory (str): The root folder of the spool, a folder is created per host within it.
+        host_name (str): The name of the Nornir host.
+        command (str): The command the output belongs to, used for the filename.
+        output (str): The command output.
+
+    Returns:
+        dict: A reference to the spooled output, with the `path`, `size` in bytes and sha256 `digest`.
+    """
+    folder = os.path.join(spool_directory, command_to_filename(host_name))
+    make_folder(folder)
+    command_digest = hashlib.sha256(command.encode("utf-8")).hexdigest()[:8]
+    path = os.path.join(folder, f"{command_to_filename(command)}-{command_digest}.txt")
+    data = output.encode("utf-8")
+    temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temporary_path, "wb") as filehandler:
+        filehandler.write(data)
+    os.replace(temporary_path, path)
+    return {"path": path, "size": len(data), "digest": hashlib.sha256(data).hexdigest()}
+
+
+def is_spooled(output) -> bool:
+    """Whether a command output is a reference to a spooled file rather than the output itself."""
+    return isinstance(output, dict) and {"path", "size", "digest"}.issubset(output)
+
+
+def read_spooled_output(output) -> str:
+    """Get the text of a command output, reading it back from the spool, or a streamed backup file, if it was spooled."""
+    if not is_spooled(output):
+        return output
+    return read_text(output["path"])
@@ -0,0 +1,36 @@
+"""Microbenchmark of the hidden error detection on a large running configuration.
+
+Run with `python tests/benchmarks/benchmark_hidden_errors.py`.
+"""
+
+import timeit
+
+from nornir_nautobot.constants import ERROR_MATCHES_BAD_COMMAND, ERROR_MATCHES_NO_AUTHORIZATION
+from nornir_nautobot.plugins.tasks.dispatcher.default import NetmikoDefault
+
+
+def _substring_searches(output):
+    """The previous implementation, one substring search per error string."""
+    for error_str in ERROR_MATCHES_NO_AUTHORIZATION + ERROR_MATCHES_BAD_COMMAND:
+        if error_str in output:
+            return True
+    return False
+
+
+def main():
+    """Time both implementations on a clean output of about 5 MB."""
+    output = "".join(
+        f"interface GigabitEthernet1/0/{index}\n description uplink {index}\n switchport mode access\n!\n"
+        for index in range(60000)
+    )
+    number = 20
+    for name, function in (
+        ("substring searches", _substring_searches),
+        ("compiled matcher", NetmikoDefault._has_hidden_errors),  # pylint: disable=protected-access
+    ):
+        seconds = timeit.timeit(lambda function=function: function(output), number=number) / number
+        print(f"{name}: {seconds * 1000:.2f} ms per {len(output) / 1e6:.1f} MB output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Pytest of the compliance reusing the parsed unchanged configurations, and the batch compliance."""
+
+import logging
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+from netutils.config.compliance import compliance
+from nornir.core.task import MultiResult, Result
+
+from nornir_nautobot.exceptions import NornirNautobotException
+from nornir_nautobot.plugins.tasks.dispatcher.default import NetmikoDefault
+from nornir_nautobot.utils import compliance as compliance_module
+from nornir_nautobot.utils.compliance import (
+    ParsedConfigCache,
+    batch_compliance,
+    get_compliance,
+    incremental_compliance,
+)
+
+LOGGER = logging.getLogger(__name__)
+FEATURES = [
+    {"name": "hostname", "ordered": True, "section": ["hostname"]},
+    {"name": "ntp", "ordered": False, "section": ["ntp"]},
+    {"name": "bgp", "ordered": True, "section": ["router bgp "]},
+    {"name": "snmp", "ordered": True, "section": ["snmp-server", "access-list"]},
+    {"name": "all", "ordered": True, "section": []},
+]
+BACKUP = """hostname router1
+ntp server 192.0.2.2
+ntp server 192.0.2.1
+router bgp 65000
+ bgp router-id 192.0.2.10
+ neighbor 192.0.2.20 remote-as 65001
+!
+snmp-server location SFO
+access-list 1 permit 192.0.2.15"""
+INTENDED = """hostname router1
+ntp server 192.0.2.1
+ntp server 192.0.2.2
+router bgp 65000
+ bgp router-id 192.0.2.11
+!
+snmp-server location SFO
+access-list 1 permit 192.0.2.15"""
+
+
+def test_identical_to_netutils_compliance():
+    for network_os in ("cisco_ios", "arista_eos", "hp_comware"):
+        expected = compliance(FEATURES, BACKUP, INTENDED, network_os, "string")
+        assert get_compliance(FEATURES, BACKUP, INTENDED, network_os) == expected
+
+
+def test_batch_compliance(tmp_path):
+    backup_file = tmp_path / "router1.cfg"
+    backup_file.write_text(BACKUP, encoding="utf8")
+    intended_file = tmp_path / "router1.intended.cfg"
+    intended_file.write_text(INTENDED, encoding="utf8")
+    jobs = {
+        "router1": (str(backup_file), str(intended_file), "cisco_ios"),
+        "router2": (str(tmp_path / "missing.cfg"), str(intended_file), "cisco_ios"),
+        "router3": (str(backup_file), str(intended_file), "unknown_os"),
+    }
+    expected = compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", "string")
+    for max_workers in (0, 2):
+        results = batch_compliance(jobs, {"cisco_ios": FEATURES, "unknown_os": FEATURES}, max_workers=max_workers)
+        assert results["router1"] == {"feature_data": expected}
+        assert "E1007" in results["router2"]["error"]
+        assert "E1009" in results["router3"]["error"]
+
+
+def test_parsed_config_cache(tmp_path, monkeypatch):
+    parsed = []
+    parse_config_lines = compliance_module.parse_config_lines
+
+    def _parse_config_lines(device_cfg, network_os):
+        parsed.append(device_cfg)
+        return parse_config_lines(device_cfg, network_os)
+
+    monkeypatch.setattr(compliance_module, "parse_config_lines", _parse_config_lines)
+    parsed_config_cache = ParsedConfigCache(path=str(tmp_path / "parsed"))
+    expected = compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", "string")
+    # Each configuration is parsed once for all the features.
+    assert get_compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", parsed_config_cache) == expected
+    assert parsed == [BACKUP, INTENDED]
+    parsed.clear()
+    assert get_compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", parsed_config_cache) == expected
+    assert not parsed
+
+    # An empty copy of the cache, as in a worker process, loads the parsed lines from the folder.
+    parsed_config_cache = pickle.loads(pickle.dumps(parsed_config_cache))
+    features = FEATURES[:-1]
+    assert get_compliance(features, BACKUP, INTENDED, "cisco_ios", parsed_config_cache) == compliance(
+        features, BACKUP, INTENDED, "cisco_ios", "string"
+    )
+    assert not parsed
+
+    in_memory_cache = ParsedConfigCache(maxsize=1)
+    for device_cfg in (BACKUP, INTENDED, BACKUP):
+        in_memory_cache.get_sections(features, device_cfg, "cisco_ios")
+    assert len(parsed) == 3
+
+
+def test_section_from_config_lines_matches_netutils():
+    for network_os in ("cisco_ios", "hp_comware", "juniper_junos"):
+        config_lines = compliance_module.parse_config_lines(BACKUP, network_os)
+        for feature in FEATURES[:-1]:
+            assert compliance_module.section_from_config_lines(
+                feature, config_lines, network_os
+            ) == compliance_module.section_config(feature, BACKUP, network_os)
+
+
+def test_incremental_compliance(tmp_path, monkeypatch):
+    backup_file = tmp_path / "router1.cfg"
+    backup_file.write_text(BACKUP, encoding="utf8")
+    intended_file = tmp_path / "router1.intended.cfg"
+    intended_file.write_text(INTENDED, encoding="utf8")
+    jobs = {"router1": (str(backup_file), str(intended_file), "cisco_ios")}
+    compliance_store = {}
+    expected = compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", "string")
+    assert batch_compliance(jobs, FEATURES, max_workers=0, compliance_store=compliance_store) == {
+        "router1": {"feature_data": expected}
+    }
+    assert compliance_store["router1"]["feature_data"] == expected
+
+    recomputed = []
+    get_file_compliance = compliance_module.get_file_compliance
+    monkeypatch.setattr(
+        compliance_module,
+        "get_file_compliance",
+        lambda *args: recomputed.append(args[1]) or get_file_compliance(*args),
+    )
+    for max_workers in (0, 2):
+        results = batch_compliance(jobs, FEATURES, max_workers=max_workers, compliance_store=compliance_store)
+        assert results == {"router1": {"feature_data": expected}}
+    assert not recomputed
+
+    backup_file.write_text(INTENDED, encoding="utf8")
+    results = batch_compliance(jobs, FEATURES, max_workers=0, compliance_store=compliance_store)
+    assert results == {"router1": {"feature_data": compliance(FEATURES, INTENDED, INTENDED, "cisco_ios", "string")}}
+    features = FEATURES[:1]
+    results = batch_compliance(jobs, features, max_workers=0, compliance_store=compliance_store)
+    assert results == {"router1": {"feature_data": compliance(features, INTENDED, INTENDED, "cisco_ios", "string")}}
+    assert recomputed == [str(backup_file)] * 2
+
+    backup_file.unlink()
+    assert (
+        "E1007"
+        in incremental_compliance(
+            compliance_store, "router1", features, str(backup_file), str(intended_file), "cisco_ios"
+        )["error"]
+    )
+    assert "router1" not in compliance_store
+
+
+def test_incremental_compliance_recomputes_a_removed_report(tmp_path, monkeypatch):
+    backup_file = tmp_path / "router1.cfg"
+    backup_file.write_text(BACKUP, encoding="utf8")
+    intended_file = tmp_path / "router1.intended.cfg"
+    intended_file.write_text(INTENDED, encoding="utf8")
+    compliance_store = {}
+    args = (compliance_store, "router1", FEATURES, str(backup_file), str(intended_file), "cisco_ios")
+    expected = {"feature_data": compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", "string")}
+    assert incremental_compliance(*args) == expected
+
+    # The report is removed, E.g. by another thread, after its digests were read and found unchanged.
+    get_incremental_file_compliance = compliance_module.get_incremental_file_compliance
+
+    def _get_incremental_file_compliance(*args, **kwargs):
+        result = get_incremental_file_compliance(*args, **kwargs)
+        compliance_store.pop("router1", None)
+        return result
+
+    monkeypatch.setattr(compliance_module, "get_incremental_file_compliance", _get_incremental_file_compliance)
+    assert incremental_compliance(*args) == expected
+    assert "router1" in compliance_store
+    assert batch_compliance({"router1": args[3:]}, FEATURES, max_workers=0, compliance_store=compliance_store) == {
+        "router1": expected
+    }
+    assert "router1" in compliance_store
+
+
+class _SerialStore(dict):
+    """A store failing on concurrent access, as a `shelve` may be corrupted by it."""
+
+    def __init__(self):
+        super().__init__()
+        self.busy = False
+
+    def _access(self, method, *args):
+        assert not self.busy, "concurrent access"
+        self.busy = True
+        try:
+            time.sleep(0.001)
+            return method(self, *args)
+        finally:
+            self.busy = False
+
+    def get(self, *args):
+        return self._access(dict.get, *args)
+
+    def __getitem__(self, key):
+        return self._access(dict.__getitem__, key)
+
+    def __setitem__(self, key, value):
+        return self._access(dict.__setitem__, key, value)
+
+
+def test_incremental_compliance_concurrent_store(tmp_path):
+    backup_file = tmp_path / "router.cfg"
+    backup_file.write_text(BACKUP, encoding="utf8")
+    intended_file = tmp_path / "router.intended.cfg"
+    intended_file.write_text(INTENDED, encoding="utf8")
+    compliance_store = _SerialStore()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(2):
+            results = list(
+                executor.map(
+                    lambda host_name: incremental_compliance(
+                        compliance_store, host_name, FEATURES, str(backup_file), str(intended_file), "cisco_ios"
+                    ),
+                    [f"router{index}" for index in range(16)],
+                )
+            )
+    assert all("feature_data" in result for result in results)
+    assert len(compliance_store) == 16
+
+
+def test_compliance_config_from_memory(tmp_path, monkeypatch):
+    task = Mock()
+    task.host.name = "router1"
+    expected = compliance(FEATURES, BACKUP, INTENDED, "cisco_ios", "string")
+    # As returned by running the dispatcher.
+    driver_result = MultiResult("get_config")
+    driver_result.append(Result(host=None, result={"config": f"{BACKUP}\n"}))
+    backup_result = MultiResult("dispatcher")
+    backup_result.append(Result(host=None, result=driver_result))
+
+    result = NetmikoDefault.compliance_config(
+        task, LOGGER, None, FEATURES, None, None, "cisco_ios", backup_config=backup_result, intended_config=INTENDED
+    )
+    assert result.result == {"feature_data": expected}
+    with pytest.raises(NornirNautobotException, match="E1008"):
+        NetmikoDefault.compliance_config(task, LOGGER, None, FEATURES, None, None, "cisco_ios", backup_config=BACKUP)
+
+    # The configurations in memory and in files have the same digests.
+    compliance_store = {}
+    monkeypatch.setattr(NetmikoDefault, "compliance_store", compliance_store)
+    NetmikoDefault.compliance_config(
+        task, LOGGER, None, FEATURES, None, None, "cisco_ios", backup_config=BACKUP, intended_config=INTENDED
+    )
+    backup_file = tmp_path / "router1.cfg"
+    backup_file.write_text(BACKUP, encoding="utf8")
+    intended_file = tmp_path / "router1.intended.cfg"
+    intended_file.write_text(INTENDED, encoding="utf8")
+    monkeypatch.setattr(compliance_module, "get_file_compliance", None)
+    result = NetmikoDefault.compliance_config(
+        task, LOGGER, None, FEATURES, str(backup_file), str(intended_file), "cisco_ios"
+    )
+    assert result.result == {"feature_data": expected}
@@ -0,0 +1,53 @@
+"""Pytest of the optional compression of the configuration files."""
+
+import gzip
+
+import pytest
+
+from nornir_nautobot.exceptions import NornirNautobotException
+from nornir_nautobot.utils import compression
+from nornir_nautobot.utils.compression import (
+    compress,
+    content_digest,
+    get_compression,
+    open_text_writer,
+    read_text,
+)
+from nornir_nautobot.utils.helpers import file_digest
+
+
+def test_get_compression():
+    assert get_compression("router.cfg") is None
+    assert get_compression("router.cfg", "gzip") == "gzip"
+    assert get_compression("router.cfg.gz") == "gzip"
+    assert get_compression("router.cfg.zst", "gzip") == "zstd"
+
+
+def test_gzip_is_deterministic_and_read_transparently(tmp_path):
+    path = tmp_path / "router.cfg.gz"
+    data = compress("hostname router\n", "gzip")
+    assert data == compress("hostname router\n", "gzip")
+    assert gzip.decompress(data) == b"hostname router\n"
+    path.write_bytes(data)
+    assert read_text(str(path)) == "hostname router\n"
+
+    plain = tmp_path / "router.cfg"
+    plain.write_text("hostname router\n", encoding="utf8")
+    assert read_text(str(plain)) == "hostname router\n"
+    assert content_digest(str(path)) == content_digest(str(plain)) == file_digest(str(plain))
+    assert content_digest(str(tmp_path / "missing.cfg")) is None
+
+
+def test_streamed_gzip_has_the_same_content(tmp_path):
+    path = str(tmp_path / "router.cfg.gz")
+    with open_text_writer(path, "gzip") as filehandler:
+        filehandler.write("hostname router\n")
+        filehandler.write("end\n")
+    assert read_text(path) == "hostname router\nend\n"
+
+
+def test_zstd_requires_zstandard(monkeypatch):
+    monkeypatch.setattr(compression, "zstandard", None)
+    with pytest.raises(NornirNautobotException) as exc_info:
+        compress("hostname router\n", "zstd")
+    assert "E1020" in str(exc_info.value)
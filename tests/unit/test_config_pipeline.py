@@ -0,0 +1,121 @@
+"""Pytest of the precompiled config cleaning pipeline."""
+
+import pytest
+from netutils.config.clean import clean_config, sanitize_config
+
+from nornir_nautobot.utils.config_pipeline import (
+    ConfigPipeline,
+    get_config_pipeline,
+    is_full_line_removal,
+    is_line_removal,
+)
+
+CONFIG = """Building configuration...
+
+Current configuration : 1582 bytes
+!
+version 12.4
+ntp clock-period 17179866
+enable secret 5 $1$nc08$bizeEFbgCBKjZP4nurNCd.
+hostname CSR1
+username admin password 7 0832585B1910010713181F
+!
+interface GigabitEthernet1
+ description uplink
+!
+end
+"""
+
+REMOVE_LINES = [
+    {"regex": r"^Building\s+configuration.*\n"},
+    {"regex": r"^Current configuration[^\n]*\n"},
+    {"regex": r"^ntp clock-period.*\n"},
+    {"regex": r"^\n"},
+    {"regex": r"^!\n(?=interface)"},
+    {"regex": r"^ description [\w-]+\n"},
+    {"regex": r"^end\s*"},
+]
+
+SUBSTITUTE_LINES = [
+    {"regex": r"^(enable (password|secret)( level \d+)? \d) .+$", "replace": r"\1 <removed>"},
+    {"regex": r"^(username\s+\S+\s+password\s+\d+)\s+\S+", "replace": r"\1 <removed>"},
+]
+
+
+@pytest.mark.parametrize(
+    "regex, expected",
+    [
+        (r"^Building configuration.*\n", True),
+        (r"^ntp clock-period[^\n]*\n", True),
+        (r"^Building\s+configuration.*\n", False),
+        (r"^(?:a|b)\d{1,3}\n", True),
+        (r"^Building configuration", False),
+        (r"^end\s*", False),
+        (r"^!\n(?=interface)", False),
+        (r"^.*\n.*\n", False),
+        (r"(?s)^.*\n", False),
+        (r"^(a)\1\n", False),
+        (r"\A.*\n", False),
+        (r"^[^\S\n]*!\n", True),
+        (r"^[^!]*\n", False),
+        (r"^(?P<word>\w+)\.\n", True),
+        (r"^x(?=y)\n", False),
+        (r"^(?i)x\n", False),
+    ],
+)
+def test_is_full_line_removal(regex, expected):
+    assert is_full_line_removal(regex) is expected
+
+
+def test_is_line_removal():
+    assert is_line_removal(r"^Building\s+configuration.*\n")
+    assert is_line_removal(r"^!\n(?=interface).*\n")
+    # A backreference or inline flags could change meaning once merged in an alternation.
+    assert not is_line_removal(r"^(a)\1\n")
+    assert not is_line_removal(r"(?s)^.*\n")
+    assert not is_line_removal(r"^end\s*")
+
+
+def test_pipeline_output_is_identical():
+    expected = sanitize_config(clean_config(CONFIG, REMOVE_LINES), SUBSTITUTE_LINES)
+    pipeline = get_config_pipeline(REMOVE_LINES, SUBSTITUTE_LINES)
+    assert pipeline.apply(CONFIG) == expected
+    # The first four removals are merged in a single pass.
+    assert len(pipeline.steps) == len(REMOVE_LINES) + len(SUBSTITUTE_LINES) - 3
+
+
+def test_line_removal_only_leads_a_merged_pass():
+    # Merging the second regex first would leave "Building" and "configuration" on separate lines.
+    remove_lines = [{"regex": r"^x\n"}, {"regex": r"^Building\s+configuration\n"}]
+    config = "Building\nx\nconfiguration\nend\n"
+    pipeline = get_config_pipeline(remove_lines)
+    assert len(pipeline.steps) == 2
+    assert pipeline.apply(config) == clean_config(config, remove_lines) == "end\n"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 100000])
+def test_apply_stream_output_is_identical(chunk_size):
+    remove_lines = [{"regex": r"^Building configuration.*\n"}, {"regex": r"^\n"}, {"regex": r"^ description [\w-]+\n"}]
+    substitute_lines = [{"regex": r"^(enable (password|secret)( level \d+)? \d) .+$", "replace": r"\1 <removed>"}]
+    pipeline = get_config_pipeline(remove_lines, substitute_lines)
+    assert pipeline.streamable
+    for config in (CONFIG, CONFIG.rstrip("\n"), ""):
+        chunks = [config[index : index + chunk_size] for index in range(0, len(config), chunk_size)]
+        assert "".join(pipeline.apply_stream(chunks)) == pipeline.apply(config)
+
+
+def test_apply_stream_falls_back_when_not_streamable():
+    pipeline = get_config_pipeline(REMOVE_LINES, SUBSTITUTE_LINES)
+    assert not pipeline.streamable
+    assert "".join(pipeline.apply_stream([CONFIG[:10], CONFIG[10:]])) == pipeline.apply(CONFIG)
+    assert not get_config_pipeline(substitute_lines=[{"regex": "^a$", "replace": "a\\nb"}]).streamable
+
+
+def test_pipeline_is_cached():
+    assert get_config_pipeline(REMOVE_LINES, SUBSTITUTE_LINES) is get_config_pipeline(REMOVE_LINES, SUBSTITUTE_LINES)
+
+
+def test_duplicate_group_names_are_not_merged():
+    pipeline = ConfigPipeline((r"^(?P<x>a)\n", r"^(?P<x>b)\n"))
+    assert len(pipeline.steps) == 2
+    assert pipeline.apply("a\nb\nc\n") == "c\n"
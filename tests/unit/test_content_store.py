@@ -0,0 +1,34 @@
+"""Pytest of the content-addressed store."""
+
+import os
+
+from nornir_nautobot.utils.content_store import ContentStore
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = ContentStore(str(tmp_path / "store"))
+    switch1 = str(tmp_path / "backups" / "switch1.cfg")
+    switch2 = str(tmp_path / "backups" / "switch2.cfg")
+    assert store.save(switch1, "hostname switch\n")
+    assert store.save(switch2, "hostname switch\n")
+    assert os.path.samefile(switch1, switch2)
+    assert not store.save(switch1, "hostname switch\n")
+
+    assert store.save(switch2, "hostname switch2\n")
+    with open(switch2, encoding="utf8") as filehandler:
+        assert filehandler.read() == "hostname switch2\n"
+    with open(switch1, encoding="utf8") as filehandler:
+        assert filehandler.read() == "hostname switch\n"
+
+    os.unlink(switch1)
+    assert store.gc() == 1
+    assert os.listdir(tmp_path / "backups") == ["switch2.cfg"]
+    assert not store.gc()
+
+
+def test_existing_file_with_same_content_is_unchanged(tmp_path):
+    store = ContentStore(str(tmp_path / "store"))
+    backup_file = tmp_path / "router.cfg"
+    backup_file.write_text("hostname router\n", encoding="utf8")
+    assert not store.save(str(backup_file), "hostname router\n")
+    assert os.path.samefile(backup_file, store.blob_path(store.put("hostname router\n")))
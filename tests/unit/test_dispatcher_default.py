@@ -0,0 +1,498 @@
+"""Pytest of the default dispatcher drivers."""
+
+import asyncio
+import logging
+import os
+from unittest.mock import Mock
+
+import pytest
+from jinja2 import UndefinedError
+from netmiko.exceptions import ReadTimeout
+from nornir.core.exceptions import NornirSubTaskError
+from nornir.core.inventory import Host
+from nornir.core.task import Task
+from scrapli.exceptions import ScrapliTimeout
+from scrapli.response import MultiResponse, Response
+
+from nornir_nautobot.constants import EXCEPTION_TO_ERROR_MAPPER
+from nornir_nautobot.exceptions import NornirNautobotException
+from nornir_nautobot.plugins.tasks.dispatcher.default import AsyncScrapliDefault, NetmikoDefault, ScrapliDefault
+from nornir_nautobot.utils.compression import read_text
+from nornir_nautobot.utils.content_store import ContentStore
+from nornir_nautobot.utils.event_loop import run_coroutine
+from nornir_nautobot.utils.helpers import import_string, snake_to_title_case
+from nornir_nautobot.utils.render_cache import RenderCache
+from nornir_nautobot.utils.spool import is_spooled, read_spooled_output
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _scrapli_response(command, output):
+    response = Response(host="test_host", channel_input=command)
+    response.record_response(output.encode())
+    return response
+
+
+def _scrapli_task(outputs):
+    task = Mock(spec=Task)
+    task.host = Mock()
+    task.host.name = "test_host"
+    multi_response = MultiResponse([_scrapli_response(command, output) for command, output in outputs.items()])
+    task.run.return_value = [Mock(result="", scrapli_response=multi_response)]
+    return task
+
+
+def test_scrapli_get_commands_single_subtask():
+    outputs = {"show version": "Version 1.0", "show clock": "12:00:00"}
+    task = _scrapli_task(outputs)
+    result = ScrapliDefault.get_commands(task, LOGGER, None, list(outputs))
+    assert task.run.call_count == 1
+    assert task.run.call_args.kwargs["commands"] == list(outputs)
+    assert result.result == {"output": outputs}
+
+
+def test_scrapli_get_commands_hidden_error():
+    outputs = {"show version": "Version 1.0", "show sun": "% Invalid input detected at '^' marker."}
+    task = _scrapli_task(outputs)
+    with pytest.raises(NornirNautobotException, match="E1030"):
+        ScrapliDefault.get_commands(task, LOGGER, None, list(outputs))
+
+
+def test_netmiko_split_pipelined_output():
+    marker = "nornir-nautobot-abc"
+    output = "\n".join(
+        [
+            "router#show version",
+            "Version 1.0",
+            "Uptime 1 day",
+            f"router#! {marker}-0-",
+            "router#show clock",
+            "12:00:00",
+            f"router#! {marker}-1-",
+            "router#",
+        ]
+    )
+    result = NetmikoDefault._split_pipelined_output(output, ["show version", "show clock"], marker)
+    assert result == {"show version": "Version 1.0\nUptime 1 day", "show clock": "12:00:00"}
+
+
+def test_netmiko_split_pipelined_output_missing_marker():
+    marker = "nornir-nautobot-abc"
+    output = f"router#show version\nVersion 1.0\nrouter#! {marker}-0-\nrouter#show clock\n12:00:00"
+    with pytest.raises(NornirNautobotException, match="E1037"):
+        NetmikoDefault._split_pipelined_output(output, ["show version", "show clock"], marker)
+
+
+def test_async_scrapli_dispatcher_path():
+    framework_path = f"nornir_nautobot.plugins.tasks.dispatcher.default.{snake_to_title_case('async_scrapli')}Default"
+    assert import_string(framework_path) is AsyncScrapliDefault
+
+
+def test_async_scrapli_send_commands_on_shared_loop(monkeypatch):
+    outputs = {"show version": "Version 1.0", "show clock": "12:00:00"}
+
+    async def fake_send_commands(host, command_list, **kwargs):
+        return MultiResponse([_scrapli_response(command, outputs[command]) for command in command_list])
+
+    monkeypatch.setattr(AsyncScrapliDefault, "async_send_commands", fake_send_commands)
+    monkeypatch.setattr(AsyncScrapliDefault, "transport", "asynctelnet")
+    task = Mock(spec=Task)
+    task.host = Mock()
+    task.run.side_effect = lambda task, **kwargs: [task(Mock(host="test_host"), **kwargs)]
+    result = AsyncScrapliDefault.get_commands(task, LOGGER, None, list(outputs))
+    assert result.result == {"output": outputs}
+
+
+def _fake_async_scrapli(opened):
+    class FakeAsyncScrapli:
+        def __init__(self, **kwargs):
+            self.host = kwargs["host"]
+            self.closed = False
+            opened.append(self)
+
+        async def open(self):
+            pass
+
+        async def close(self):
+            self.closed = True
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+
+        async def send_commands(self, command_list, **kwargs):
+            if "fail" in command_list:
+                raise OSError("connection reset")
+            if "hang" in command_list:
+                await asyncio.sleep(1)
+            return MultiResponse([_scrapli_response(command, self.host) for command in command_list])
+
+    return FakeAsyncScrapli
+
+
+@pytest.fixture(name="opened_sessions")
+def fixture_opened_sessions(monkeypatch):
+    opened = []
+    monkeypatch.setattr("nornir_nautobot.plugins.tasks.dispatcher.default.AsyncScrapli", _fake_async_scrapli(opened))
+    monkeypatch.setattr(AsyncScrapliDefault, "_session_semaphores", {})
+    monkeypatch.setattr(AsyncScrapliDefault, "_connections", {})
+    return opened
+
+
+def test_async_scrapli_reuse_connections(monkeypatch, opened_sessions):
+    monkeypatch.setattr(AsyncScrapliDefault, "reuse_connections", True)
+    monkeypatch.setattr(AsyncScrapliDefault, "max_concurrent_sessions", 1)
+    host = Host(name="router", hostname="192.0.2.10", platform="cisco_ios")
+
+    run_coroutine(AsyncScrapliDefault.async_send_commands(host, ["show version"]))
+    run_coroutine(AsyncScrapliDefault.async_send_commands(host, ["show clock"]))
+    assert len(opened_sessions) == 1
+    with pytest.raises(OSError):
+        run_coroutine(AsyncScrapliDefault.async_send_commands(host, ["fail"]))
+    assert opened_sessions[0].closed
+    run_coroutine(AsyncScrapliDefault.async_send_commands(host, ["show version"]))
+    assert len(opened_sessions) == 2
+
+    # More hosts than sessions, the idle session is closed rather than waited on.
+    other_host = Host(name="router2", hostname="192.0.2.11", platform="cisco_ios")
+    run_coroutine(AsyncScrapliDefault.async_send_commands(other_host, ["show version"]), timeout=5)
+    assert opened_sessions[1].closed
+    assert not opened_sessions[2].closed
+    AsyncScrapliDefault.close_connections()
+    assert opened_sessions[2].closed
+    assert not AsyncScrapliDefault._connections
+
+
+def test_async_scrapli_session_timeout(monkeypatch, opened_sessions):
+    monkeypatch.setattr(AsyncScrapliDefault, "max_concurrent_sessions", 1)
+    monkeypatch.setattr(AsyncScrapliDefault, "session_timeout", 0.05)
+    hosts = [Host(name=f"router{index}", hostname=f"192.0.2.{index}", platform="cisco_ios") for index in range(2)]
+    results = AsyncScrapliDefault.send_commands_to_hosts(hosts, ["hang"])
+    assert sum(isinstance(result, ScrapliTimeout) for result in results.values()) == 1
+    assert len(opened_sessions) == 1
+
+
+def test_async_scrapli_send_commands_to_hosts(opened_sessions):
+    hosts = [Host(name=f"router{index}", hostname=f"192.0.2.{index}", platform="cisco_ios") for index in range(50)]
+    results = AsyncScrapliDefault.send_commands_to_hosts(hosts, ["show version"])
+    assert len(opened_sessions) == 50
+    assert results["router7"][0].result == "192.0.2.7"
+
+
+def test_async_scrapli_resolves_hostname_at_connection_time():
+    host = Host(name="router", hostname="localhost", platform="cisco_ios")
+    parameters = run_coroutine(AsyncScrapliDefault._async_resolve_connection_parameters(host))
+    assert parameters["host"] == "127.0.0.1"
+    assert host.hostname == "localhost"
+
+
+def test_run_coroutine():
+    async def add(first, second):
+        return first + second
+
+    assert run_coroutine(add(1, 2)) == 3
+
+
+def test_scrapli_get_commands_spools_large_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(ScrapliDefault, "spool_threshold", 20)
+    outputs = {"show version": "Version 1.0", "show tech-support": "tech-support line\n" * 10}
+    task = _scrapli_task(outputs)
+    result = ScrapliDefault.get_commands(task, LOGGER, None, list(outputs), spool_directory=str(tmp_path))
+    assert result.result["output"]["show version"] == "Version 1.0"
+    spooled = result.result["output"]["show tech-support"]
+    assert is_spooled(spooled)
+    assert os.path.dirname(spooled["path"]) == str(tmp_path / "test_host")
+    assert os.path.basename(spooled["path"]).startswith("show_tech-support-")
+    assert spooled["size"] == len(outputs["show tech-support"])
+    assert read_spooled_output(spooled) == outputs["show tech-support"]
+
+
+def test_scrapli_get_commands_spools_by_bytes_without_collisions(monkeypatch, tmp_path):
+    monkeypatch.setattr(ScrapliDefault, "spool_threshold", 20)
+    # 15 characters but 35 bytes, and two commands sanitized to the same filename.
+    outputs = {"show a/b": "é" * 10 + "€" * 5, "show a:b": "interface Ethernet1\n" * 2}
+    task = _scrapli_task(outputs)
+    result = ScrapliDefault.get_commands(task, LOGGER, None, list(outputs), spool_directory=str(tmp_path))
+    first, second = result.result["output"]["show a/b"], result.result["output"]["show a:b"]
+    assert is_spooled(first) and is_spooled(second)
+    assert first["path"] != second["path"]
+    assert read_spooled_output(first) == outputs["show a/b"]
+    assert read_spooled_output(second) == outputs["show a:b"]
+    assert len(os.listdir(tmp_path / "test_host")) == 2
+
+
+class _StreamingConnection:
+    """A Netmiko connection returning its channel output in small chunks."""
+
+    RETURN = "\n"
+
+    def __init__(self, output):
+        self.chunks = [output[index : index + 7] for index in range(0, len(output), 7)]
+
+    def enable(self):
+        pass
+
+    def find_prompt(self):
+        return "router#"
+
+    def write_channel(self, data):
+        pass
+
+    def read_channel(self):
+        return self.chunks.pop(0) if self.chunks else ""
+
+    def strip_ansi_escape_codes(self, data):
+        return data
+
+    def normalize_linefeeds(self, data):
+        return data.replace("\r\n", "\n")
+
+
+def test_netmiko_get_config_streams_to_backup_file(tmp_path):
+    backup_file = str(tmp_path / "router.cfg")
+    output = "show run\r\nBuilding configuration...\r\nhostname router\r\nenable secret 5 abc\r\nend\r\nrouter#"
+    task = Mock(spec=Task)
+    task.host = Mock()
+    task.nornir = Mock()
+    task.host.get_connection.return_value = _StreamingConnection(output)
+    task.run.side_effect = lambda **kwargs: [kwargs.pop("task")(task, **kwargs)]
+    obj = Mock()
+    obj.cf = {"stream_config": True, "config_command": "show run"}
+    obj.get_config_context.return_value = {}
+
+    result = NetmikoDefault.get_config(
+        task,
+        LOGGER,
+        obj,
+        backup_file,
+        [{"regex": r"^Building configuration.*\n"}],
+        [{"regex": r"^(enable secret \d) .+$", "replace": r"\1 <removed>"}],
+    )
+    assert result.changed
+    assert is_spooled(result.result["config"])
+    assert read_spooled_output(result.result["config"]) == "hostname router\nenable secret 5 <removed>\nend\n"
+
+
+def test_check_streamed_output_finds_late_and_split_errors():
+    chunks = ["hostname router\n" * 1000, "% Invalid input ", "detected at '^' marker.\n"]
+    with pytest.raises(NornirNautobotException, match="E1030"):
+        list(NetmikoDefault._check_streamed_output(LOGGER, Mock(), "show run", iter(chunks)))
+    assert list(NetmikoDefault._check_streamed_output(LOGGER, Mock(), "show run", iter(chunks[:1]))) == chunks[:1]
+
+
+def test_netmiko_get_config_stream_read_timeout(tmp_path):
+    task = Mock(spec=Task)
+    task.host = Mock()
+    task.run.side_effect = NornirSubTaskError(task, Mock(exception=ReadTimeout("Pattern not detected")))
+    obj = Mock()
+    obj.cf = {"stream_config": True, "config_command": "show run"}
+    obj.get_config_context.return_value = {}
+
+    with pytest.raises(NornirNautobotException, match="E1018"):
+        NetmikoDefault.get_config(task, LOGGER, obj, str(tmp_path / "router.cfg"), [], [])
+    # The non-streaming paths keep failing with `E1014` on a read timeout.
+    assert ReadTimeout not in EXCEPTION_TO_ERROR_MAPPER
+
+
+def test_save_file_skips_unchanged_content(tmp_path, monkeypatch):
+    backup_file = str(tmp_path / "backups" / "router.cfg")
+    assert NetmikoDefault._save_file(LOGGER, backup_file, "hostname router\n")
+    mtime = os.stat(backup_file).st_mtime_ns
+    assert not NetmikoDefault._save_file(LOGGER, backup_file, "hostname router\n")
+    assert os.stat(backup_file).st_mtime_ns == mtime
+    assert NetmikoDefault._save_file(LOGGER, backup_file, "hostname router2\n")
+    assert os.listdir(tmp_path / "backups") == ["router.cfg"]
+
+    digest_store = {}
+    monkeypatch.setattr(NetmikoDefault, "digest_store", digest_store)
+    assert not NetmikoDefault._save_file(LOGGER, backup_file, "hostname router2\n")
+    assert NetmikoDefault._save_file(LOGGER, backup_file, "hostname router3\n")
+    assert backup_file in digest_store
+    assert not NetmikoDefault._save_file(LOGGER, backup_file, "hostname router3\n")
+    # A file edited since it was written is hashed again rather than trusting the stored digest.
+    with open(backup_file, "w", encoding="utf8") as filehandler:
+        filehandler.write("hostname edited\n")
+    assert NetmikoDefault._save_file(LOGGER, backup_file, "hostname router3\n")
+    with open(backup_file, encoding="utf8") as filehandler:
+        assert filehandler.read() == "hostname router3\n"
+
+
+@pytest.mark.parametrize("stream_config", [False, True])
+def test_netmiko_get_config_calls_overridden_process_config(tmp_path, stream_config):
+    class CommentDefault(NetmikoDefault):
+        @classmethod
+        def _process_config(cls, logger, running_config, remove_lines, substitute_lines, backup_file):
+            running_config = f"! processed\n{running_config}"
+            return super()._process_config(logger, running_config, remove_lines, substitute_lines, backup_file)
+
+    backup_file = str(tmp_path / "router.cfg")
+    task = Mock(spec=Task)
+    task.host = Mock()
+    task.nornir = Mock()
+    task.host.get_connection.side_effect = lambda *_: _StreamingConnection(
+        "show run\r\nhostname router\r\nend\r\nrouter#"
+    )
+    task.run.side_effect = lambda **kwargs: [kwargs.pop("task")(task, **kwargs)]
+    obj = Mock()
+    obj.cf = {"stream_config": stream_config, "config_command": "show run"}
+    obj.get_config_context.return_value = {}
+    if not stream_config:
+        task.run.side_effect = lambda **kwargs: [Mock(result="hostname router\nend\n", failed=False)]
+
+    result = CommentDefault.get_config(task, LOGGER, obj, backup_file, [{"regex": r"^end\n"}], [])
+    assert result.changed
+    assert read_text(backup_file) == "! processed\nhostname router\n"
+    result = CommentDefault.get_config(task, LOGGER, obj, backup_file, [{"regex": r"^end\n"}], [])
+    assert not result.changed
+
+
+def test_run_process_config_calls_overridden_line_hooks(tmp_path):
+    class UpperDefault(NetmikoDefault):
+        @classmethod
+        def _substitute_lines(cls, logger, _running_config, substitute_lines):
+            return super()._substitute_lines(logger, _running_config, substitute_lines).upper()
+
+    backup_file = str(tmp_path / "router.cfg")
+    substitute_lines = [{"regex": r"router", "replace": "router1"}]
+    running_config, changed = UpperDefault._run_process_config(
+        LOGGER, "hostname router\nend\n", [{"regex": r"^end\n"}], substitute_lines, backup_file
+    )
+    assert changed
+    assert running_config == "HOSTNAME ROUTER1\n"
+    reference, changed = UpperDefault._process_config_stream(
+        LOGGER, iter(["hostname ", "router\nend\n"]), [{"regex": r"^end\n"}], substitute_lines, backup_file
+    )
+    assert not changed
+    assert reference["path"] == backup_file
+    assert not NetmikoDefault._has_line_hooks()
+
+
+def test_save_file_to_content_store(tmp_path, monkeypatch):
+    content_store = ContentStore(str(tmp_path / "store"))
+    monkeypatch.setattr(NetmikoDefault, "content_store", content_store)
+    backup_file = str(tmp_path / "backups" / "router.cfg")
+    assert NetmikoDefault._save_file(LOGGER, backup_file, "hostname router\n")
+    assert not NetmikoDefault._save_file(LOGGER, backup_file, "hostname router\n")
+    assert os.path.samefile(backup_file, content_store.blob_path(content_store.put("hostname router\n")))
+
+
+def test_save_file_compressed(tmp_path):
+    backup_file = str(tmp_path / "backups" / "router.cfg.gz")
+    assert NetmikoDefault._save_file(LOGGER, backup_file, "hostname router\n")
+    assert not NetmikoDefault._save_file(LOGGER, backup_file, "hostname router\n")
+    assert read_text(backup_file) == "hostname router\n"
+
+
+def test_netmiko_get_config_streams_to_compressed_backup_file(tmp_path):
+    backup_file = str(tmp_path / "router.cfg.gz")
+    output = "show run\r\nhostname router\r\nend\r\nrouter#"
+    task = Mock(spec=Task)
+    task.host = Mock()
+    task.nornir = Mock()
+    task.run.side_effect = lambda **kwargs: [kwargs.pop("task")(task, **kwargs)]
+    obj = Mock()
+    obj.cf = {"stream_config": True, "config_command": "show run"}
+    obj.get_config_context.return_value = {}
+
+    for changed in (True, False):
+        task.host.get_connection.return_value = _StreamingConnection(output)
+        result = NetmikoDefault.get_config(task, LOGGER, obj, backup_file, [], [])
+        assert result.changed is changed
+    assert read_text(backup_file) == "hostname router\nend\n"
+    assert os.listdir(tmp_path) == ["router.cfg.gz"]
+
+
+def test_generate_config_streams_to_output_file(tmp_path, monkeypatch):
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "router.j2").write_text(
+        "hostname {{ name }}\n{% for i in range(3) %}vlan {{ i }}\n{% endfor %}"
+    )
+    output_file = str(tmp_path / "intended" / "router.cfg")
+    task = Mock(spec=Task)
+    task.host = {"name": "router"}
+    task.run.side_effect = lambda **kwargs: [kwargs.pop("task")(task, **kwargs)]
+    obj = Mock()
+    obj.cf = {"stream_render": True}
+    obj.get_config_context.return_value = {}
+    expected = "hostname router\nvlan 0\nvlan 1\nvlan 2\n"
+
+    for changed in (True, False):
+        result = NetmikoDefault.generate_config(
+            task, LOGGER, obj, "router.j2", str(tmp_path / "templates"), output_file
+        )
+        assert result.changed is changed
+    assert is_spooled(result.result["config"])
+    assert "text" not in result.result
+    assert read_spooled_output(result.result["config"]) == expected
+    assert os.listdir(tmp_path / "intended") == ["router.cfg"]
+
+    monkeypatch.setattr(NetmikoDefault, "stream_render_keep_text", True)
+    result = NetmikoDefault.generate_config(task, LOGGER, obj, "router.j2", str(tmp_path / "templates"), output_file)
+    assert result.result["text"] == expected
+
+
+def test_generate_config_streaming_error_keeps_output_file(tmp_path):
+    (tmp_path / "router.j2").write_text("hostname router\n{{ missing.name }}\n")
+    output_file = tmp_path / "router.cfg"
+    output_file.write_text("hostname previous\n")
+    task = Mock(spec=Task)
+    task.host = {}
+    task.run.side_effect = lambda **kwargs: [kwargs.pop("task")(task, **kwargs)]
+    obj = Mock(spec=["cf", "get_config_context"])
+    obj.cf = {}
+    obj.get_config_context.return_value = {"stream_render": True}
+
+    with pytest.raises(UndefinedError):
+        NetmikoDefault.generate_config(task, LOGGER, obj, "router.j2", str(tmp_path), str(output_file))
+    assert output_file.read_text() == "hostname previous\n"
+    assert sorted(os.listdir(tmp_path)) == ["router.cfg", "router.j2"]
+
+
+def test_generate_config_render_cache(tmp_path, monkeypatch):
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "router.j2").write_text("hostname {{ name }}\n{% include 'ntp.j2' %}")
+    (tmp_path / "templates" / "ntp.j2").write_text("ntp server 192.0.2.1\n")
+    output_file = str(tmp_path / "router.cfg")
+    render_cache = RenderCache()
+    monkeypatch.setattr(NetmikoDefault, "render_cache", render_cache)
+    host = Host(name="router", data={"name": "router"})
+    task = Mock(spec=Task)
+    task.host = host
+    task.run.side_effect = lambda **kwargs: [kwargs.pop("task")(task, **kwargs)]
+    obj = Mock()
+    obj.cf = {}
+    obj.get_config_context.return_value = {}
+
+    def generate_config():
+        return NetmikoDefault.generate_config(task, LOGGER, obj, "router.j2", str(tmp_path / "templates"), output_file)
+
+    assert generate_config().result["config"] == "hostname router\nntp server 192.0.2.1"
+    assert task.run.call_count == 1
+    result = generate_config()
+    assert not result.changed
+    assert result.result["config"] == "hostname router\nntp server 192.0.2.1"
+    assert task.run.call_count == 1
+    assert render_cache.report() == {"hits": 1, "misses": 1}
+
+    (tmp_path / "templates" / "ntp.j2").write_text("ntp server 192.0.2.2\n")
+    assert generate_config().result["config"] == "hostname router\nntp server 192.0.2.2"
+    host.data["name"] = "router2"
+    assert generate_config().result["config"] == "hostname router2\nntp server 192.0.2.2"
+    assert task.run.call_count == 3
+
+    obj.cf = {"stream_render": True}
+    result = generate_config()
+    assert task.run.call_count == 3
+    assert is_spooled(result.result["config"])
+    assert read_spooled_output(result.result["config"]) == "hostname router2\nntp server 192.0.2.2"
+
+    with open(output_file, "w", encoding="utf8") as filehandler:
+        filehandler.write("hostname changed\n")
+    generate_config()
+    assert task.run.call_count == 4
+    assert read_text(output_file) == "hostname router2\nntp server 192.0.2.2"
+    monkeypatch.setattr(NetmikoDefault, "compression", "gzip")
+    generate_config()
+    assert task.run.call_count == 5
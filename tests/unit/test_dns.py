@@ -0,0 +1,32 @@
+"""Pytest of the DNS cache."""
+
+import socket
+from unittest.mock import patch
+
+from nornir_nautobot.utils.dns import DnsCache
+
+
+def test_resolve_is_cached():
+    cache = DnsCache()
+    with patch("nornir_nautobot.utils.dns.socket.gethostbyname", return_value="10.1.1.1") as gethostbyname:
+        assert cache.resolve("router.example.com") == "10.1.1.1"
+        assert cache.resolve("router.example.com") == "10.1.1.1"
+    gethostbyname.assert_called_once()
+
+
+def test_resolve_negative_cache_and_ttl():
+    cache = DnsCache(negative_ttl=0)
+    with patch("nornir_nautobot.utils.dns.socket.gethostbyname", side_effect=socket.gaierror) as gethostbyname:
+        assert cache.resolve("missing.example.com") is None
+        assert cache.resolve("missing.example.com") is None
+    assert gethostbyname.call_count == 2
+    assert cache.resolve("10.1.1.1") == "10.1.1.1"
+
+
+def test_bulk_resolve_fills_the_cache():
+    cache = DnsCache()
+    resolved = cache.bulk_resolve(["localhost", "127.0.0.2", "host.invalid"])
+    assert resolved == {"localhost": "127.0.0.1", "127.0.0.2": "127.0.0.2", "host.invalid": None}
+    with patch("nornir_nautobot.utils.dns.socket.gethostbyname") as gethostbyname:
+        assert cache.resolve("localhost") == "127.0.0.1"
+    gethostbyname.assert_not_called()
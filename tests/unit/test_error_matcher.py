@@ -0,0 +1,45 @@
+"""Pytest of the hidden error matcher."""
+
+from nornir_nautobot.constants import ERROR_MATCHES_BAD_COMMAND, ERROR_MATCHES_NO_AUTHORIZATION
+from nornir_nautobot.plugins.tasks.dispatcher.default import NetmikoDefault
+from nornir_nautobot.utils.error_matcher import HiddenErrorMatcher, get_hidden_error_matcher
+
+
+def _legacy_search(output):
+    """The previous implementation, one substring search per error string."""
+    if any(error_str in output for error_str in ERROR_MATCHES_NO_AUTHORIZATION):
+        return HiddenErrorMatcher.NO_AUTHORIZATION
+    if any(error_str in output for error_str in ERROR_MATCHES_BAD_COMMAND):
+        return HiddenErrorMatcher.BAD_COMMAND
+    return None
+
+
+def test_matches_the_substring_searches():
+    matcher = get_hidden_error_matcher(ERROR_MATCHES_NO_AUTHORIZATION, ERROR_MATCHES_BAD_COMMAND)
+    outputs = [
+        "",
+        "hostname router\nend\n",
+        "% Invalid input detected at '^' marker.",
+        "% Authentication failed",
+        "% Ambiguous command: show i\n% Permission denied for the role",
+        "Error: command found at '^' position.",
+        "Error: You do not have permission to run the command or the command is incomplete.",
+    ]
+    for output in outputs:
+        assert matcher.search(output) == _legacy_search(output)
+
+
+def test_matcher_is_cached():
+    assert get_hidden_error_matcher(["a"], ["b"]) is get_hidden_error_matcher(("a",), ("b",))
+    assert get_hidden_error_matcher().search("% Invalid input detected at") is None
+
+
+def test_driver_class_extends_error_matches():
+    class CustomDriver(NetmikoDefault):
+        error_matches_bad_command = ERROR_MATCHES_BAD_COMMAND + ["% Unknown command"]
+
+    assert CustomDriver._has_hidden_errors("% Unknown command: show sun")[0]
+    assert not NetmikoDefault._has_hidden_errors("% Unknown command: show sun")[0]
+    failed, error_msg = CustomDriver._has_hidden_errors("% Authentication failed")
+    assert failed
+    assert "E1017" in error_msg
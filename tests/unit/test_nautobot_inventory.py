@@ -356,3 +356,34 @@ def test_no_pynautobot_as_dict(device):
             logging={"enabled": False},
         )
         assert "pynautobot_dictionary" not in list(nornir_no_pynb_dict.inventory.hosts[device].keys())
+
+
+@pytest.mark.parametrize("related_batch_size, requests_count", [(100, 1), (1, 2)])
+def test_prefetch_related_objects(related_batch_size, requests_count):
+    with Mocker() as mock:
+        load_api_calls(mock)
+        with open(f"{HERE}/mocks/08_get_interfaces_filtered.json", "r", encoding="utf-8") as _file:
+            interfaces = mock.get("http://mock.example.com/api/dcim/interfaces/", text=_file.read())
+        test_nornir = InitNornir(
+            inventory={
+                "plugin": "NautobotInventory",
+                "options": {
+                    "nautobot_url": "http://mock.example.com",
+                    "nautobot_token": "0123456789abcdef01234567890",
+                    "filter_parameters": {"location": "msp"},
+                    "related_endpoints": {"interfaces": "dcim.interfaces"},
+                    "related_batch_size": related_batch_size,
+                },
+            },
+        )
+
+    assert interfaces.call_count == requests_count
+    assert sorted(sum((request.qs["device_id"] for request in interfaces.request_history), [])) == ["2", "3"]
+    related_objects = test_nornir.inventory.hosts["msp-rtr01"].data["related_objects"]
+    assert [interface["name"] for interface in related_objects["interfaces"]] == [
+        "GigabitEthernet0/1",
+        "GigabitEthernet0/2",
+    ]
+    assert related_objects["interfaces"][0]["device"]["name"] == "msp-rtr01"
+    related_objects = test_nornir.inventory.hosts["msp-rtr02"].data["related_objects"]
+    assert [interface["id"] for interface in related_objects["interfaces"]] == [13]
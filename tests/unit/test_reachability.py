@@ -0,0 +1,147 @@
+"""Pytest of the TCP reachability sweep."""
+
+import logging
+import os
+import socket
+import time
+from unittest.mock import Mock
+
+import pytest
+from pynautobot.core.response import Record
+
+from nornir_nautobot.exceptions import NornirNautobotException
+from nornir_nautobot.plugins.tasks.dispatcher import dispatcher, get_tcp_port_resolver
+from nornir_nautobot.plugins.tasks.dispatcher.default import NetmikoDefault
+from nornir_nautobot.utils.reachability import ReachabilityMap, ReachabilityStore, tcp_reachability_sweep
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _host(hostname, port):
+    host = Mock()
+    host.hostname = hostname
+    host.platform = "cisco_ios"
+    obj = Mock()
+    obj.cf = {"tcp_port": port}
+    host.data = {"obj": obj}
+    return host
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_tcp_reachability_sweep():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port = listener.getsockname()[1]
+        closed_port = _closed_port()
+        nornir = Mock()
+        nornir.inventory.hosts = {
+            "reachable": _host("127.0.0.1", open_port),
+            "unreachable": _host("127.0.0.1", closed_port),
+            "unresolvable": _host("does-not-exist.invalid", open_port),
+        }
+        reachability_map = ReachabilityMap()
+        results = tcp_reachability_sweep(
+            nornir, get_tcp_port_resolver(), reachability_map=reachability_map, timeout=1.0
+        )
+
+    assert results["reachable"] == {"ip": "127.0.0.1", "port": open_port, "reachable": True}
+    assert results["unreachable"]["reachable"] is False
+    assert results["unresolvable"] == {"ip": None, "port": open_port, "reachable": False}
+    assert reachability_map.get("127.0.0.1", open_port) is True
+    assert reachability_map.get("127.0.0.1", closed_port) is False
+
+
+def test_tcp_reachability_sweep_pynautobot_record():
+    host = Mock()
+    host.hostname = "127.0.0.1"
+    host.platform = "cisco_ios"
+    # As built by the `NautobotInventory`, without an ORM object.
+    host.data = {"pynautobot_object": Record({"id": 1, "name": "router"}, Mock(), None)}
+    nornir = Mock()
+    nornir.inventory.hosts = {"router": host}
+    results = tcp_reachability_sweep(nornir, get_tcp_port_resolver(), reachability_map=ReachabilityMap(), timeout=1.0)
+
+    # The `tcp_port` of the driver class.
+    assert results["router"]["port"] == 22
+    assert results["router"]["ip"] == "127.0.0.1"
+
+
+def test_reachability_map_ttl():
+    reachability_map = ReachabilityMap(ttl=-1)
+    reachability_map.set("192.0.2.1", 22, True)
+    assert reachability_map.get("192.0.2.1", 22) is None
+
+
+def test_reachability_store_cooldown_and_half_open_probe(tmp_path):
+    path = str(tmp_path / "reachability.json")
+    store = ReachabilityStore(path, failure_threshold=2, base_cooldown=0.05)
+    for _ in range(2):
+        assert store.allow("router")
+        with pytest.raises(NornirNautobotException):
+            with store.track("router"):
+                raise NornirNautobotException("E1004: Not able to connect to IP 10.1.1.1:22.")
+    assert not store.allow("router")
+
+    # The state is written at the end of the run, and survives across runs.
+    assert not os.path.exists(path)
+    store.save()
+    store = ReachabilityStore(path, failure_threshold=2, base_cooldown=0.05)
+    assert store.get("router")["failures"] == 2
+    time.sleep(0.06)
+    assert store.allow("router")
+    assert not store.allow("router")
+    with pytest.raises(NornirNautobotException):
+        with store.track("router"):
+            raise NornirNautobotException("E1004: Not able to connect to IP 10.1.1.1:22.")
+    assert store.get("router")["cooldown_until"] - time.time() > 0.05
+
+    store._state["router"]["cooldown_until"] = 0  # pylint: disable=protected-access
+    assert store.allow("router")
+    with store.track("router"):
+        pass
+    assert not store.get("router")
+    assert ReachabilityStore(path).get("router")
+    store.save()
+    assert not ReachabilityStore(path).get("router")
+
+
+def test_reachability_store_save_interval(tmp_path):
+    path = str(tmp_path / "reachability.json")
+    with ReachabilityStore(path, save_interval=0) as store:
+        store.record_failure("router")
+        assert ReachabilityStore(path).get("router")["failures"] == 1
+        store.save_interval = 3600
+        store.record_failure("router")
+        assert ReachabilityStore(path).get("router")["failures"] == 1
+    assert ReachabilityStore(path).get("router")["failures"] == 2
+    assert os.listdir(tmp_path) == ["reachability.json"]
+
+
+def test_reachability_store_only_tracks_device_connections(tmp_path, monkeypatch):
+    monkeypatch.setattr("nornir_nautobot.plugins.tasks.dispatcher.get_driver_class", lambda *args: (NetmikoDefault, []))
+    store = ReachabilityStore(str(tmp_path / "reachability.json"), failure_threshold=1, base_cooldown=3600)
+    store.record_failure("router")
+    task = Mock()
+    task.host.name = "router"
+    task.run.return_value = "rendered"
+
+    # An offline method is neither held back by the cooldown nor forgets the failures.
+    result = dispatcher(task, "generate_config", LOGGER, Mock(), "netmiko", reachability_store=store)
+    assert result.result == "rendered"
+    assert store.get("router")["failures"] == 1
+    with pytest.raises(NornirNautobotException, match="E1038"):
+        dispatcher(task, "get_config", LOGGER, Mock(), "netmiko", reachability_store=store)
+
+
+def test_reachability_store_corrupt_file(tmp_path):
+    path = tmp_path / "reachability.json"
+    path.write_text('{"router": {"failures": 2, "cooldown')
+    store = ReachabilityStore(str(path))
+    assert not store.get("router")
+    assert store.allow("router")
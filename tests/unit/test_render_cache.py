@@ -0,0 +1,79 @@
+"""Pytest of the render cache."""
+
+import datetime
+import hashlib
+import os
+from unittest.mock import Mock
+
+from nornir.core.inventory import Group, Host, ParentGroups
+
+from nornir_nautobot.utils.render_cache import RenderCache, get_context_fingerprint
+
+
+def _host(**data):
+    group = Group(name="routers", data={"ntp": ["192.0.2.1"]})
+    return Host(name="router", hostname="192.0.2.10", platform="cisco_ios", groups=ParentGroups([group]), data=data)
+
+
+def test_context_fingerprint_is_stable():
+    context = {"host": _host(site="a", vlans={20, 10}), "when": datetime.date(2024, 1, 1)}
+    fingerprint = get_context_fingerprint(context)
+    assert fingerprint == get_context_fingerprint(
+        {"when": datetime.date(2024, 1, 1), "host": _host(vlans={10, 20}, site="a")}
+    )
+    assert fingerprint != get_context_fingerprint({**context, "host": _host(site="b", vlans={10, 20})})
+
+    host = _host(site="a", vlans={10, 20})
+    host.groups[0].data["ntp"] = ["192.0.2.2"]
+    assert fingerprint != get_context_fingerprint({**context, "host": host})
+
+
+def test_context_fingerprint_of_objects():
+    record = Mock(spec=["serialize"])
+    record.serialize.return_value = {"id": 1, "name": "router"}
+    assert get_context_fingerprint({"device": record}) is not None
+
+    # A Django model instance is refused, as its related objects may change without its `last_updated`.
+    model = Mock(spec=["_meta", "pk", "last_updated", "serialize"])
+    model._meta.label = "dcim.Device"
+    model.pk = 1
+    model.last_updated = datetime.datetime(2024, 1, 1)
+    assert get_context_fingerprint({"device": model}) is None
+    assert get_context_fingerprint({"host": _host(device=model)}) is None
+
+    assert get_context_fingerprint({"function": lambda: 0}) is None
+
+
+def test_render_cache(tmp_path):
+    output_file = str(tmp_path / "router.cfg")
+    reference = {"path": output_file, "size": 16, "digest": hashlib.sha256(b"hostname router\n").hexdigest()}
+    render_cache = RenderCache()
+    render_cache.put(output_file, ["template", "context"], reference)
+    assert render_cache.get(output_file, ["template", "context"]) is None
+
+    (tmp_path / "router.cfg").write_text("hostname router\n")
+    render_cache.put(output_file, ["template", "context"], reference)
+    assert render_cache.get(output_file, ["template", "context"]) == reference
+    assert render_cache.get(output_file, ["template", "other"]) is None
+    assert render_cache.report() == {"hits": 1, "misses": 2}
+    render_cache.reset_report()
+    assert render_cache.report() == {"hits": 0, "misses": 0}
+
+
+def test_render_cache_checks_output_file(tmp_path):
+    output_file = tmp_path / "router.cfg"
+    output_file.write_text("hostname router\n")
+    reference = {"path": str(output_file), "size": 16, "digest": hashlib.sha256(b"hostname router\n").hexdigest()}
+    render_cache = RenderCache()
+    render_cache.put(str(output_file), ["template", "context"], reference)
+
+    # Rewritten with the same content, E.g. by a git checkout.
+    mtime_ns = output_file.stat().st_mtime_ns
+    os.utime(output_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    assert render_cache.get(str(output_file), ["template", "context"]) == reference
+
+    output_file.write_text("hostname route2\n")
+    os.utime(output_file, ns=(mtime_ns + 2 * 10**9, mtime_ns + 2 * 10**9))
+    assert render_cache.get(str(output_file), ["template", "context"]) is None
+    output_file.write_text("hostname\n")
+    assert render_cache.get(str(output_file), ["template", "context"]) is None
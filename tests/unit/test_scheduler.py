@@ -0,0 +1,63 @@
+"""Pytest of the concurrency limiter."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from nornir_nautobot.exceptions import NornirNautobotException
+from nornir_nautobot.utils.scheduler import ConcurrencyLimiter
+
+
+def _host(platform="cisco_ios"):
+    host = Mock()
+    host.platform = platform
+    host.data = {}
+    return host
+
+
+def test_limit_is_enforced():
+    limiter = ConcurrencyLimiter({"platform": {"cisco_ios": 2}})
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def run():
+        with limiter.slot(_host(), None):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 2
+
+
+def test_backoff_and_recovery():
+    limiter = ConcurrencyLimiter({"platform": {"default": 8}})
+    with pytest.raises(NornirNautobotException):
+        with limiter.slot(_host("arista_eos"), None):
+            raise NornirNautobotException("E1018: Failed with a timeout issue.")
+    assert limiter.stats()[("platform", "arista_eos")]["limit"] == 4
+
+    with pytest.raises(NornirNautobotException):
+        with limiter.slot(_host("arista_eos"), None):
+            raise NornirNautobotException("E1030: Discovered one of the following in the output")
+    assert limiter.stats()[("platform", "arista_eos")]["limit"] == 4
+
+    for _ in range(30):
+        with limiter.slot(_host("arista_eos"), None):
+            pass
+    assert limiter.stats()[("platform", "arista_eos")]["limit"] == 8
+
+
+def test_unlisted_value_without_default_is_not_limited():
+    limiter = ConcurrencyLimiter({"platform": {"cisco_ios": 1}})
+    assert not limiter.get_keys(_host("juniper_junos"), None)
@@ -1,16 +1,42 @@
 import logging
 import os
 import sys
+import tempfile
 import unittest
 from logging.handlers import BufferingHandler
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
-from jinja2 import TemplateAssertionError, TemplateNotFound, TemplateSyntaxError, UndefinedError
+from jinja2 import (
+    Environment,
+    StrictUndefined,
+    TemplateAssertionError,
+    TemplateNotFound,
+    TemplateSyntaxError,
+    UndefinedError,
+)
 from nornir.core.task import Task
 
 # Import your function (adjust path if needed)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from nornir_nautobot.plugins.tasks.template_file import template_file
+from nornir_nautobot.plugins.tasks.template_file import (
+    JINJA_BYTECODE_CACHE_DIRNAME,
+    TemplateDependencyGraph,
+    clear_jinja_env_cache,
+    get_jinja_env,
+    get_template_digest,
+    main,
+    precompile_templates,
+    shutdown_render_pools,
+    start_render_pool,
+    template_file,
+)
+
+
+def shout(value):
+    return value.upper()
+
+
+FILTERS = {"shout": shout}
 
 
 # Dummy object for obj
@@ -154,6 +180,195 @@ class TestTemplateFile(unittest.TestCase):
         self.assertIn("Hello {{ name }}", log_msg)
         self.assertIn("Message: `'name' is undefined`", log_msg)
 
+    def test_environment_is_shared(self):
+        """Test the environment, and so the compiled templates, are shared across hosts."""
+        clear_jinja_env_cache()
+        template_file(task=self.task, template="valid.j2", path=self.path, obj=self.obj, logger=logger)
+        env = get_jinja_env(self.path)
+        jinja_template = env.get_template("valid.j2")
+        self.task.host = MockHost(name="other_host")
+        result = template_file(task=self.task, template="valid.j2", path=self.path, obj=self.obj, logger=logger)
+        self.assertEqual(result.result, "Hello other_host!")
+        self.assertIs(get_jinja_env(self.path), env)
+        self.assertIs(env.get_template("valid.j2"), jinja_template)
+        self.assertIsNot(get_jinja_env(self.path, jinja_filters={"upper": str.upper}), env)
+
+    def test_jinja_env_is_not_modified(self):
+        """Test the environment of the caller is used as a base, without being modified."""
+        jinja_env = Environment(undefined=StrictUndefined)  # noqa: S701
+        filters = {"shout": lambda text: f"{text.upper()}!"}
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "shout.j2"), "w", encoding="utf8") as filehandler:
+                filehandler.write("{{ host.name | shout }}")
+            result = template_file(
+                task=self.task, template="shout.j2", path=path, jinja_filters=filters, jinja_env=jinja_env
+            )
+        self.assertEqual(result.result, "TEST_HOST!")
+        self.assertIsNone(jinja_env.loader)
+        self.assertNotIn("shout", jinja_env.filters)
+
+    def test_bytecode_cache(self):
+        """Test the compiled templates are stored in the bytecode cache, with the errors still pointing to the source."""
+        with tempfile.TemporaryDirectory() as bytecode_cache_dir:
+            for _ in range(2):
+                clear_jinja_env_cache()
+                with self.assertRaises(UndefinedError):
+                    template_file(
+                        task=self.task,
+                        template="undefined_var.j2",
+                        path=self.path,
+                        logger=logger,
+                        jinja_bytecode_cache_dir=bytecode_cache_dir,
+                    )
+            self.assertTrue(os.listdir(bytecode_cache_dir))
+        log_records = [record.getMessage() for record in self.buffer_handler.buffer]
+        self.assertEqual(len(log_records), 2)
+        self.assertIn(os.path.join(self.path, "undefined_var.j2"), log_records[1])
+        self.assertIn("Hello {{ name }}", log_records[1])
+
+    def test_precompiled_templates(self):
+        """Test the precompiled templates are loaded without compiling them again, only with the same settings."""
+        with tempfile.TemporaryDirectory() as path:
+            for name, source in (
+                ("main.j2", "{% include 'hostname.j2' %}"),
+                ("hostname.j2", "{% if true %}\nhostname {{ host.name }}\n{% endif %}\nend"),
+            ):
+                with open(os.path.join(path, name), "w", encoding="utf8") as filehandler:
+                    filehandler.write(source)
+            bytecode_cache_dir = os.path.join(path, JINJA_BYTECODE_CACHE_DIRNAME)
+            self.assertEqual(precompile_templates(path), 2)
+            (env_bytecode_cache_dir,) = os.listdir(bytecode_cache_dir)
+            self.assertEqual(len(os.listdir(os.path.join(bytecode_cache_dir, env_bytecode_cache_dir))), 2)
+            clear_jinja_env_cache()
+            with patch.object(Environment, "compile", side_effect=AssertionError("compiled")):
+                result = template_file(
+                    task=self.task,
+                    template="main.j2",
+                    path=path,
+                    logger=logger,
+                    jinja_bytecode_cache_dir=bytecode_cache_dir,
+                )
+            self.assertEqual(result.result, "hostname test_host\nend")
+
+            # The bytecode cache is only used when asked for, and not shared with other settings.
+            for jinja_bytecode_cache_dir in (None, bytecode_cache_dir):
+                result = template_file(
+                    task=self.task,
+                    template="main.j2",
+                    path=path,
+                    logger=logger,
+                    jinja_env=Environment(trim_blocks=False),
+                    jinja_bytecode_cache_dir=jinja_bytecode_cache_dir,
+                )
+                self.assertEqual(result.result, "\nhostname test_host\n\nend")
+            self.assertEqual(len(os.listdir(bytecode_cache_dir)), 2)
+
+    def test_precompile_command(self):
+        """Test the command precompiles the templates with the given filters."""
+        with tempfile.TemporaryDirectory() as path:
+            with open(os.path.join(path, "main.j2"), "w", encoding="utf8") as filehandler:
+                filehandler.write("{{ host.name | shout }}")
+            main([path, "--jinja-filters", f"{__name__}.FILTERS"])
+            (env_bytecode_cache_dir,) = os.listdir(os.path.join(path, JINJA_BYTECODE_CACHE_DIRNAME))
+            self.assertEqual(
+                len(os.listdir(os.path.join(path, JINJA_BYTECODE_CACHE_DIRNAME, env_bytecode_cache_dir))), 1
+            )
+            with self.assertRaises(SystemExit):
+                main([path, "--jinja-filters", f"{__name__}.MISSING"])
+
+    def test_render_processes(self):
+        """Test rendering in a pool of worker processes, with the same result and error reporting."""
+        try:
+            start_render_pool(1)
+            with patch.object(Environment, "get_template", side_effect=AssertionError("rendered in this process")):
+                result = template_file(
+                    task=self.task, template="valid.j2", path=self.path, obj=self.obj, logger=logger, render_processes=1
+                )
+            self.assertEqual(result.result, "Hello test_host!")
+            with self.assertRaises(UndefinedError):
+                template_file(
+                    task=self.task, template="undefined_var.j2", path=self.path, logger=logger, render_processes=1
+                )
+            log_records = [record.getMessage() for record in self.buffer_handler.buffer]
+            self.assertEqual(len(log_records), 1)
+            self.assertIn("E1010", log_records[0])
+            self.assertIn(os.path.join(self.path, "undefined_var.j2"), log_records[0])
+            self.assertIn("Hello {{ name }}", log_records[0])
+
+            # A context which can not be pickled is rendered in the current thread.
+            result = template_file(
+                task=self.task, template="valid.j2", path=self.path, logger=logger, render_processes=1, func=lambda: 0
+            )
+            self.assertEqual(result.result, "Hello test_host!")
+        finally:
+            shutdown_render_pools()
+
+    def test_template_digest(self):
+        """Test the template digest changes with the templates it depends on, and only with them."""
+        with tempfile.TemporaryDirectory() as path:
+
+            def write(name, source):
+                with open(os.path.join(path, name), "w", encoding="utf8") as filehandler:
+                    filehandler.write(source)
+
+            write(
+                "main.j2", "{% extends 'base.j2' %}{% block body %}{% include 'ntp.j2' ignore missing %}{% endblock %}"
+            )
+            write("base.j2", "{% import 'macros.j2' as macros %}{% block body %}{% endblock %}")
+            write("macros.j2", "{% macro line(text) %}{{ text }}{% endmacro %}")
+            write("other.j2", "other")
+            env = get_jinja_env(path)
+            digest = get_template_digest(env, "main.j2")
+            self.assertEqual(get_template_digest(env, "main.j2"), digest)
+            write("other.j2", "other changed")
+            self.assertEqual(get_template_digest(env, "main.j2"), digest)
+            write("macros.j2", "{% macro line(text) %}{{ text }}!{% endmacro %}")
+            self.assertNotEqual(get_template_digest(env, "main.j2"), digest)
+            digest = get_template_digest(env, "main.j2")
+            write("ntp.j2", "ntp server 192.0.2.1")
+            self.assertNotEqual(get_template_digest(env, "main.j2"), digest)
+
+            # A name only known when rendering depends on every template.
+            write("dynamic.j2", "{% include host.platform ~ '.j2' %}")
+            digest = get_template_digest(env, "dynamic.j2")
+            write("other.j2", "other changed again")
+            self.assertNotEqual(get_template_digest(env, "dynamic.j2"), digest)
+            with self.assertRaises(TemplateNotFound):
+                get_template_digest(env, "missing.j2")
+
+    def test_template_dependency_graph(self):
+        """Test the top-level templates affected by a change are found, and the graph follows the edits."""
+        with tempfile.TemporaryDirectory() as path:
+
+            def write(name, source):
+                os.makedirs(os.path.dirname(os.path.join(path, name)), exist_ok=True)
+                with open(os.path.join(path, name), "w", encoding="utf8") as filehandler:
+                    filehandler.write(source)
+
+            write("ios.j2", "{% extends 'base.j2' %}{% block body %}{% include 'snippets/ntp.j2' %}{% endblock %}")
+            write("eos.j2", "{% extends 'base.j2' %}{% block body %}{% include 'snippets/vlans.j2' %}{% endblock %}")
+            write("base.j2", "{% from 'macros.j2' import line %}{% block body %}{% endblock %}")
+            write("macros.j2", "{% macro line(text) %}{{ text }}{% endmacro %}")
+            write("snippets/ntp.j2", "ntp server 192.0.2.1")
+            write("snippets/vlans.j2", "vlan 10")
+            graph = TemplateDependencyGraph(path)
+
+            self.assertEqual(graph.get_affected_templates(["snippets/ntp.j2"]), {"ios.j2"})
+            self.assertEqual(graph.get_affected_templates([os.path.join(path, "macros.j2")]), {"ios.j2", "eos.j2"})
+            self.assertEqual(graph.get_affected_templates(["eos.j2"]), {"eos.j2"})
+            self.assertEqual(graph.get_affected_templates([]), set())
+            self.assertEqual(graph.get_dependents(["snippets/vlans.j2"]), {"snippets/vlans.j2", "eos.j2"})
+
+            write("snippets/vlans.j2", "{% include 'snippets/ntp.j2' %}")
+            self.assertEqual(graph.get_affected_templates(["snippets/ntp.j2"]), {"ios.j2", "eos.j2"})
+            self.assertEqual(graph.get_affected_templates(["snippets/ntp.j2"], templates=["eos.j2"]), {"eos.j2"})
+
+            # A name only known when rendering depends on every template.
+            write("junos.j2", "{% include host.platform ~ '.j2' %}")
+            self.assertEqual(graph.get_affected_templates(["snippets/vlans.j2"]), {"eos.j2", "junos.j2"})
+            os.remove(os.path.join(path, "junos.j2"))
+            self.assertEqual(graph.get_affected_templates(["snippets/vlans.j2"]), {"eos.j2"})
+
 
 if __name__ == "__main__":
     unittest.main()